@@ -0,0 +1,107 @@
+import asyncio
+
+
+class AgendadorMissao:
+    """Executa a missão em tempo real num laço asyncio com prazos fixos.
+
+    O tick k começa no instante inicio + k * intervalo, calculado a partir do início da
+    missão e não do fim do tick anterior, então o tempo de processamento não se acumula e
+    o ritmo não deriva. Um tick que termina depois do início do próximo perde o prazo: os
+    instantes já passados são pulados (sem rajada de ticks atrasados) e contados em
+    `prazos_perdidos`.
+
+    Três tarefas rodam concorrentemente no mesmo laço:
+    - ticks: movimento e detecção de vítimas (MotorSimulacao.passo);
+    - sensores: leitura dos sensores de cada robô no seu próprio ritmo; o tick usa a
+      leitura mais recente. Essa leitura pode ser de antes do movimento do tick, então
+      modelos que dependem da posição (`leitura_no_tick`, como CampoSensores) não usam esta
+      tarefa: o próprio tick lê os sensores na posição nova, e a telemetria é a mesma da
+      missão headless com a mesma semente;
+    - saída: entrega dos pacotes de telemetria ao gravador e à interface, fora do caminho
+      crítico do tick.
+    """
+
+    def __init__(self, motor, intervalo_sensores=None):
+        self.motor = motor
+        self.intervalo = motor.intervalo
+        self.intervalo_sensores = intervalo_sensores or motor.intervalo
+        self.ticks = 0
+        self.prazos_perdidos = 0
+        self.atraso_maximo = 0.0  # maior atraso no início de um tick (s)
+        self._soma_atrasos = 0.0
+        self._saida = None
+
+    async def executar(self, max_ticks=None):
+        self._saida = asyncio.Queue()
+        sensores = None
+        if not self.motor.central.sensores.leitura_no_tick:
+            sensores = asyncio.create_task(self._ciclo_sensores())
+        saida = asyncio.create_task(self._ciclo_saida())
+        self.motor.saida = self._saida.put_nowait
+        try:
+            await self._ciclo_ticks(max_ticks)
+            await self._saida.join()
+        finally:
+            self.motor.saida = None
+            self.motor.leituras_sensores.clear()
+            if sensores is not None:
+                sensores.cancel()
+            saida.cancel()
+        return self.ticks
+
+    async def _ciclo_ticks(self, max_ticks):
+        laco = asyncio.get_running_loop()
+        motor = self.motor
+        prazo = laco.time()
+        while motor.missao_ativa() and (max_ticks is None or motor.ticks < max_ticks):
+            atraso = laco.time() - prazo
+            if atraso > 0:
+                self._soma_atrasos += atraso
+                self.atraso_maximo = max(self.atraso_maximo, atraso)
+
+            motor.passo()
+            self.ticks += 1
+
+            prazo += self.intervalo
+            agora = laco.time()
+            if agora > prazo:
+                perdidos = int((agora - prazo) // self.intervalo) + 1
+                self.prazos_perdidos += perdidos
+                prazo += perdidos * self.intervalo
+            await asyncio.sleep(prazo - agora)
+
+    async def _ciclo_sensores(self):
+        laco = asyncio.get_running_loop()
+        motor = self.motor
+        prazo = laco.time()
+        while True:
+            for robo in motor.central.robos:
+                motor.leituras_sensores[robo.indice] = motor._ler_sensores(robo)
+            prazo += self.intervalo_sensores
+            agora = laco.time()
+            if agora > prazo:
+                prazo += (int((agora - prazo) // self.intervalo_sensores) + 1) * self.intervalo_sensores
+            await asyncio.sleep(prazo - agora)
+
+    async def _ciclo_saida(self):
+        while True:
+            pacote = await self._saida.get()
+            try:
+                self.motor.despachar_pacote(pacote)
+            finally:
+                self._saida.task_done()
+
+    def resumo(self):
+        return {
+            'frequencia': 1 / self.intervalo,
+            'ticks': self.ticks,
+            'prazos_perdidos': self.prazos_perdidos,
+            'atraso_medio': self._soma_atrasos / self.ticks if self.ticks else 0.0,
+            'atraso_maximo': self.atraso_maximo,
+        }
+
+    def descricao(self):
+        r = self.resumo()
+        percentual = 100 * r['prazos_perdidos'] / r['ticks'] if r['ticks'] else 0.0
+        return (f"{r['frequencia']:.1f} Hz, {r['ticks']} ticks, {r['prazos_perdidos']} prazos perdidos "
+                f"({percentual:.1f}%), atraso máximo {r['atraso_maximo'] * 1e3:.2f} ms")
@@ -0,0 +1,375 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")  # sem display: tudo é renderizado em memória
+
+from sensores import CampoSensores, ModeloSensoresAleatorio
+from simulacao import CACHE_RETRATOS, Cenario, CentralDeControle, Robo, Vitima
+
+VERSAO_RESULTADOS = 1
+LIMIAR_PADRAO = 0.20
+TAMANHOS_DETECCAO = (10**2, 10**3, 10**4, 10**5, 10**6)
+VITIMAS_RELATORIO = 10**5
+CONSULTAS_DETECCAO = 5000
+
+
+# --- MEDIÇÃO ---
+def medir(funcao, repeticoes=5, preparar=None, aquecimento=1):
+    """Executa `funcao` várias vezes e retorna os tempos (s) de cada execução.
+
+    `preparar`, se informado, roda antes de cada execução, fora da medição, para restaurar
+    o estado que a execução anterior alterou. Como no timeit, o coletor de lixo fica
+    desligado durante a medição: com milhões de objetos vivos, uma coleta completa que
+    caísse no meio de uma execução dominaria o tempo medido.
+    """
+    tempos = []
+    for i in range(aquecimento + repeticoes):
+        if preparar is not None:
+            preparar()
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcao()
+            duracao = time.perf_counter() - inicio
+        finally:
+            gc.enable()
+        if i >= aquecimento:
+            tempos.append(duracao)
+    return tempos
+
+
+def resumir(tempos):
+    return {
+        'mediana': statistics.median(tempos),
+        'minimo': min(tempos),
+        'repeticoes': len(tempos),
+    }
+
+
+# --- CASOS ---
+# Cada caso recebe o número de repetições e retorna os tempos medidos.
+def caso_retrato(repeticoes):
+    """Vitima._gerar_imagem_vitima sem cache: leitura da foto de base + renderização do PNG."""
+    vitima = Vitima(x=10, y=5, gravidade="Grave", estado="Consciente", numero=1)
+    return medir(vitima._gerar_imagem_vitima, repeticoes, preparar=CACHE_RETRATOS.limpar)
+
+
+def caso_retrato_cache(repeticoes):
+    """Vitima._gerar_imagem_vitima com o retrato já no cache."""
+    vitima = Vitima(x=10, y=5, gravidade="Grave", estado="Consciente", numero=1)
+    vitima._gerar_imagem_vitima()
+    return medir(lambda: [vitima._gerar_imagem_vitima() for _ in range(1000)], repeticoes)
+
+
+def criar_caso_deteccao(n_vitimas):
+    def caso(repeticoes):
+        """_verificar_deteccao_vitimas em CONSULTAS_DETECCAO posições de um túnel com
+        densidade constante (1 vítima a cada 2 m), então o custo deve crescer só com log(n)."""
+        comprimento = 2 * n_vitimas
+        cenario = Cenario.aleatorio(0, comprimento=comprimento, densidade=50)
+        rng = random.Random(1)
+        posicoes = [rng.uniform(0, comprimento) for _ in range(CONSULTAS_DETECCAO)]
+        central = CentralDeControle()
+
+        def preparar():
+            for vitima in central.vitimas_detectadas:
+                vitima.detectada_em = None
+                vitima.foto_tirada = False
+                vitima.kit_aplicado = False
+            central.vitimas_detectadas = []
+            central._conjunto_detectadas = set()
+            central.definir_frota([Robo(central_controle=central)], cenario)
+
+        def executar():
+            robo = central.robo
+            for posicao in posicoes:
+                robo.posicao_atual = posicao
+                central._verificar_deteccao_vitimas()
+
+        return medir(executar, repeticoes, preparar=preparar)
+    return caso
+
+
+def caso_relatorio(repeticoes):
+    """gerar_relatorio_final com VITIMAS_RELATORIO vítimas detectadas."""
+    central = CentralDeControle()
+    central.definir_frota([Robo(central_controle=central)],
+                          Cenario.aleatorio(0, comprimento=2 * VITIMAS_RELATORIO, densidade=50))
+    central.vitimas_detectadas = list(central.cenario.objetos)
+    central.missao_concluida = True
+    return medir(central.gerar_relatorio_final, repeticoes)
+
+
+def _criar_mapa():
+    """Mesma figura do mapa da interface, mas num canvas Agg."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from mapa_tunel import RenderizadorMapa
+
+    fig = Figure(figsize=(8, 6), dpi=100, facecolor='#0a1929')
+    ax = fig.add_subplot(111)
+    ax.set_facecolor('#0c1a2a')
+    ax.set_xlim(0, 200)
+    ax.set_ylim(0, 10)
+    ax.set_xlabel('Distância (m)', color='white')
+    ax.set_ylabel('Largura (m)', color='white')
+    ax.set_title('Trajetória do Robô', color='white', pad=20)
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(colors='white')
+    canvas = FigureCanvasAgg(fig)
+    mapa = RenderizadorMapa(fig, ax, canvas)
+    ax.legend(facecolor='#132f4c', labelcolor='white')
+
+    cenario = Cenario.aleatorio(0, comprimento=200, densidade=50)
+    mapa.definir_comprimento(cenario.comprimento)
+    mapa.atualizar_vitimas(cenario.objetos, cenario.versao)
+    canvas.draw()
+    return mapa
+
+
+def caso_mapa(repeticoes):
+    """100 atualizações do mapa (só robô e trajetória, com blitting)."""
+    mapa = _criar_mapa()
+    return medir(lambda: [mapa.atualizar(x * 0.5, 5) for x in range(100)], repeticoes)
+
+
+def caso_mapa_completo(repeticoes):
+    """Uma atualização do mapa com redesenho completo (vítimas novas ou janela deslocada)."""
+    mapa = _criar_mapa()
+
+    def executar():
+        mapa.invalidar_fundo()
+        mapa.atualizar(10, 5)
+
+    return medir(executar, repeticoes)
+
+
+def caso_grade_leitura(repeticoes):
+    """1000 leituras numa grade de 1 km a 0,1 m, com o robô avançando 0,5 m por leitura."""
+    from mapa_tunel import GradeOcupacao
+
+    vitimas = Cenario.aleatorio(0, comprimento=1000, densidade=50)
+
+    def executar():
+        grade = GradeOcupacao(1000)
+        for i in range(1000):
+            x = i * 0.5
+            grade.registrar_leitura(x, 5.0, vitimas.vitimas_no_raio(x, 5))
+
+    return medir(executar, repeticoes)
+
+
+def caso_mapa_grade(repeticoes):
+    """100 quadros do mapa com a grade de ocupação: leitura, ladrilhos sujos e robô."""
+    from mapa_tunel import GradeOcupacao
+
+    mapa = _criar_mapa()
+
+    def executar():
+        grade = GradeOcupacao(mapa.comprimento)
+        mapa.definir_grade(grade)
+        mapa.canvas.draw()
+        for i in range(100):
+            grade.registrar_leitura(i * 2.0, 5.0)
+            mapa.atualizar_grade()
+            mapa.atualizar(i * 2.0, 5)
+
+    return medir(executar, repeticoes)
+
+
+def caso_replanejamento(repeticoes):
+    """Detecção de uma vítima nova e replanejamento num túnel de 5 km com 10⁴ vítimas conhecidas."""
+    from navegacao import NavegadorTunel
+
+    cenario = Cenario.aleatorio(0, comprimento=5000, densidade=200)
+    robo = Robo()
+    navegador = NavegadorTunel()
+    navegador.preparar([robo], cenario)
+    vitimas = sorted(cenario.objetos, key=lambda v: v.x)
+    for vitima in vitimas[:-1000]:
+        navegador._bloquear(vitima)
+    novas = iter(vitimas[-1000:])
+
+    def preparar():
+        # Cada execução detecta uma vítima nova, que é o único alvo do robô
+        navegador._alvos[0] = []
+        navegador._livres = []
+        navegador._campos = {}
+
+    def executar():
+        vitima = next(novas)
+        robo.posicao_atual, robo.pos_y = vitima.x - 4, 5.0
+        navegador.registrar(robo, vitima)
+        navegador._caminhos[0] = navegador._planejar(robo)
+
+    return medir(executar, repeticoes, preparar=preparar)
+
+
+def caso_historico(repeticoes):
+    """10000 pacotes de telemetria gravados no histórico SQLite, até o último lote ser gravado."""
+    import os
+    import tempfile
+    from historico import HistoricoMissoes
+
+    central = CentralDeControle()
+    central.definir_frota([Robo(central_controle=central)], Cenario.aleatorio(0, comprimento=200, densidade=2))
+    pacote = {'robo': 0, 'pos_x': 10.0, 'pos_y': 5.0, 'bateria': 90.0, 'status_robo': "Explorando",
+              'sensores': {'temp': 25.0, 'risco_estrutural': 1, 'gas': 0.1}}
+    with tempfile.TemporaryDirectory() as pasta:
+        # intervalo_telemetria=0: todos os pacotes são gravados
+        historico = HistoricoMissoes(os.path.join(pasta, "historico.db"), intervalo_telemetria=0)
+        historico.iniciar_missao(central)
+
+        def executar():
+            for i in range(10000):
+                pacote['tempo'] = i * 0.5
+                historico.registrar_pacote(pacote)
+            historico.descarregar()
+
+        try:
+            # Cada execução recomeça do tempo zero, como uma missão nova
+            return medir(executar, repeticoes, preparar=historico._proximas_amostras.clear)
+        finally:
+            historico.fechar()
+
+
+def caso_foto_detalhes(repeticoes):
+    """Decodificação e redimensionamento do retrato exibido em mostrar_detalhes_vitima."""
+    from interface_gui import preparar_foto_detalhes
+
+    foto_data = Vitima(x=10, y=5, gravidade="Grave", estado="Consciente", numero=1).foto_data
+    return medir(lambda: preparar_foto_detalhes(foto_data), repeticoes)
+
+
+def _criar_caso_sensores(modelo):
+    def caso(repeticoes):
+        """10000 leituras de sensores de um robô que avança 0,5 m por leitura."""
+        robo = Robo()
+        modelo.ler(robo)  # o campo gera o primeiro bloco fora da medição
+
+        def executar():
+            for i in range(10000):
+                robo.posicao_atual = i * 0.5
+                modelo.ler(robo)
+
+        return medir(executar, repeticoes)
+    return caso
+
+
+def listar_casos(max_vitimas=max(TAMANHOS_DETECCAO)):
+    casos = {
+        'retrato': caso_retrato,
+        'retrato_cache_x1000': caso_retrato_cache,
+    }
+    for n in TAMANHOS_DETECCAO:
+        if n <= max_vitimas:
+            casos[f'deteccao_{n}'] = criar_caso_deteccao(n)
+    casos['relatorio'] = caso_relatorio
+    casos['sensores_aleatorio_x10000'] = _criar_caso_sensores(ModeloSensoresAleatorio())
+    casos['sensores_campo_x10000'] = _criar_caso_sensores(CampoSensores(semente=1))
+    casos['mapa_blit_x100'] = caso_mapa
+    casos['mapa_completo'] = caso_mapa_completo
+    casos['grade_leitura_x1000'] = caso_grade_leitura
+    casos['mapa_grade_x100'] = caso_mapa_grade
+    casos['replanejamento'] = caso_replanejamento
+    casos['historico_x10000'] = caso_historico
+    casos['foto_detalhes'] = caso_foto_detalhes
+    return casos
+
+
+# --- RESULTADOS ---
+def executar_benchmarks(casos, repeticoes=7):
+    resultados = {}
+    for nome, caso in casos.items():
+        try:
+            resultados[nome] = resumir(caso(repeticoes))
+        except ImportError as e:
+            print(f"⚠️  {nome}: ignorado ({e})")
+            continue
+        r = resultados[nome]
+        print(f"{nome:<22} {r['minimo'] * 1000:>10.3f} ms (mediana {r['mediana'] * 1000:.3f} ms)")
+    return resultados
+
+
+def salvar_resultados(resultados, caminho):
+    documento = {
+        'versao': VERSAO_RESULTADOS,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(documento, arquivo, indent=2)
+
+
+def carregar_resultados(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)['resultados']
+
+
+def comparar(resultados, referencia, limiar=LIMIAR_PADRAO):
+    """Compara com a referência e retorna os nomes dos casos que ficaram mais de `limiar`
+    (fração) mais lentos.
+
+    A comparação usa o menor tempo de cada caso, que é o menos afetado por ruído da máquina
+    (outros processos, frequência da CPU) e por isso o mais estável entre execuções.
+    """
+    regressoes = []
+    print(f"\n{'caso':<22} {'referência':>12} {'atual':>12} {'variação':>9}")
+    for nome, atual in resultados.items():
+        if nome not in referencia:
+            continue
+        antes, agora = referencia[nome]['minimo'], atual['minimo']
+        variacao = agora / antes - 1 if antes > 0 else 0.0
+        marca = ""
+        if variacao > limiar:
+            regressoes.append(nome)
+            marca = "  ❌ REGRESSÃO"
+        print(f"{nome:<22} {antes * 1000:>10.3f}ms {agora * 1000:>10.3f}ms {variacao:>+8.0%}{marca}")
+    return regressoes
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do RoboSoco 5001")
+    parser.add_argument('--repeticoes', type=int, default=7, help="execuções medidas por caso")
+    parser.add_argument('--casos', nargs='+', default=None, metavar='CASO',
+                        help="executa só os casos cujo nome contém um destes trechos")
+    parser.add_argument('--max-vitimas', type=int, default=max(TAMANHOS_DETECCAO),
+                        help="maior tamanho de túnel nos casos de detecção")
+    parser.add_argument('--salvar', metavar='ARQUIVO', default=None,
+                        help="grava os resultados em JSON (por exemplo, como nova referência)")
+    parser.add_argument('--comparar', metavar='ARQUIVO', default=None,
+                        help="compara com uma referência gravada com --salvar")
+    parser.add_argument('--limiar', type=float, default=LIMIAR_PADRAO,
+                        help="piora relativa que conta como regressão (padrão: 0.20 = 20%%)")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    casos = listar_casos(args.max_vitimas)
+    if args.casos:
+        casos = {nome: caso for nome, caso in casos.items() if any(t in nome for t in args.casos)}
+
+    resultados = executar_benchmarks(casos, args.repeticoes)
+    if args.salvar:
+        salvar_resultados(resultados, args.salvar)
+        print(f"\n💾 Resultados salvos em {args.salvar}")
+    if args.comparar:
+        regressoes = comparar(resultados, carregar_resultados(args.comparar), args.limiar)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} caso(s) mais de {args.limiar:.0%} mais lento(s): {', '.join(regressoes)}")
+            sys.exit(1)
+        print("\n✅ Nenhuma regressão em relação à referência.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+import argparse
+import datetime
+import itertools
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# --- ESQUEMA ---
+# Instantes de início e fim das missões em segundos desde a época (time.time()); os demais
+# tempos são o tempo da missão, o mesmo campo 'tempo' dos pacotes de telemetria.
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS missoes (
+    id INTEGER PRIMARY KEY,
+    inicio REAL NOT NULL,
+    fim REAL,
+    status TEXT,
+    comprimento REAL,
+    robos INTEGER,
+    distancia REAL,
+    bateria REAL,
+    vitimas_detectadas INTEGER,
+    fotos INTEGER,
+    kits_utilizados INTEGER,
+    kits_necessarios INTEGER
+);
+CREATE TABLE IF NOT EXISTS vitimas (
+    missao_id INTEGER NOT NULL REFERENCES missoes(id),
+    vitima_id TEXT NOT NULL,
+    x REAL,
+    y REAL,
+    gravidade TEXT,
+    estado TEXT,
+    detectada_em REAL,
+    foto INTEGER,
+    kit INTEGER
+);
+CREATE TABLE IF NOT EXISTS fotos (
+    missao_id INTEGER NOT NULL REFERENCES missoes(id),
+    vitima_id TEXT NOT NULL,
+    robo INTEGER,
+    tempo REAL,
+    posicao REAL
+);
+CREATE TABLE IF NOT EXISTS telemetria (
+    missao_id INTEGER NOT NULL REFERENCES missoes(id),
+    robo INTEGER,
+    tempo REAL,
+    pos_x REAL,
+    pos_y REAL,
+    bateria REAL,
+    status TEXT,
+    temp REAL,
+    risco INTEGER,
+    gas REAL
+);
+CREATE INDEX IF NOT EXISTS idx_missoes_inicio ON missoes(inicio);
+CREATE INDEX IF NOT EXISTS idx_vitimas_missao ON vitimas(missao_id, detectada_em);
+CREATE INDEX IF NOT EXISTS idx_vitimas_gravidade ON vitimas(gravidade, missao_id);
+CREATE INDEX IF NOT EXISTS idx_fotos_missao ON fotos(missao_id, tempo);
+CREATE INDEX IF NOT EXISTS idx_telemetria_missao ON telemetria(missao_id, robo, tempo);
+"""
+
+SQL_TELEMETRIA = "INSERT INTO telemetria VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+SQL_FOTO = "INSERT INTO fotos VALUES (?, ?, ?, ?, ?)"
+SQL_VITIMA = "INSERT INTO vitimas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+SQL_FIM_MISSAO = """UPDATE missoes SET fim = ?, status = ?, distancia = ?, bateria = ?, vitimas_detectadas = ?,
+                    fotos = ?, kits_utilizados = ?, kits_necessarios = ? WHERE id = ?"""
+
+TAMANHO_LOTE_PADRAO = 1000
+INTERVALO_TELEMETRIA_PADRAO = 1.0  # segundos de missão entre duas amostras de um robô
+INTERVALO_ESCRITA = 1.0  # segundos; a escritora grava um lote incompleto após esse tempo
+_FIM = object()
+
+
+def _conectar(caminho, **opcoes):
+    conexao = sqlite3.connect(caminho, **opcoes)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    # Em WAL, NORMAL só sincroniza o disco nos checkpoints e nunca corrompe o banco
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    return conexao
+
+
+class HistoricoMissoes:
+    """Histórico de missões num banco SQLite em modo WAL.
+
+    Guarda o resumo de cada missão, as vítimas detectadas, as fotos e a telemetria
+    reduzida a uma amostra por robô a cada `intervalo_telemetria` segundos de missão. A
+    thread da missão só acrescenta as linhas a uma deque. Uma thread escritora, com a sua
+    própria conexão, grava até `tamanho_lote` linhas por transação, quando o lote enche ou
+    a cada INTERVALO_ESCRITA segundos. Em WAL, as consultas (missoes, vitimas,
+    resumo_por_gravidade...) leem o banco sem esperar pela escrita.
+    """
+
+    def __init__(self, caminho, tamanho_lote=TAMANHO_LOTE_PADRAO, intervalo_telemetria=INTERVALO_TELEMETRIA_PADRAO):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_telemetria = intervalo_telemetria
+        self._conexao = _conectar(caminho, check_same_thread=False)
+        self._conexao.row_factory = sqlite3.Row
+        self._trava = threading.Lock()
+        with self._trava, self._conexao:
+            self._conexao.executescript(ESQUEMA)
+        self._pendentes = deque()  # (sql, linha), ou um marcador de descarregar()/fechar()
+        self._acordar = threading.Event()
+        self.missao_id = None
+        self._missao_finalizada = False
+        self._proximas_amostras = {}
+        self._deteccoes = {}  # vítima -> tempo da detecção
+        self.linhas_gravadas = 0
+        self.lotes_gravados = 0
+        # A escritora já começa aqui, para que a gravação periódica valha desde o primeiro pacote
+        self._escritor = threading.Thread(target=self._executar_escritor, daemon=True)
+        self._escritor.start()
+
+    # --- ESCRITA ---
+    def _enfileirar(self, sql, linha):
+        # deque.append é atômico e não acorda a escritora; antes do seu prazo, ela só é
+        # acordada por um lote cheio
+        self._pendentes.append((sql, linha))
+        if len(self._pendentes) >= self.tamanho_lote:
+            self._acordar.set()
+
+    def _gravar(self, conexao, lote):
+        try:
+            with conexao:
+                # Linhas seguidas da mesma tabela vão num único executemany
+                for sql, grupo in itertools.groupby(lote, key=lambda item: item[0]):
+                    conexao.executemany(sql, [linha for _, linha in grupo])
+            self.linhas_gravadas += len(lote)
+            self.lotes_gravados += 1
+        except sqlite3.Error as e:
+            print(f"⚠️  Histórico: {len(lote)} linha(s) perdida(s) ({e})")
+
+    def _executar_escritor(self):
+        conexao = _conectar(self.caminho, timeout=30)
+        pendentes = self._pendentes
+        while True:
+            # Sem lote cheio, grava o que houver a cada INTERVALO_ESCRITA segundos
+            self._acordar.wait(INTERVALO_ESCRITA)
+            self._acordar.clear()
+            while pendentes:
+                lote = []
+                while pendentes and len(lote) < self.tamanho_lote:
+                    item = pendentes.popleft()
+                    if isinstance(item, tuple):
+                        lote.append(item)
+                        continue
+                    # Marcador de descarregar() ou de fechar(): tudo o que veio antes é gravado
+                    self._gravar(conexao, lote)
+                    lote = []
+                    if item is _FIM:
+                        conexao.close()
+                        return
+                    item.set()
+                if lote:
+                    self._gravar(conexao, lote)
+
+    def descarregar(self):
+        """Espera a thread escritora gravar tudo o que já foi enfileirado."""
+        gravado = threading.Event()
+        # Com a trava, nenhum marcador entra na fila depois do _FIM de fechar()
+        with self._trava:
+            if self._escritor is None:
+                return
+            self._pendentes.append(gravado)
+            self._acordar.set()
+        gravado.wait()
+
+    def fechar(self):
+        """Grava o que estiver pendente e fecha o banco; pode ser chamado de qualquer thread,
+        mais de uma vez."""
+        with self._trava:
+            escritor, self._escritor = self._escritor, None
+            if escritor is None:
+                return
+            self._pendentes.append(_FIM)
+            self._acordar.set()
+        escritor.join()
+        with self._trava:
+            self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # --- GANCHOS DA MISSÃO (chamados pela CentralDeControle) ---
+    def iniciar_missao(self, central):
+        """Cria a linha da missão e retorna o seu id; as demais linhas apontam para ela."""
+        with self._trava, self._conexao:
+            cursor = self._conexao.execute(
+                "INSERT INTO missoes (inicio, comprimento, robos) VALUES (?, ?, ?)",
+                (time.time(), central.cenario.comprimento, len(central.robos)))
+        self.missao_id = cursor.lastrowid
+        self._missao_finalizada = False
+        self._proximas_amostras = {}
+        self._deteccoes = {}
+        return self.missao_id
+
+    def registrar_pacote(self, pacote):
+        """Guarda o pacote se já passou `intervalo_telemetria` desde a última amostra do robô."""
+        robo, tempo = pacote['robo'], pacote['tempo']
+        if tempo < self._proximas_amostras.get(robo, 0.0):
+            return
+        self._proximas_amostras[robo] = tempo + self.intervalo_telemetria
+        sensores = pacote['sensores']
+        self._enfileirar(SQL_TELEMETRIA, (
+            self.missao_id, robo, tempo, pacote['pos_x'], pacote['pos_y'], pacote['bateria'],
+            pacote['status_robo'], sensores['temp'], sensores['risco_estrutural'], sensores['gas']))
+
+    def registrar_deteccao(self, robo, vitima, tempo):
+        """`tempo` é o tempo de missão do tick em que `robo` detectou a vítima."""
+        # As vítimas só são gravadas no fim da missão, com o estado final de foto e kit
+        self._deteccoes[vitima] = tempo
+
+    def registrar_foto(self, robo, vitima, tempo):
+        self._enfileirar(SQL_FOTO, (self.missao_id, vitima.id, robo.indice, tempo, robo.posicao_atual))
+
+    def finalizar_missao(self, central):
+        """Grava as vítimas e o resumo da missão e espera a escrita terminar.
+
+        Só a primeira chamada de cada missão tem efeito: a janela finaliza a missão ao ser
+        fechada, e a thread da missão ainda pode chegar aqui depois.
+        """
+        with self._trava:
+            if self._missao_finalizada or self.missao_id is None or self._escritor is None:
+                return
+            self._missao_finalizada = True
+        for vitima in central.vitimas_detectadas:
+            self._enfileirar(SQL_VITIMA, (
+                self.missao_id, vitima.id, vitima.x, vitima.y, vitima.gravidade, vitima.estado,
+                self._deteccoes.get(vitima), int(vitima.foto_tirada), int(vitima.kit_aplicado)))
+        self._enfileirar(SQL_FIM_MISSAO, (
+            time.time(), "Concluída" if central.tunel_concluido() else "Interrompida",
+            central.distancia_percorrida(), central.bateria_media(), len(central.vitimas_detectadas),
+            central.total_fotos(), central.kits_utilizados(), central.cenario.total_kits_necessarios(),
+            self.missao_id))
+        self.descarregar()
+
+    # --- CONSULTAS ---
+    def consultar(self, sql, parametros=()):
+        with self._trava:
+            return [dict(linha) for linha in self._conexao.execute(sql, parametros)]
+
+    @staticmethod
+    def _filtros(condicoes):
+        """Monta o WHERE com as condições cujo valor não é None."""
+        usadas = [(sql, valor) for sql, valor in condicoes if valor is not None]
+        where = " WHERE " + " AND ".join(sql for sql, _ in usadas) if usadas else ""
+        return where, tuple(valor for _, valor in usadas)
+
+    def missoes(self, desde=None, ate=None):
+        """Missões iniciadas entre `desde` e `ate` (segundos desde a época), da mais recente à mais antiga."""
+        where, parametros = self._filtros((("inicio >= ?", desde), ("inicio < ?", ate)))
+        return self.consultar(f"SELECT * FROM missoes{where} ORDER BY inicio DESC", parametros)
+
+    def vitimas(self, missao=None, gravidade=None):
+        where, parametros = self._filtros((("missao_id = ?", missao), ("gravidade = ?", gravidade)))
+        return self.consultar(f"SELECT * FROM vitimas{where} ORDER BY missao_id, detectada_em", parametros)
+
+    def fotos(self, missao, inicio=None, fim=None):
+        where, parametros = self._filtros((("missao_id = ?", missao), ("tempo >= ?", inicio), ("tempo < ?", fim)))
+        return self.consultar(f"SELECT * FROM fotos{where} ORDER BY tempo", parametros)
+
+    def telemetria(self, missao, robo=None, inicio=None, fim=None):
+        """Amostras de telemetria da missão, opcionalmente de um robô e num intervalo do tempo de missão."""
+        where, parametros = self._filtros((("missao_id = ?", missao), ("robo = ?", robo),
+                                           ("tempo >= ?", inicio), ("tempo < ?", fim)))
+        return self.consultar(f"SELECT * FROM telemetria{where} ORDER BY robo, tempo", parametros)
+
+    def resumo_por_gravidade(self, desde=None, ate=None):
+        """Vítimas, fotos e kits de cada gravidade, somados nas missões do período."""
+        where, parametros = self._filtros((("m.inicio >= ?", desde), ("m.inicio < ?", ate)))
+        return self.consultar(
+            "SELECT v.gravidade, COUNT(DISTINCT v.missao_id) AS missoes, COUNT(*) AS vitimas, "
+            "SUM(v.foto) AS fotos, SUM(v.kit) AS kits "
+            f"FROM vitimas v JOIN missoes m ON m.id = v.missao_id{where} "
+            "GROUP BY v.gravidade ORDER BY vitimas DESC", parametros)
+
+
+# --- LINHA DE COMANDO ---
+def _data(texto):
+    return datetime.datetime.fromisoformat(texto).timestamp()
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Consulta o histórico de missões do RoboSoco 5001")
+    parser.add_argument('banco', help="arquivo SQLite gravado com robosoco.py --historico")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    for nome, ajuda in (("missoes", "lista as missões"),
+                        ("resumo", "vítimas, fotos e kits por gravidade")):
+        p = sub.add_parser(nome, help=ajuda)
+        p.add_argument('--desde', type=_data, default=None, help="data ISO, ex.: 2024-05-01")
+        p.add_argument('--ate', type=_data, default=None, help="data ISO (exclusiva)")
+    vitimas = sub.add_parser("vitimas", help="lista as vítimas")
+    vitimas.add_argument('--missao', type=int, default=None)
+    vitimas.add_argument('--gravidade', default=None)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    with HistoricoMissoes(args.banco) as historico:
+        if args.comando == "missoes":
+            for m in historico.missoes(args.desde, args.ate):
+                inicio = datetime.datetime.fromtimestamp(m['inicio']).strftime('%Y-%m-%d %H:%M:%S')
+                print(f"#{m['id']:<5} {inicio}  {m['status'] or 'Em andamento':<12} {m['robos']} robô(s)  "
+                      f"{m['distancia'] or 0:.1f} m  {m['vitimas_detectadas'] or 0} vítimas  "
+                      f"{m['kits_utilizados'] or 0}/{m['kits_necessarios'] or 0} kits")
+        elif args.comando == "resumo":
+            print(f"{'Gravidade':<10} {'Missões':>8} {'Vítimas':>8} {'Fotos':>8} {'Kits':>8}")
+            for linha in historico.resumo_por_gravidade(args.desde, args.ate):
+                print(f"{linha['gravidade']:<10} {linha['missoes']:>8} {linha['vitimas']:>8} "
+                      f"{linha['fotos']:>8} {linha['kits']:>8}")
+        else:
+            for v in historico.vitimas(args.missao, args.gravidade):
+                print(f"#{v['missao_id']:<5} {v['vitima_id']:<6} ({v['x']}m, {v['y']}m) {v['gravidade']:<9} "
+                      f"foto: {'Sim' if v['foto'] else 'Não'}  kit: {'Sim' if v['kit'] else 'Não'}")
+
+
+if __name__ == "__main__":
+    main()
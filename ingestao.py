@@ -0,0 +1,430 @@
+import argparse
+import asyncio
+import math
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+from telemetria import codificar_status, decodificar_status
+
+# --- FORMATO DOS QUADROS ---
+# Cada quadro leva um lote de pacotes: cabeçalho (MAGICO, quantidade) seguido de
+# `quantidade` registros de tamanho fixo. Em TCP os quadros vêm um atrás do outro no fluxo;
+# em UDP cada datagrama traz exatamente um quadro.
+MAGICO = b"RP"
+CABECALHO_QUADRO = struct.Struct("<2sH")
+REGISTRO = struct.Struct("<BdfffBfBf")  # robo, tempo, pos_x, pos_y, bateria, status, temp, risco, gas
+MAX_PACOTES_QUADRO = (65507 - CABECALHO_QUADRO.size) // REGISTRO.size  # cabe num datagrama UDP
+
+PORTA_PADRAO = 5005
+CAPACIDADE_FILA_PADRAO = 4096
+
+
+class ErroQuadro(ValueError):
+    pass
+
+
+def codificar_quadro(pacotes):
+    """Codifica uma lista de pacotes (formato pacote_dados) num único quadro binário."""
+    if len(pacotes) > MAX_PACOTES_QUADRO:
+        raise ValueError(f"no máximo {MAX_PACOTES_QUADRO} pacotes por quadro")
+    partes = [CABECALHO_QUADRO.pack(MAGICO, len(pacotes))]
+    for p in pacotes:
+        s = p['sensores']
+        partes.append(REGISTRO.pack(p.get('robo', 0), p['tempo'], p['pos_x'], p['pos_y'], p['bateria'],
+                                    codificar_status(p['status_robo']), s['temp'], s['risco_estrutural'], s['gas']))
+    return b"".join(partes)
+
+
+def _pacote(registro):
+    robo, tempo, pos_x, pos_y, bateria, status, temp, risco, gas = registro
+    return {
+        'tempo': tempo,
+        'robo': robo,
+        'pos_x': pos_x,
+        'pos_y': pos_y,
+        'bateria': bateria,
+        'status_robo': decodificar_status(status),
+        'sensores': {'temp': round(temp, 1), 'risco_estrutural': risco, 'gas': round(gas, 2)},
+    }
+
+
+def _finito(registro):
+    _, tempo, pos_x, pos_y, bateria, _, temp, _, gas = registro
+    # NaN e ±inf se propagam pela soma (inf - inf dá NaN), então um só teste cobre os seis campos
+    return math.isfinite(tempo + pos_x + pos_y + bateria + temp + gas)
+
+
+def decodificar_quadros(buffer):
+    """Decodifica todos os quadros completos no início de `buffer`.
+
+    Retorna (pacotes, bytes consumidos, registros rejeitados); um quadro incompleto no fim
+    fica para a próxima leitura. Registros com algum campo NaN ou infinito são rejeitados.
+    Os registros de cada quadro são decodificados de uma vez com iter_unpack.
+    """
+    pacotes = []
+    rejeitados = 0
+    inicio = 0
+    visao = memoryview(buffer)
+    try:
+        while len(buffer) - inicio >= CABECALHO_QUADRO.size:
+            magico, quantidade = CABECALHO_QUADRO.unpack_from(buffer, inicio)
+            if magico != MAGICO:
+                raise ErroQuadro(f"quadro inválido na posição {inicio}")
+            fim = inicio + CABECALHO_QUADRO.size + quantidade * REGISTRO.size
+            if fim > len(buffer):
+                break
+            for registro in REGISTRO.iter_unpack(visao[inicio + CABECALHO_QUADRO.size:fim]):
+                if _finito(registro):
+                    pacotes.append(_pacote(registro))
+                else:
+                    rejeitados += 1
+            inicio = fim
+    finally:
+        visao.release()
+    return pacotes, inicio, rejeitados
+
+
+# --- SERVIDOR ---
+class _ProtocoloTCP(asyncio.Protocol):
+    def __init__(self, servidor):
+        self.servidor = servidor
+        self.buffer = bytearray()
+        self.transporte = None
+
+    def connection_made(self, transporte):
+        self.transporte = transporte
+        self.servidor._conexoes.add(self)
+        self.servidor.conexoes += 1
+
+    def connection_lost(self, exc):
+        self.servidor._conexoes.discard(self)
+
+    def data_received(self, dados):
+        self.buffer += dados
+        try:
+            pacotes, consumidos, rejeitados = decodificar_quadros(self.buffer)
+        except ErroQuadro:
+            self.servidor._contar_erros(1)
+            self.transporte.close()
+            return
+        del self.buffer[:consumidos]
+        self.servidor._contar_erros(rejeitados)
+        self.servidor._receber(pacotes)
+
+
+class _ProtocoloUDP(asyncio.DatagramProtocol):
+    def __init__(self, servidor):
+        self.servidor = servidor
+
+    def datagram_received(self, dados, endereco):
+        try:
+            pacotes, consumidos, rejeitados = decodificar_quadros(dados)
+        except ErroQuadro:
+            consumidos = -1
+        if consumidos != len(dados):
+            self.servidor._contar_erros(1)
+            return
+        self.servidor._contar_erros(rejeitados)
+        self.servidor._receber(pacotes)
+
+
+class ServidorTelemetria:
+    """Recebe pacotes de telemetria de robôs externos (outro processo ou hardware) por TCP
+    ou UDP e os entrega a `destino`, por exemplo CentralControleGUI.atualizar_interface_simulacao.
+
+    A rede roda num laço asyncio próprio e a entrega numa thread separada, ligadas por uma
+    fila limitada a `capacidade` pacotes:
+    - TCP: quando a fila enche, a leitura das conexões é pausada até ela esvaziar; o
+      controle de fluxo do TCP faz o remetente esperar (contrapressão).
+    - UDP: não há como segurar o remetente, então os pacotes mais antigos da fila são
+      descartados.
+    A cada rodada a entrega retira tudo o que estiver na fila e, se `so_recentes` for
+    verdadeiro, entrega só o pacote mais recente de cada robô: com um destino lento os
+    pacotes intermediários, já obsoletos, são descartados em vez de atrasar os novos.
+
+    `erros` conta quadros malformados, registros com campos NaN ou infinitos e pacotes em
+    que `destino` levantou uma exceção. Os contadores são atualizados pelas duas threads,
+    sempre com `_condicao`.
+    """
+
+    def __init__(self, destino, host="127.0.0.1", porta=PORTA_PADRAO, protocolo="tcp",
+                 capacidade=CAPACIDADE_FILA_PADRAO, so_recentes=True):
+        if protocolo not in ("tcp", "udp"):
+            raise ValueError("protocolo deve ser 'tcp' ou 'udp'")
+        self.destino = destino
+        self.host = host
+        self.porta = porta
+        self.protocolo = protocolo
+        self.capacidade = capacidade
+        self.so_recentes = so_recentes
+        self.recebidos = 0
+        self.entregues = 0
+        self.descartados = 0
+        self.erros = 0
+        self.conexoes = 0
+
+        self._fila = deque()
+        self._condicao = threading.Condition()
+        self._pausado = False
+        self._conexoes = set()
+        self._laco = None
+        self._pronto = threading.Event()
+        self._parar = False
+        self._threads = []
+        self._erro_inicio = None
+
+    def iniciar(self):
+        """Abre o socket e começa a receber; retorna quando o servidor já está escutando."""
+        self._threads = [threading.Thread(target=self._executar_rede, daemon=True),
+                         threading.Thread(target=self._executar_entrega, daemon=True)]
+        for t in self._threads:
+            t.start()
+        self._pronto.wait()
+        if self._erro_inicio is not None:
+            self.parar()
+            raise self._erro_inicio
+
+    def parar(self):
+        self._parar = True
+        if self._laco is not None and self._laco.is_running():
+            self._laco.call_soon_threadsafe(self._laco.stop)
+        with self._condicao:
+            self._condicao.notify_all()
+        for t in self._threads:
+            t.join()
+
+    # --- Thread da rede ---
+    def _executar_rede(self):
+        self._laco = asyncio.new_event_loop()
+        try:
+            if self.protocolo == "tcp":
+                servidor = self._laco.run_until_complete(
+                    self._laco.create_server(lambda: _ProtocoloTCP(self), self.host, self.porta))
+            else:
+                transporte, _ = self._laco.run_until_complete(
+                    self._laco.create_datagram_endpoint(lambda: _ProtocoloUDP(self), local_addr=(self.host, self.porta)))
+                servidor = transporte
+        except OSError as e:
+            self._erro_inicio = e
+            self._pronto.set()
+            self._laco.close()
+            return
+        sock = servidor.sockets[0] if self.protocolo == "tcp" else servidor.get_extra_info("socket")
+        self.porta = sock.getsockname()[1]
+        self._pronto.set()
+        try:
+            self._laco.run_forever()
+        finally:
+            servidor.close()
+            for conexao in list(self._conexoes):
+                conexao.transporte.close()
+            self._laco.run_until_complete(asyncio.sleep(0))
+            self._laco.close()
+
+    def _receber(self, pacotes):
+        if not pacotes:
+            return
+        with self._condicao:
+            self.recebidos += len(pacotes)
+            excesso = len(self._fila) + len(pacotes) - self.capacidade
+            if excesso > 0 and self.protocolo == "udp":
+                for _ in range(min(excesso, len(self._fila))):
+                    self._fila.popleft()
+                self.descartados += excesso
+                pacotes = pacotes[-self.capacidade:]
+            self._fila.extend(pacotes)
+            if self.protocolo == "tcp" and len(self._fila) >= self.capacidade and not self._pausado:
+                self._pausado = True
+                for conexao in self._conexoes:
+                    conexao.transporte.pause_reading()
+            self._condicao.notify()
+
+    def _contar_erros(self, quantidade):
+        if quantidade:
+            with self._condicao:
+                self.erros += quantidade
+
+    def _retomar_leitura(self):
+        # Roda no laço da rede, chamado pela thread de entrega
+        self._pausado = False
+        for conexao in self._conexoes:
+            conexao.transporte.resume_reading()
+
+    # --- Thread de entrega ---
+    def _executar_entrega(self):
+        while True:
+            with self._condicao:
+                while not self._fila and not self._parar:
+                    self._condicao.wait()
+                if self._parar:
+                    return
+                lote, self._fila = self._fila, deque()
+                if self._pausado:
+                    self._laco.call_soon_threadsafe(self._retomar_leitura)
+
+            descartados = 0
+            if self.so_recentes:
+                recentes = {}
+                for pacote in lote:
+                    recentes[pacote['robo']] = pacote
+                descartados = len(lote) - len(recentes)
+                lote = recentes.values()
+            entregues = falhas = 0
+            for pacote in lote:
+                # Um pacote que o destino não aceita não pode derrubar a thread de entrega,
+                # senão a fila enche e a leitura TCP fica pausada para sempre
+                try:
+                    self.destino(pacote)
+                except Exception as e:
+                    if not falhas:
+                        print(f"⚠️ Erro ao entregar pacote do robô {pacote['robo']}: {e}")
+                    falhas += 1
+                else:
+                    entregues += 1
+            with self._condicao:
+                self.descartados += descartados
+                self.entregues += entregues
+                self.erros += falhas
+
+    def estatisticas(self):
+        with self._condicao:
+            return {
+                'recebidos': self.recebidos,
+                'entregues': self.entregues,
+                'descartados': self.descartados,
+                'erros': self.erros,
+                'conexoes': self.conexoes,
+            }
+
+
+# --- CLIENTE ---
+class ClienteTelemetria:
+    """Envia pacotes a um ServidorTelemetria, agrupando-os em quadros de até `tamanho_lote`."""
+
+    def __init__(self, host="127.0.0.1", porta=PORTA_PADRAO, protocolo="tcp", tamanho_lote=64):
+        self.endereco = (host, porta)
+        self.protocolo = protocolo
+        self.tamanho_lote = min(tamanho_lote, MAX_PACOTES_QUADRO)
+        self.enviados = 0
+        self._pendentes = []
+        if protocolo == "tcp":
+            self._socket = socket.create_connection(self.endereco)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def enviar(self, pacote):
+        self._pendentes.append(pacote)
+        if len(self._pendentes) >= self.tamanho_lote:
+            self.descarregar()
+
+    def descarregar(self):
+        if not self._pendentes:
+            return
+        quadro = codificar_quadro(self._pendentes)
+        if self.protocolo == "tcp":
+            self._socket.sendall(quadro)
+        else:
+            self._socket.sendto(quadro, self.endereco)
+        self.enviados += len(self._pendentes)
+        self._pendentes = []
+
+    def fechar(self):
+        self.descarregar()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def executar_robo_substituto(cliente, robos=1, frequencia=None, max_pacotes=None, comprimento=200, velocidade=0.01,
+                             semente=None):
+    """Robô de teste: roda a simulação headless e envia a telemetria ao servidor em vez de
+    exibi-la. Com `frequencia`, gera esse número de ticks por segundo; sem ela, o mais rápido
+    possível. Uma nova missão começa sempre que a anterior termina."""
+    import random
+    from simulacao import Cenario, CentralDeControle, MotorSimulacao, Robo
+
+    if semente is not None:
+        random.seed(semente)
+    inicio = time.perf_counter()
+    ticks_totais = 0
+    while max_pacotes is None or cliente.enviados < max_pacotes:
+        central = CentralDeControle()
+        central.definir_frota([Robo(central, velocidade=velocidade, nome=f"R{i + 1}") for i in range(robos)],
+                              Cenario(comprimento=comprimento))
+        central.simulacao_ativa = True
+        motor = MotorSimulacao(central)
+        motor.saida = cliente.enviar
+        while motor.missao_ativa() and (max_pacotes is None or cliente.enviados < max_pacotes):
+            if frequencia is not None:
+                devidos = int((time.perf_counter() - inicio) * frequencia) - ticks_totais
+                if devidos <= 0:
+                    cliente.descarregar()
+                    time.sleep(0.001)
+                    continue
+            motor.passo()
+            ticks_totais += 1
+        cliente.descarregar()
+    return ticks_totais
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Ingestão de telemetria do RoboSoco 5001 por TCP/UDP")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    for nome, ajuda in (("servidor", "recebe pacotes e mostra a vazão a cada segundo"),
+                        ("robo", "robô substituto que envia a telemetria de uma simulação")):
+        p = sub.add_parser(nome, help=ajuda)
+        p.add_argument('--host', default="127.0.0.1")
+        p.add_argument('--porta', type=int, default=PORTA_PADRAO)
+        p.add_argument('--protocolo', choices=("tcp", "udp"), default="tcp")
+    robo = sub.choices["robo"]
+    robo.add_argument('--robos', type=int, default=1, help="robôs simulados (índices 0..N-1)")
+    robo.add_argument('--frequencia', type=float, default=None, help="ticks por segundo (padrão: o máximo possível)")
+    robo.add_argument('--max-pacotes', type=int, default=None)
+    robo.add_argument('--comprimento', type=float, default=200, help="comprimento do túnel, como no robosoco.py")
+    robo.add_argument('--lote', type=int, default=64, help="pacotes por quadro")
+    robo.add_argument('--semente', type=int, default=None)
+    servidor = sub.choices["servidor"]
+    servidor.add_argument('--capacidade', type=int, default=CAPACIDADE_FILA_PADRAO, help="tamanho da fila de pacotes")
+    servidor.add_argument('--todos', action="store_true", help="entrega todos os pacotes, sem descartar os obsoletos")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if args.comando == "robo":
+        inicio = time.perf_counter()
+        with ClienteTelemetria(args.host, args.porta, args.protocolo, args.lote) as cliente:
+            executar_robo_substituto(cliente, args.robos, args.frequencia, args.max_pacotes, args.comprimento,
+                                     semente=args.semente)
+        duracao = time.perf_counter() - inicio
+        print(f"📡 {cliente.enviados} pacotes enviados em {duracao:.2f}s ({cliente.enviados / duracao:.0f} pacotes/s)")
+        return
+
+    servidor = ServidorTelemetria(lambda pacote: None, args.host, args.porta, args.protocolo,
+                                  args.capacidade, so_recentes=not args.todos)
+    servidor.iniciar()
+    print(f"📡 Escutando {args.protocolo.upper()} em {args.host}:{servidor.porta} (Ctrl+C para sair)")
+    anterior = 0
+    try:
+        while True:
+            time.sleep(1)
+            e = servidor.estatisticas()
+            print(f"{e['recebidos'] - anterior:>8} pacotes/s | recebidos {e['recebidos']} | "
+                  f"entregues {e['entregues']} | descartados {e['descartados']} | erros {e['erros']}")
+            anterior = e['recebidos']
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.parar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,766 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox
+import datetime
+import os
+import io
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+# matplotlib, numpy (mapa_tunel) e PIL são importados em segundo plano depois que a janela
+# aparece (ver _importar_graficos); juntos custam a maior parte da inicialização
+from painel_log import TIPOS_LOG, PainelLog, RegistroLogArquivo, caminho_log_missao
+from perfil import CronometroInicializacao, PerfilTick
+from relatorio import salvar_relatorios
+from simulacao import CORES_GRAVIDADE, DIRETORIO_DO_SCRIPT, RAIO_DETECCAO, verificar_pasta_imagens
+
+TAMANHO_FOTO_DETALHES = (220, 220)
+CAPACIDADE_CACHE_FOTOS = 32  # ~200 KB por foto de 220x220 no Tk
+PRE_CARGA_FOTOS = 3  # próximas vítimas preparadas a cada seleção
+
+
+def preparar_foto_detalhes(foto_data, tamanho=TAMANHO_FOTO_DETALHES):
+    """Decodifica o retrato (PNG) e o redimensiona para o painel de detalhes."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(foto_data))
+    return image.resize(tamanho, Image.Resampling.LANCZOS)
+
+
+class CacheFotosDetalhes:
+    """Fotos do painel de detalhes prontas para exibir, com pré-carregamento.
+
+    Para cada (id da vítima, versão do retrato, tamanho) guarda a miniatura já decodificada
+    e redimensionada (PIL) e o PhotoImage criado a partir dela, ambos em LRU limitados a
+    `capacidade`. As miniaturas das vítimas pedidas em pre_carregar são preparadas numa
+    thread própria; o PhotoImage só pode ser criado na thread do Tk, então a conversão é
+    entregue a `executar_na_interface`.
+    """
+
+    def __init__(self, executar_na_interface, capacidade=CAPACIDADE_CACHE_FOTOS, tamanho=TAMANHO_FOTO_DETALHES):
+        self._executar_na_interface = executar_na_interface
+        self.capacidade = capacidade
+        self.tamanho = tamanho
+        self._miniaturas = OrderedDict()
+        self._fotos = OrderedDict()  # só acessado pela thread do Tk
+        self._trava = threading.Lock()
+        self._pedidos = queue.SimpleQueue()
+        self._thread = None
+        self.acertos = 0
+        self.falhas = 0
+
+    def _chave(self, vitima):
+        return (vitima.id, vitima.versao_retrato, self.tamanho)
+
+    @staticmethod
+    def _guardar(cache, chave, valor, capacidade):
+        cache[chave] = valor
+        cache.move_to_end(chave)
+        while len(cache) > capacidade:
+            cache.popitem(last=False)
+
+    def foto(self, vitima):
+        """PhotoImage do retrato de `vitima`; chamado na thread do Tk."""
+        chave = self._chave(vitima)
+        foto = self._fotos.get(chave)
+        if foto is not None:
+            self._fotos.move_to_end(chave)
+            self.acertos += 1
+            return foto
+        self.falhas += 1
+        return self._converter(chave, self._miniatura(vitima, chave))
+
+    def _miniatura(self, vitima, chave):
+        with self._trava:
+            miniatura = self._miniaturas.get(chave)
+            if miniatura is not None:
+                self._miniaturas.move_to_end(chave)
+                return miniatura
+        miniatura = preparar_foto_detalhes(vitima.foto_data, self.tamanho)
+        # Se a gravidade mudou durante a preparação, a imagem já é de outra versão
+        if self._chave(vitima) == chave:
+            with self._trava:
+                self._guardar(self._miniaturas, chave, miniatura, self.capacidade)
+        return miniatura
+
+    def _converter(self, chave, miniatura):
+        from PIL import ImageTk
+
+        foto = self._fotos.get(chave)
+        if foto is None:
+            foto = ImageTk.PhotoImage(miniatura)
+            self._guardar(self._fotos, chave, foto, self.capacidade)
+        return foto
+
+    def pre_carregar(self, vitimas):
+        """Prepara em segundo plano as fotos de `vitimas` que ainda não estão no cache."""
+        for vitima in vitimas:
+            chave = self._chave(vitima)
+            if chave not in self._fotos:
+                self._pedidos.put((vitima, chave))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._executar_pre_carga, daemon=True)
+            self._thread.start()
+
+    def _executar_pre_carga(self):
+        while True:
+            vitima, chave = self._pedidos.get()
+            try:
+                miniatura = self._miniatura(vitima, chave)
+            except Exception as e:
+                print(f"⚠️ Erro ao pré-carregar a foto de {vitima.id}: {e}")
+                continue
+            self._executar_na_interface(self._converter, chave, miniatura)
+
+
+class CentralControleGUI:
+    """Janela da Central de Controle.
+
+    O Tk só pode ser usado pela thread que criou a janela. Por isso os métodos chamados pela
+    thread da missão (atualizar_interface_simulacao, adicionar_mensagem_console,
+    adicionar_alerta e executar_na_interface) apenas enfileiram o trabalho, que é aplicado
+    pela thread do Tk uma vez por quadro, limitado a `fps_maximo` quadros por segundo.
+    Rajadas de telemetria são combinadas: só o pacote mais recente de cada robô é exibido
+    em cada quadro.
+
+    A janela aparece antes do mapa: matplotlib e PIL são importados numa thread à parte e
+    o mapa é montado no primeiro quadro depois disso. `cronometro` registra as etapas da
+    inicialização, impressas quando o mapa fica pronto.
+    """
+
+    def __init__(self, central_controle, fps_maximo=20, capacidade_log=500, cronometro=None):
+        self.central = central_controle
+        self.cronometro = cronometro or CronometroInicializacao()
+        self.fps_maximo = fps_maximo
+        self.capacidade_log = capacidade_log
+        self.registro_log = RegistroLogArquivo(caminho_log_missao(DIRETORIO_DO_SCRIPT))
+        self._thread_tk = threading.current_thread()
+        self._fila_eventos = queue.SimpleQueue()
+        self._trava_pacote = threading.Lock()
+        self._pacotes_pendentes = {}  # último pacote de cada robô da frota
+        self._distancias = {}
+        self._modelo_vista = {}
+        self.fonte_replay = None
+        self.root = tk.Tk()
+        self.root.title("Central de Controle RoboSoco 5001")
+        self.root.geometry("1800x1000")
+        self.root.configure(bg='#0a1929')
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar_janela)
+        
+        self.ultima_atualizacao = tk.StringVar(value="Nunca")
+        self.status_geral = tk.StringVar(value="Operacional")
+        self.vitima_photo = None
+        self.cache_fotos = CacheFotosDetalhes(self.executar_na_interface)
+        self.grade = None  # GradeOcupacao; criada junto com o mapa
+        
+        # Variáveis de status
+        self.pos_var = tk.StringVar(value="0.0 m")
+        self.bat_var = tk.StringVar(value="100.0%")
+        self.status_var = tk.StringVar(value="Iniciando...")
+        self.temp_var = tk.StringVar(value="25.0°C")
+        self.kits_var = tk.StringVar(value="3")
+        self.vitimas_var = tk.StringVar(value="0")
+        self.fotos_var = tk.StringVar(value="0")
+        self.kits_used_var = tk.StringVar(value="0")
+        self.distancia_var = tk.StringVar(value="0.0 m")
+        
+        self.setup_ui()
+        self.root.after(self._intervalo_quadro_ms(), self._processar_quadro)
+        self.cronometro.marcar("janela")
+        threading.Thread(target=self._importar_graficos, daemon=True).start()
+        
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.root)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.main_frame = main_frame
+        
+        self.criar_header(main_frame)
+        
+        body_frame = ttk.Frame(main_frame)
+        body_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        body_frame.columnconfigure(0, weight=2)
+        body_frame.columnconfigure(1, weight=1)
+        body_frame.columnconfigure(2, weight=1)
+        body_frame.rowconfigure(0, weight=1)
+        
+        self.criar_mapa_tunel(body_frame)
+        self.criar_painel_status(body_frame)
+        self.criar_painel_vitima(body_frame)
+        self.criar_console_mensagens(main_frame)
+        
+    def criar_header(self, parent):
+        header_frame = ttk.Frame(parent)
+        header_frame.pack(fill=tk.X, pady=(0, 10))
+        self.header_frame = header_frame
+        
+        title_frame = ttk.Frame(header_frame)
+        title_frame.pack(side=tk.LEFT)
+        ttk.Label(title_frame, text="🤖", font=('Arial', 24)).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(title_frame, text="CENTRAL ROBOSOCO 5001", font=('Arial', 16, 'bold'), foreground='#007fff').pack(side=tk.LEFT)
+        
+        status_frame = ttk.Frame(header_frame)
+        status_frame.pack(side=tk.RIGHT)
+        ttk.Label(status_frame, text="Status:", font=('Arial', 9)).pack(side=tk.LEFT)
+        ttk.Label(status_frame, textvariable=self.status_geral, font=('Arial', 9, 'bold'), foreground='green').pack(side=tk.LEFT, padx=(5, 15))
+        
+        self.botao_relatorio = ttk.Button(status_frame, text="Gerar Relatório Final", command=self.abrir_janela_relatorio, state=tk.DISABLED)
+        self.botao_relatorio.pack(side=tk.LEFT, padx=(0, 15))
+        
+        ttk.Label(status_frame, text="Última atualização:", font=('Arial', 9)).pack(side=tk.LEFT)
+        ttk.Label(status_frame, textvariable=self.ultima_atualizacao, font=('Arial', 9, 'bold')).pack(side=tk.LEFT, padx=(5, 0))
+        
+    def criar_mapa_tunel(self, parent):
+        map_frame = ttk.LabelFrame(parent, text="MAPEAMENTO DO TÚNEL", padding=10)
+        map_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
+        self.map_frame = map_frame
+        self.mapa = None
+        self.mapa_carregando = ttk.Label(map_frame, text="Carregando mapa...", font=('Arial', 12))
+        self.mapa_carregando.pack(expand=True)
+
+    def _importar_graficos(self):
+        """Roda numa thread própria: importa os módulos do mapa e das fotos e pede à thread
+        do Tk que monte o mapa."""
+        inicio = time.perf_counter()
+        import matplotlib.backends.backend_tkagg  # noqa: F401
+        import matplotlib.figure  # noqa: F401
+        import mapa_tunel  # noqa: F401
+        from PIL import Image, ImageTk  # noqa: F401
+        self.cronometro.medir("importações (matplotlib, PIL)", time.perf_counter() - inicio)
+        self._fila_eventos.put((self._montar_mapa, ()))
+
+    def _montar_mapa(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from mapa_tunel import GradeOcupacao, RenderizadorMapa
+
+        map_frame = self.map_frame
+        self.mapa_carregando.destroy()
+        self.fig = Figure(figsize=(8, 6), dpi=100, facecolor='#0a1929')
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_facecolor('#0c1a2a')
+        
+        self.ax.set_xlim(0, 200)
+        self.ax.set_ylim(0, 10)
+        self.ax.set_xlabel('Distância (m)', color='white')
+        self.ax.set_ylabel('Largura (m)', color='white')
+        self.ax.set_title('Trajetória do Robô', color='white', pad=20)
+        self.ax.grid(True, alpha=0.3)
+        self.ax.tick_params(colors='white')
+        
+        self.canvas = FigureCanvasTkAgg(self.fig, map_frame)
+        self.mapa = RenderizadorMapa(self.fig, self.ax, self.canvas)
+        self.robo_marker = self.mapa.robo_marker
+        self.caminho_line = self.mapa.caminho_line
+        self.vitimas_marker = self.mapa.vitimas_marker
+        
+        self.ax.legend(facecolor='#132f4c', labelcolor='white')
+        
+        if self.central.cenario is not None:
+            self.mapa.comprimento = self.central.cenario.comprimento
+            self.mapa.definir_quantidade_robos(len(self.central.robos))
+            self.grade = GradeOcupacao(self.central.cenario.comprimento, alcance=RAIO_DETECCAO)
+            self.mapa.definir_grade(self.grade)
+        
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.mpl_connect('button_press_event', self.on_map_click)
+        
+        self.cronometro.marcar("mapa")
+        print("⏱️  Inicialização da interface:")
+        print("\n".join(f"   {linha}" for linha in self.cronometro.linhas_tabela()))
+        self.adicionar_mensagem_console(
+            "Sistema", f"Interface pronta em {self.cronometro.total() * 1000:.0f} ms", "INFO")
+        
+    def on_map_click(self, event):
+        if event.xdata and event.ydata:
+            for vitima in self.central.cenario.objetos:
+                distancia = ((event.xdata - vitima.x) ** 2 + (event.ydata - vitima.y) ** 2) ** 0.5
+                if distancia < 3:
+                    self.central.selecionar_vitima(vitima)
+                    break
+        
+    def criar_painel_status(self, parent):
+        status_frame = ttk.LabelFrame(parent, text="STATUS DA MISSÃO", padding=10)
+        status_frame.grid(row=0, column=1, sticky="nsew", padx=(0, 10))
+        
+        # Status do Robô
+        info_frame = ttk.LabelFrame(status_frame, text="STATUS DO ROBÔ", padding=5)
+        info_frame.pack(fill=tk.X, pady=5, expand=False)
+        
+        info_grid = ttk.Frame(info_frame)
+        info_grid.pack(fill=tk.X, padx=5, pady=5)
+        
+        status_info = [
+            ("Posição:", self.pos_var),
+            ("Bateria:", self.bat_var),
+            ("Status:", self.status_var),
+            ("Temperatura:", self.temp_var),
+            ("Kits Restantes:", self.kits_var)
+        ]
+                  
+        for i, (texto, var) in enumerate(status_info):
+            ttk.Label(info_grid, text=texto, font=('Arial', 9)).grid(row=i, column=0, sticky='w', pady=2)
+            ttk.Label(info_grid, textvariable=var, font=('Arial', 9, 'bold')).grid(row=i, column=1, sticky='w', pady=2, padx=(10, 0))
+        
+        # Barra de bateria
+        self.bateria_bar = ttk.Progressbar(info_grid, orient='horizontal', length=150, mode='determinate')
+        self.bateria_bar.grid(row=1, column=2, sticky='w', padx=(10, 0))
+        self.bateria_bar['value'] = 100
+            
+        # Alertas
+        alertas_frame = ttk.LabelFrame(status_frame, text="ALERTAS ATIVOS", padding=5)
+        alertas_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        self.alertas_text = scrolledtext.ScrolledText(alertas_frame, height=8, bg='#0c1a2a', fg='white', font=('Consolas', 9))
+        self.alertas_text.pack(fill=tk.BOTH, expand=True, pady=(5,0))
+        self.log_alertas = PainelLog(self.alertas_text, "ALERTAS", self.capacidade_log, self.registro_log)
+        self.log_alertas.anexar("INFO", "Aguardando início da missão...")
+        
+        ttk.Separator(status_frame, orient='horizontal').pack(fill=tk.X, pady=(5, 10))
+        
+        # Estatísticas
+        stats_frame = ttk.LabelFrame(status_frame, text="ESTATÍSTICAS", padding=5)
+        stats_frame.pack(fill=tk.X, pady=5, expand=False)
+        
+        stats_grid = ttk.Frame(stats_frame)
+        stats_grid.pack(fill=tk.X)
+        
+        stats_info = [
+            ("Vítimas Detectadas:", self.vitimas_var),
+            ("Fotos Registradas:", self.fotos_var),
+            ("Kits Utilizados:", self.kits_used_var),
+            ("Distância Percorrida:", self.distancia_var)
+        ]
+
+        for i, (texto, var) in enumerate(stats_info):
+            ttk.Label(stats_grid, text=texto, font=('Arial', 9)).grid(row=i, column=0, sticky='w', pady=1)
+            ttk.Label(stats_grid, textvariable=var, font=('Arial', 9, 'bold')).grid(row=i, column=1, sticky='w', pady=1, padx=(10, 0))
+
+        self.criar_painel_diagnostico(status_frame)
+
+    def criar_painel_diagnostico(self, parent):
+        diag_frame = ttk.LabelFrame(parent, text="DIAGNÓSTICO", padding=5)
+        diag_frame.pack(fill=tk.X, pady=5, expand=False)
+
+        perfil = self.central.perfil
+        self.perfil_var = tk.BooleanVar(value=perfil is not None and perfil.ativo)
+        ttk.Checkbutton(diag_frame, text="Medir fases do tick", variable=self.perfil_var,
+                        command=self.alternar_perfil).pack(anchor='w')
+        self.diagnostico_var = tk.StringVar(value="Medição desativada.")
+        ttk.Label(diag_frame, textvariable=self.diagnostico_var, font=('Consolas', 8), justify=tk.LEFT).pack(anchor='w', pady=(5, 0))
+        self._quadros_diagnostico = 0
+
+    def alternar_perfil(self):
+        perfil = self.central.perfil
+        if not self.perfil_var.get():
+            if perfil is not None:
+                perfil.pausar()
+        elif perfil is None:
+            self.central.perfil = PerfilTick()
+        else:
+            perfil.retomar()
+
+    def _atualizar_diagnostico(self):
+        # A tabela muda pouco de um quadro para outro; uma atualização por segundo basta
+        self._quadros_diagnostico += 1
+        if self._quadros_diagnostico < self.fps_maximo:
+            return
+        self._quadros_diagnostico = 0
+        linhas = []
+        perfil = self.central.perfil
+        if perfil is not None and perfil.tick.total:
+            linhas.extend(perfil.linhas_tabela())
+        if self.central.agendador is not None:
+            linhas.append(f"Agendador: {self.central.agendador.descricao()}")
+        if self.grade is not None:
+            linhas.append(f"Cobertura do túnel: {100 * self.grade.cobertura():.1f}%")
+        if linhas:
+            self._atualizar_var(self.diagnostico_var, "\n".join(linhas))
+
+    def criar_painel_vitima(self, parent):
+        vitima_frame = ttk.LabelFrame(parent, text="DETALHES DA VÍTIMA", padding=10)
+        vitima_frame.grid(row=0, column=2, sticky="nsew")
+        
+        self.vitima_vazia_frame = ttk.Frame(vitima_frame)
+        self.vitima_vazia_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(self.vitima_vazia_frame, text="🔍", font=('Arial', 48), foreground='#666666').pack(expand=True, pady=20)
+        ttk.Label(self.vitima_vazia_frame, text="Nenhuma Vítima Selecionada", font=('Arial', 12, 'bold'), foreground='#666666').pack()
+        
+        self.vitima_detalhes_frame = ttk.Frame(vitima_frame)
+        vitima_frame.rowconfigure(0, weight=1)
+        
+        self.vitima_foto_label = ttk.Label(self.vitima_detalhes_frame)
+        self.vitima_foto_label.pack(pady=10)
+        
+        self.vitima_id_label = ttk.Label(self.vitima_detalhes_frame, font=('Arial', 14, 'bold'))
+        self.vitima_id_label.pack()
+        
+        info_grid = ttk.Frame(self.vitima_detalhes_frame)
+        info_grid.pack(fill=tk.X, pady=15, padx=20)
+        
+        ttk.Label(info_grid, text="Gravidade:", font=('Arial', 10, 'bold')).grid(row=0, column=0, sticky='w', pady=3)
+        self.vitima_gravidade_label = ttk.Label(info_grid, font=('Arial', 10))
+        self.vitima_gravidade_label.grid(row=0, column=1, sticky='w', pady=3, padx=(10, 0))
+        
+        ttk.Label(info_grid, text="Estado:", font=('Arial', 10, 'bold')).grid(row=1, column=0, sticky='w', pady=3)
+        self.vitima_estado_label = ttk.Label(info_grid, font=('Arial', 10))
+        self.vitima_estado_label.grid(row=1, column=1, sticky='w', pady=3, padx=(10, 0))
+        
+        ttk.Label(info_grid, text="Posição:", font=('Arial', 10, 'bold')).grid(row=2, column=0, sticky='w', pady=3)
+        self.vitima_posicao_label = ttk.Label(info_grid, font=('Arial', 10))
+        self.vitima_posicao_label.grid(row=2, column=1, sticky='w', pady=3, padx=(10, 0))
+        
+        ttk.Label(info_grid, text="Registro de Campo:", font=('Arial', 10, 'bold')).grid(row=3, column=0, sticky='w', pady=3)
+        self.vitima_foto_status = ttk.Label(info_grid, font=('Arial', 9))
+        self.vitima_foto_status.grid(row=3, column=1, sticky='w', pady=3, padx=(5, 0))
+        
+        ttk.Label(info_grid, text="Kit:", font=('Arial', 10, 'bold')).grid(row=4, column=0, sticky='w', pady=3)
+        self.vitima_kit_status = ttk.Label(info_grid, font=('Arial', 9))
+        self.vitima_kit_status.grid(row=4, column=1, sticky='w', pady=3, padx=(10, 0))
+
+    def mostrar_detalhes_vitima(self, vitima):
+        self.vitima_vazia_frame.pack_forget()
+        self.vitima_detalhes_frame.pack(fill=tk.BOTH, expand=True)
+        
+        try:
+            self.vitima_photo = self.cache_fotos.foto(vitima)
+            self.vitima_foto_label.configure(image=self.vitima_photo)
+        except Exception as e:
+            print(f"Erro ao exibir imagem: {e}")
+            self.vitima_foto_label.configure(image='', text="🩺", font=('Arial', 48))
+        
+        self.vitima_id_label.configure(text=f"Vítima {vitima.id}")
+        self.vitima_posicao_label.configure(text=f"{vitima.x}m")
+        
+        cor_grav = CORES_GRAVIDADE.get(vitima.gravidade, "white")
+        self.vitima_gravidade_label.configure(text=vitima.gravidade, foreground=cor_grav)
+        self.vitima_estado_label.configure(text=vitima.estado)
+        
+        if vitima.foto_tirada:
+            self.vitima_foto_status.configure(text="✅ Registrada", foreground="#4CAF50")
+        else:
+            self.vitima_foto_status.configure(text="⚠️ Aguardando Robô", foreground="#FF9800")
+        
+        if vitima.kit_aplicado:
+            self.vitima_kit_status.configure(text="✅ Aplicado", foreground="#4CAF50")
+        elif vitima.necessita_kit():
+            self.vitima_kit_status.configure(text="⚠️ Necessário", foreground="#FF9800")
+        else:
+            self.vitima_kit_status.configure(text="ℹ️ Estável", foreground="#2196F3")
+        
+        self._pre_carregar_proximas(vitima)
+
+    def _pre_carregar_proximas(self, vitima):
+        """Prepara as fotos das vítimas seguintes na ordem de selecionar_proxima_vitima."""
+        detectadas = self.central.vitimas_detectadas
+        try:
+            i = detectadas.index(vitima)
+        except ValueError:
+            return
+        quantidade = min(PRE_CARGA_FOTOS, len(detectadas) - 1)
+        self.cache_fotos.pre_carregar([detectadas[(i + k) % len(detectadas)] for k in range(1, quantidade + 1)])
+
+    def criar_console_mensagens(self, parent):
+        console_frame = ttk.LabelFrame(parent, text="LOG DA MISSÃO", padding=10)
+        console_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        filtro_frame = ttk.Frame(console_frame)
+        filtro_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filtro_frame, text="Exibir:", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.filtro_log_vars = {}
+        for tipo in TIPOS_LOG:
+            var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(filtro_frame, text=tipo, variable=var, command=self.aplicar_filtro_log).pack(side=tk.LEFT, padx=(5, 0))
+            self.filtro_log_vars[tipo] = var
+        
+        self.console_text = scrolledtext.ScrolledText(console_frame, height=6, bg='#0c1a2a', fg='white', font=('Consolas', 9))
+        self.console_text.pack(fill=tk.BOTH, expand=True)
+        self.log_console = PainelLog(self.console_text, "CONSOLE", self.capacidade_log, self.registro_log)
+        
+        self.adicionar_mensagem_console("Sistema", "Central inicializada - Missão de Resgate", "INFO")
+
+    def aplicar_filtro_log(self):
+        tipos = [tipo for tipo, var in self.filtro_log_vars.items() if var.get()]
+        self.log_console.definir_filtro(tipos)
+
+    def adicionar_mensagem_console(self, fonte, mensagem, tipo="INFO"):
+        timestamp = datetime.datetime.now().strftime('%H:%M:%S')
+        self._fila_eventos.put((self._inserir_mensagem_console, (timestamp, fonte, mensagem, tipo)))
+
+    def adicionar_alerta(self, tipo, mensagem):
+        timestamp = datetime.datetime.now().strftime('%H:%M:%S')
+        self._fila_eventos.put((self._inserir_alerta, (timestamp, tipo, mensagem)))
+
+    def executar_na_interface(self, funcao, *args):
+        """Executa `funcao(*args)` na thread do Tk (imediatamente, se já estiver nela)."""
+        if threading.current_thread() is self._thread_tk:
+            funcao(*args)
+        else:
+            self._fila_eventos.put((funcao, args))
+
+    def _inserir_mensagem_console(self, timestamp, fonte, mensagem, tipo):
+        self.log_console.anexar(tipo, f"[{timestamp}] {fonte}: {mensagem}")
+        
+    def _inserir_alerta(self, timestamp, tipo, mensagem):
+        alerta_config = {"PERIGO": "🚨", "SUCESSO": "✅", "ALERTA": "⚠️"}
+        icon = alerta_config.get(tipo, "ℹ️")
+        self.log_alertas.anexar(tipo, f"[{timestamp}] {icon} {mensagem}")
+
+    def _intervalo_quadro_ms(self):
+        return max(1, int(1000 / self.fps_maximo))
+
+    def _processar_quadro(self):
+        """Aplica, na thread do Tk, tudo o que chegou desde o último quadro."""
+        # O próximo quadro é agendado antes de tudo: um erro neste quadro não para a interface
+        self.root.after(self._intervalo_quadro_ms(), self._processar_quadro)
+        with self._trava_pacote:
+            pacotes, self._pacotes_pendentes = self._pacotes_pendentes, {}
+        for dados in pacotes.values():
+            self._aplicar_pacote(dados)
+        if self.mapa is not None:
+            self.mapa.atualizar_grade()
+
+        # Os eventos são discretos (mensagens, alertas, seleção) e vêm depois do pacote,
+        # para que mudanças finais como "Missão Concluída" não sejam sobrescritas por ele.
+        self._aplicar_eventos()
+
+        self.log_console.descarregar()
+        self.log_alertas.descarregar()
+        if self.fonte_replay is not None:
+            self._atualizar_controles_replay()
+        self._atualizar_diagnostico()
+
+    def _aplicar_eventos(self):
+        while True:
+            try:
+                funcao, args = self._fila_eventos.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                funcao(*args)
+            except Exception as e:
+                # Ex.: preencher uma janela de relatório que o usuário já fechou (TclError)
+                nome = getattr(funcao, "__name__", repr(funcao))
+                print(f"⚠️ Erro ao aplicar evento na interface ({nome}): {e}")
+                self._inserir_mensagem_console(datetime.datetime.now().strftime('%H:%M:%S'),
+                                               "Interface", f"Erro em {nome}: {e}", "ALERTA")
+
+    def fechar_janela(self):
+        """Interrompe a missão, grava no log as mensagens ainda pendentes e fecha os arquivos
+        (log, gravação .rstl e histórico) antes de destruir a janela."""
+        # A thread da missão para no fim do tick; o gravador é fechado aqui mesmo, pois ela é
+        # daemon e pode não chegar a _finalizar_missao(). Com a trava do gravador, os pacotes
+        # registrados depois disso são ignorados, e fechar de novo não tem efeito.
+        self.central.simulacao_ativa = False
+        if self.central.gravador:
+            self.central.gravador.fechar()
+        historico = self.central.historico
+        if historico is not None:
+            # Fechada no meio da missão, ela fica registrada como interrompida
+            historico.finalizar_missao(self.central)
+            historico.fechar()
+        self._aplicar_eventos()
+        self.log_console.descarregar()
+        self.log_alertas.descarregar()
+        self.registro_log.fechar()
+        self.root.destroy()
+
+    def _atualizar_var(self, var, valor):
+        """Só toca no widget quando o valor exibido realmente mudou."""
+        chave = str(var)
+        if self._modelo_vista.get(chave) != valor:
+            self._modelo_vista[chave] = valor
+            var.set(valor)
+
+    def ativar_modo_replay(self, fonte):
+        """Exibe uma missão gravada (FonteReplay) em vez da simulação, com controles de
+        pausa, velocidade e busca por tempo ou posição."""
+        self.fonte_replay = fonte
+        self._arrastando_replay = False
+        
+        replay_frame = ttk.LabelFrame(self.main_frame, text="REPLAY DA MISSÃO", padding=5)
+        replay_frame.pack(fill=tk.X, pady=(0, 10), after=self.header_frame)
+        
+        self.botao_pausa_replay = ttk.Button(replay_frame, text="⏸ Pausar", command=self.alternar_pausa_replay)
+        self.botao_pausa_replay.pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Label(replay_frame, text="Velocidade:", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.velocidade_replay_var = tk.DoubleVar(value=fonte.velocidade)
+        self.velocidade_replay_texto = tk.StringVar(value=f"{fonte.velocidade:.0f}x")
+        ttk.Scale(replay_frame, from_=fonte.VELOCIDADE_MINIMA, to=fonte.VELOCIDADE_MAXIMA, length=150,
+                  variable=self.velocidade_replay_var, command=self._mudar_velocidade_replay).pack(side=tk.LEFT, padx=5)
+        ttk.Label(replay_frame, textvariable=self.velocidade_replay_texto, width=5, font=('Arial', 9, 'bold')).pack(side=tk.LEFT, padx=(0, 15))
+        
+        self.tempo_replay_var = tk.DoubleVar(value=fonte.tempo_atual)
+        self.tempo_replay_texto = tk.StringVar(value="")
+        escala_tempo = ttk.Scale(replay_frame, from_=0, to=max(fonte.leitor.duracao, 1), variable=self.tempo_replay_var)
+        escala_tempo.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        escala_tempo.bind('<ButtonPress-1>', lambda e: setattr(self, '_arrastando_replay', True))
+        escala_tempo.bind('<ButtonRelease-1>', lambda e: self.buscar_tempo_replay(self.tempo_replay_var.get()))
+        ttk.Label(replay_frame, textvariable=self.tempo_replay_texto, font=('Arial', 9)).pack(side=tk.LEFT, padx=(5, 15))
+        
+        ttk.Label(replay_frame, text="Ir para (m):", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.posicao_replay_var = tk.StringVar()
+        entrada = ttk.Entry(replay_frame, textvariable=self.posicao_replay_var, width=8)
+        entrada.pack(side=tk.LEFT, padx=5)
+        entrada.bind('<Return>', lambda e: self.buscar_posicao_replay())
+        ttk.Button(replay_frame, text="Ir", command=self.buscar_posicao_replay).pack(side=tk.LEFT)
+        
+        self.adicionar_mensagem_console("Replay", f"Reproduzindo {os.path.basename(fonte.leitor.caminho)} ({len(fonte.leitor)} amostras)", "INFO")
+
+    def alternar_pausa_replay(self):
+        self.fonte_replay.alternar_pausa()
+        self.botao_pausa_replay.config(text="▶ Continuar" if self.fonte_replay.pausado else "⏸ Pausar")
+
+    def _mudar_velocidade_replay(self, valor):
+        self.fonte_replay.definir_velocidade(float(valor))
+        self.velocidade_replay_texto.set(f"{self.fonte_replay.velocidade:.0f}x")
+
+    def buscar_tempo_replay(self, tempo):
+        self._arrastando_replay = False
+        if self.mapa is not None:
+            self.mapa.historico.limpar()
+        self.fonte_replay.buscar_tempo(tempo)
+
+    def buscar_posicao_replay(self):
+        try:
+            pos_x = float(self.posicao_replay_var.get().replace(',', '.'))
+        except ValueError:
+            return
+        if self.mapa is not None:
+            self.mapa.historico.limpar()
+        self.fonte_replay.buscar_posicao(pos_x)
+
+    def _atualizar_controles_replay(self):
+        tempo = self.fonte_replay.tempo_atual
+        if not self._arrastando_replay:
+            self._atualizar_var(self.tempo_replay_var, round(tempo, 1))
+        self._atualizar_var(self.tempo_replay_texto, f"{tempo:.1f}s / {self.fonte_replay.leitor.duracao:.1f}s")
+
+    def definir_status(self, texto):
+        self._atualizar_var(self.status_var, texto)
+
+    def habilitar_botao_relatorio(self):
+        """Habilita o botão de gerar relatório."""
+        self.botao_relatorio.config(state=tk.NORMAL)
+
+    def abrir_janela_relatorio(self):
+        """Cria e exibe a janela com o relatório final da missão."""
+        report_window = tk.Toplevel(self.root)
+        report_window.title("Relatório Final da Missão")
+        report_window.geometry("600x700")
+        report_window.configure(bg='#0a1929')
+        
+        # Frame para os botões na parte inferior
+        button_frame = ttk.Frame(report_window)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(5, 10))
+
+        # Botão para salvar o relatório
+        save_button = ttk.Button(button_frame, text="Salvar Relatório (.txt, .csv, .json)", command=self.salvar_relatorio)
+        save_button.pack(side=tk.RIGHT)
+
+        # Área de texto para exibir o relatório
+        text_area = scrolledtext.ScrolledText(report_window, wrap=tk.WORD, bg='#0c1a2a', fg='white', font=('Consolas', 10))
+        text_area.pack(expand=True, fill=tk.BOTH, padx=10, pady=(10, 0))
+        text_area.insert(tk.INSERT, "Gerando relatório...")
+        text_area.config(state=tk.DISABLED)
+
+        def exibir(relatorio_texto):
+            text_area.config(state=tk.NORMAL)
+            text_area.delete("1.0", tk.END)
+            text_area.insert(tk.INSERT, relatorio_texto)
+            text_area.config(state=tk.DISABLED)
+
+        # Missões longas geram relatórios grandes: o texto é montado fora da thread do Tk
+        threading.Thread(
+            target=lambda: self.executar_na_interface(exibir, self.central.gerar_relatorio_final()),
+            daemon=True).start()
+
+    def salvar_relatorio(self):
+        """Salva o relatório em .txt, .csv e .json, sem bloquear a interface."""
+        def salvar():
+            try:
+                caminhos = salvar_relatorios(self.central, DIRETORIO_DO_SCRIPT)
+                self.executar_na_interface(messagebox.showinfo, "Sucesso", "Relatório salvo com sucesso em:\n" + "\n".join(caminhos))
+            except Exception as e:
+                self.executar_na_interface(messagebox.showerror, "Erro ao Salvar", f"Não foi possível salvar o relatório.\nErro: {e}")
+
+        threading.Thread(target=salvar, daemon=True).start()
+
+    def atualizar_interface_simulacao(self, dados):
+        """Recebe um pacote de telemetria de qualquer thread; exibido no próximo quadro."""
+        robo = dados.get('robo', 0)
+        # Pacotes externos (ingestão por rede) podem citar robôs que a frota não tem
+        if robo >= len(self.central.robos):
+            return
+        # A grade acumula todas as leituras, mesmo as de pacotes que o quadro vai descartar
+        grade = self.grade
+        if grade is not None:
+            x = dados['pos_x']
+            grade.registrar_leitura(x, dados['pos_y'], self.central.cenario.vitimas_no_raio(x, RAIO_DETECCAO))
+        with self._trava_pacote:
+            # Pacotes sem 'robo' (gravações de replay) são do líder da frota
+            self._pacotes_pendentes[robo] = dados
+
+    def _aplicar_pacote(self, dados):
+        robo = dados.get('robo', 0)
+        self.atualizar_mapa(dados['pos_x'], dados['pos_y'], robo)
+        self._distancias[robo] = dados['pos_x'] - self.central.robos[robo].inicio_segmento
+        
+        vitimas_count = len(self.central.vitimas_detectadas)
+        fotos_count = self.central.total_fotos()
+        kits_used = self.central.kits_utilizados()
+        
+        self._atualizar_var(self.vitimas_var, str(vitimas_count))
+        self._atualizar_var(self.fotos_var, str(fotos_count))
+        self._atualizar_var(self.kits_used_var, str(kits_used))
+        self._atualizar_var(self.distancia_var, f"{sum(self._distancias.values()):.1f} m")
+        self._atualizar_var(self.ultima_atualizacao, datetime.datetime.now().strftime('%H:%M:%S'))
+        
+        # O painel de status mostra o líder da frota
+        if robo == 0:
+            self.atualizar_status_robo(dados)
+            self._atualizar_var(self.status_var, dados['status_robo'])
+
+    def atualizar_mapa(self, x, y, robo=0):
+        if self.mapa is None:
+            return
+        cenario = self.central.cenario
+        self.mapa.atualizar_vitimas(cenario.objetos, cenario.versao)
+        self.mapa.atualizar(x, y, robo)
+
+    def atualizar_status_robo(self, dados):
+        self._atualizar_var(self.pos_var, f"{dados['pos_x']:.1f} m")
+        self._atualizar_var(self.bat_var, f"{dados['bateria']:.1f}%")
+        self._atualizar_var(self.temp_var, f"{dados['sensores']['temp']}°C")
+        self._atualizar_var(self.kits_var, str(self.central.kits_restantes()))
+        bateria = round(dados['bateria'], 1)
+        if self._modelo_vista.get('bateria_bar') != bateria:
+            self._modelo_vista['bateria_bar'] = bateria
+            self.bateria_bar['value'] = bateria
+
+    def integrar_com_central(self, robos, cenario):
+        """Associa à interface a frota (lista de Robo) e o cenário da missão."""
+        self.central.definir_frota(robos, cenario)
+        self.central.gui = self
+        if self.mapa is not None:
+            self.mapa.comprimento = cenario.comprimento
+            self.mapa.definir_quantidade_robos(len(self.central.robos))
+
+    def iniciar_interface(self):
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure('.', background='#0a1929', foreground='white')
+        style.configure('TFrame', background='#0a1929')
+        style.configure('TLabel', background='#0a1929', foreground='white')
+        style.configure('TLabelframe', background='#132f4c', foreground='white')
+        style.configure('TLabelframe.Label', background='#132f4c', foreground='white')
+        style.configure('TButton', background='#007fff', foreground='white', font=('Arial', 9, 'bold'))
+        
+        # A verificação lista a pasta de imagens e só imprime; não precisa atrasar a janela
+        threading.Thread(target=verificar_pasta_imagens, daemon=True).start()
+        self.root.after_idle(self.cronometro.marcar, "primeiro quadro")
+        self.root.mainloop()
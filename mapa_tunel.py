@@ -0,0 +1,308 @@
+import math
+import threading
+
+import numpy as np
+
+# Cor do marcador e da trajetória de cada robô da frota, em ordem (o líder é o primeiro)
+CORES_ROBOS = (('#007fff', '#00ff88'), ('#ff4fd8', '#ff9be9'), ('#ffd400', '#fff08a'),
+               ('#00e5ff', '#9af6ff'), ('#ff7a00', '#ffbd80'), ('#b388ff', '#dcc8ff'))
+
+
+class HistoricoPosicoes:
+    """Buffer circular pré-alocado com as últimas `capacidade` posições do robô.
+
+    Cada ponto é gravado duas vezes (em i e em i + capacidade), de modo que a janela com os
+    pontos mais recentes é sempre uma fatia contígua do buffer, obtida sem cópia.
+    """
+
+    def __init__(self, capacidade=50):
+        self.capacidade = capacidade
+        self._xs = np.zeros(2 * capacidade)
+        self._ys = np.zeros(2 * capacidade)
+        self._total = 0
+
+    def __len__(self):
+        return min(self._total, self.capacidade)
+
+    def adicionar(self, x, y):
+        i = self._total % self.capacidade
+        self._xs[i] = self._xs[i + self.capacidade] = x
+        self._ys[i] = self._ys[i + self.capacidade] = y
+        self._total += 1
+
+    def coordenadas(self):
+        """Retorna (xs, ys) do ponto mais antigo ao mais recente."""
+        if not self._total:
+            return self._xs[:0], self._ys[:0]
+        fim = (self._total - 1) % self.capacidade + self.capacidade + 1
+        inicio = fim - len(self)
+        return self._xs[inicio:fim], self._ys[inicio:fim]
+
+    def limpar(self):
+        self._total = 0
+
+
+# --- GRADE DE OCUPAÇÃO ---
+DESCONHECIDO, LIVRE, OCUPADO = 0, 1, 2
+# RGBA de cada estado; o desconhecido é transparente e deixa o fundo do mapa à vista
+CORES_GRADE = np.array([(0, 0, 0, 0), (0x1e, 0x4d, 0x6b, 255), (0xc6, 0x28, 0x28, 255)], dtype=np.uint8)
+
+
+def _disco(raio_celulas):
+    y, x = np.ogrid[-raio_celulas:raio_celulas + 1, -raio_celulas:raio_celulas + 1]
+    return x * x + y * y <= raio_celulas * raio_celulas
+
+
+class GradeOcupacao:
+    """Grade 2D de ocupação e cobertura do túnel, um uint8 por célula de `resolucao` metros.
+
+    As células começam DESCONHECIDAS. A cada leitura, as que estão no alcance do sensor do
+    robô (um disco de raio `alcance`) passam a LIVRES, e as das vítimas à vista a OCUPADAS.
+    As colunas são agrupadas em ladrilhos de `largura_ladrilho` células; toda alteração
+    marca o seu ladrilho como sujo, e o mapa redesenha só os ladrilhos sujos (ver
+    RenderizadorMapa.definir_grade). Um túnel de 1 km a 0,1 m ocupa 1 MB.
+
+    A grade é escrita pela thread que entrega a telemetria e lida pela thread do Tk; o
+    conjunto de ladrilhos sujos é trocado sob uma trava em ladrilhos_sujos().
+    """
+
+    def __init__(self, comprimento, largura=10.0, resolucao=0.1, alcance=5.0, largura_ladrilho=256):
+        self.comprimento = comprimento
+        self.largura = largura
+        self.resolucao = resolucao
+        self.largura_ladrilho = largura_ladrilho
+        self.nx = max(1, math.ceil(comprimento / resolucao))
+        self.ny = max(1, math.ceil(largura / resolucao))
+        self.n_ladrilhos = math.ceil(self.nx / largura_ladrilho)
+        self.celulas = np.zeros((self.ny, self.nx), dtype=np.uint8)
+        self.celulas_conhecidas = 0
+        self._raio_sensor = max(0, round(alcance / resolucao))
+        self._disco_sensor = _disco(self._raio_sensor)
+        self._raio_vitima = max(0, round(0.3 / resolucao))
+        self._disco_vitima = _disco(self._raio_vitima)
+        self._sujos = set()
+        self._trava = threading.Lock()
+
+    def _pintar(self, x, y, raio, disco, estado):
+        """Pinta com `estado` as células do disco centrado em (x, y) que ainda não o têm."""
+        cx, cy = int(x / self.resolucao), int(y / self.resolucao)
+        x0, x1 = max(cx - raio, 0), min(cx + raio + 1, self.nx)
+        y0, y1 = max(cy - raio, 0), min(cy + raio + 1, self.ny)
+        if x0 >= x1 or y0 >= y1:
+            return
+        janela = self.celulas[y0:y1, x0:x1]
+        mascara = disco[y0 - cy + raio:y1 - cy + raio, x0 - cx + raio:x1 - cx + raio] & (janela < estado)
+        if not mascara.any():
+            return
+        self.celulas_conhecidas += int(np.count_nonzero(mascara & (janela == DESCONHECIDO)))
+        janela[mascara] = estado
+        with self._trava:
+            self._sujos.update(range(x0 // self.largura_ladrilho, (x1 - 1) // self.largura_ladrilho + 1))
+
+    def registrar_leitura(self, x, y, vitimas=()):
+        """Registra o que o robô em (x, y) vê: o alcance do sensor e as `vitimas` à vista."""
+        self._pintar(x, y, self._raio_sensor, self._disco_sensor, LIVRE)
+        for vitima in vitimas:
+            self._pintar(vitima.x, vitima.y, self._raio_vitima, self._disco_vitima, OCUPADO)
+
+    def cobertura(self):
+        """Fração das células do túnel já observadas."""
+        return self.celulas_conhecidas / self.celulas.size
+
+    def ladrilhos_sujos(self):
+        """Retorna e esquece os ladrilhos alterados desde a última chamada."""
+        with self._trava:
+            sujos, self._sujos = self._sujos, set()
+        return sujos
+
+    def extensao_ladrilho(self, k):
+        """(x0, x1, y0, y1) do ladrilho k em metros, como o `extent` do imshow."""
+        inicio = k * self.largura_ladrilho
+        fim = min(inicio + self.largura_ladrilho, self.nx)
+        return (inicio * self.resolucao, fim * self.resolucao, 0, self.ny * self.resolucao)
+
+    def rgba_ladrilho(self, k, passo=1):
+        """Cores do ladrilho k, com cada `passo` colunas reduzidas ao estado máximo.
+
+        Como OCUPADO > LIVRE > DESCONHECIDO, a redução não apaga vítimas nem trechos já
+        observados quando o túnel inteiro cabe em poucos pixels.
+        """
+        inicio = k * self.largura_ladrilho
+        bloco = self.celulas[:, inicio:inicio + self.largura_ladrilho]
+        if passo > 1:
+            bloco = np.maximum.reduceat(bloco, np.arange(0, bloco.shape[1], passo), axis=1)
+        return CORES_GRADE[bloco]
+
+
+class RenderizadorMapa:
+    """Desenha o mapa do túnel de forma incremental, com blitting.
+
+    Eixos, grade, legenda e marcadores das vítimas formam um fundo estático, guardado como
+    bitmap após cada redesenho completo. A cada atualização só o marcador do robô e a
+    trajetória (artistas animados) são redesenhados sobre esse fundo. O redesenho completo
+    só acontece quando o conjunto de vítimas muda, a janela visível se desloca (túneis longos)
+    ou a figura é redimensionada. Numa frota cada robô tem o seu marcador e a sua trajetória,
+    e o túnel inteiro fica visível.
+
+    Com uma GradeOcupacao (definir_grade), cada ladrilho da grade é uma camada imshow sob
+    a grade de linhas e as vítimas. Em atualizar_grade só os ladrilhos sujos e visíveis
+    são desenhados sobre o fundo guardado, que é capturado de novo em seguida.
+    """
+
+    def __init__(self, fig, ax, canvas, capacidade_historico=50, janela=200):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        # Trecho do túnel visível (m); em túneis longos a janela acompanha o robô
+        self.janela = janela
+        self.comprimento = janela
+
+        self.capacidade_historico = capacidade_historico
+        self._robos = []  # (marcador, trajetória, histórico) de cada robô
+        self.robo_marker, self.caminho_line, self.historico = self._adicionar_robo('Robô', 'Trajetória')
+        self.vitimas_marker, = ax.plot([], [], 'X', color='red', markersize=12, label='Vítimas')
+
+        self._fundo = None
+        self._caixa_legenda = None
+        self._versao_vitimas = None
+        self.grade = None
+        self._ladrilhos = {}  # índice do ladrilho -> AxesImage
+        self._passo_grade = 1
+        self.ladrilhos_desenhados = 0
+        canvas.mpl_connect('draw_event', self._ao_redesenhar)
+
+    def _adicionar_robo(self, label=None, label_caminho=None):
+        cor, cor_caminho = CORES_ROBOS[len(self._robos) % len(CORES_ROBOS)]
+        marcador, = self.ax.plot([], [], 'o', color=cor, markersize=15, label=label, animated=True)
+        caminho, = self.ax.plot([], [], '.-', color=cor_caminho, alpha=0.7, linewidth=2, label=label_caminho, animated=True)
+        robo = (marcador, caminho, HistoricoPosicoes(self.capacidade_historico))
+        self._robos.append(robo)
+        return robo
+
+    def definir_quantidade_robos(self, quantidade):
+        while len(self._robos) < quantidade:
+            self._adicionar_robo()
+        self.definir_comprimento(self.comprimento)
+
+    def _ao_redesenhar(self, event):
+        # Após um redesenho completo (inicial, redimensionamento ou vítimas novas), guarda o
+        # fundo sem os artistas animados e os desenha por cima.
+        self._fundo = self.canvas.copy_from_bbox(self.ax.bbox)
+        legenda = self.ax.get_legend()
+        self._caixa_legenda = legenda.get_window_extent() if legenda is not None else None
+        self._desenhar_animados()
+
+    def _desenhar_animados(self):
+        for _, caminho, _ in self._robos:
+            self.ax.draw_artist(caminho)
+        for marcador, _, _ in self._robos:
+            self.ax.draw_artist(marcador)
+        self.canvas.blit(self.ax.bbox)
+
+    def atualizar_vitimas(self, vitimas, versao):
+        """Atualiza os marcadores das vítimas só quando `versao` (do Cenario) muda."""
+        if versao == self._versao_vitimas:
+            return
+        self._versao_vitimas = versao
+        self.vitimas_marker.set_data([v.x for v in vitimas], [v.y for v in vitimas])
+        self.invalidar_fundo()
+
+    def definir_comprimento(self, comprimento):
+        self.comprimento = comprimento
+        # A frota se espalha pelo túnel inteiro, então a janela não acompanha um robô só
+        self.ax.set_xlim(0, comprimento if len(self._robos) > 1 else min(comprimento, self.janela))
+        self.invalidar_fundo()
+
+    def _acompanhar(self, x):
+        """Desloca a janela visível quando o robô chega perto da borda direita."""
+        inicio, fim = self.ax.get_xlim()
+        if len(self._robos) > 1 or fim >= self.comprimento or x < fim - 0.1 * self.janela:
+            return
+        inicio = min(max(0, x - 0.25 * self.janela), self.comprimento - self.janela)
+        self.ax.set_xlim(inicio, inicio + self.janela)
+        self.invalidar_fundo()
+
+    def invalidar_fundo(self):
+        """Agenda um redesenho completo; o fundo é capturado novamente em seguida."""
+        self._fundo = None
+        self.canvas.draw_idle()
+
+    def definir_grade(self, grade):
+        self.grade = grade
+        for imagem in self._ladrilhos.values():
+            imagem.remove()
+        self._ladrilhos = {}
+        self.invalidar_fundo()
+
+    def _calcular_passo_grade(self):
+        """Colunas da grade por pixel do mapa, arredondado para baixo a uma potência de 2."""
+        inicio, fim = self.ax.get_xlim()
+        colunas_por_pixel = (fim - inicio) / self.grade.resolucao / max(self.ax.bbox.width, 1)
+        passo = 1
+        while passo * 2 <= min(colunas_por_pixel, self.grade.largura_ladrilho):
+            passo *= 2
+        return passo
+
+    def _imagem_ladrilho(self, k):
+        rgba = self.grade.rgba_ladrilho(k, self._passo_grade)
+        imagem = self._ladrilhos.get(k)
+        if imagem is None:
+            imagem = self._ladrilhos[k] = self.ax.imshow(
+                rgba, extent=self.grade.extensao_ladrilho(k), origin='lower',
+                interpolation='nearest', aspect='auto', zorder=0)
+        else:
+            imagem.set_data(rgba)
+        return imagem
+
+    def atualizar_grade(self):
+        """Redesenha os ladrilhos da grade alterados desde a última chamada."""
+        if self.grade is None:
+            return
+        sujos = self.grade.ladrilhos_sujos()
+        passo = self._calcular_passo_grade()
+        if passo != self._passo_grade:
+            # Zoom ou tamanho da figura mudaram: todos os ladrilhos são refeitos na nova escala
+            self._passo_grade = passo
+            for k in sujos | set(self._ladrilhos):
+                self._imagem_ladrilho(k)
+            self.invalidar_fundo()
+            return
+        if not sujos:
+            return
+        inicio, fim = self.ax.get_xlim()
+        visiveis = []
+        for k in sorted(sujos):
+            imagem = self._imagem_ladrilho(k)
+            x0, x1, _, _ = self.grade.extensao_ladrilho(k)
+            if x1 > inicio and x0 < fim:
+                visiveis.append(imagem)
+        if self._fundo is None or not visiveis:
+            # Ladrilhos fora da janela entram no próximo redesenho completo
+            return
+        self.canvas.restore_region(self._fundo)
+        for imagem in visiveis:
+            self.ax.draw_artist(imagem)
+        # O que fica acima da grade no redesenho completo é desenhado de novo por cima
+        for artista in self.ax.get_xgridlines() + self.ax.get_ygridlines() + list(self.ax.spines.values()):
+            self.ax.draw_artist(artista)
+        self.ax.draw_artist(self.vitimas_marker)
+        # A legenda é o artista mais caro; só é redesenhada se algum ladrilho a cobriu
+        if self._caixa_legenda is not None and any(
+                imagem.get_window_extent().overlaps(self._caixa_legenda) for imagem in visiveis):
+            self.ax.draw_artist(self.ax.get_legend())
+        self._fundo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ladrilhos_desenhados += len(visiveis)
+        self._desenhar_animados()
+
+    def atualizar(self, x, y, robo=0):
+        self._acompanhar(x)
+        marcador, caminho, historico = self._robos[robo]
+        historico.adicionar(x, y)
+        marcador.set_data([x], [y])
+        caminho.set_data(*historico.coordenadas())
+
+        if self._fundo is None:
+            # Redesenho completo pendente; os artistas animados vêm junto com ele
+            return
+        self.canvas.restore_region(self._fundo)
+        self._desenhar_animados()
@@ -0,0 +1,305 @@
+import math
+
+import numpy as np
+
+from simulacao import LARGURA_TUNEL, RAIO_DETECCAO, RAIO_KIT
+
+RESOLUCAO_NAVEGACAO = 0.25  # metros por célula
+RAIO_OBSTACULO = 0.3  # uma vítima bloqueia as células a esta distância dela
+ALCANCE_VISITA = 0.8 * RAIO_KIT  # o robô para a esta distância da vítima
+# O campo de distâncias de uma vítima cobre o trecho do túnel entre ela e o robô que a
+# procura, com esta folga dos dois lados para contornar obstáculos.
+MARGEM_JANELA = 2.0
+# Alvos sem dono (que o robô que os detectou não alcança) podem ser assumidos por qualquer
+# robô a até esta distância deles
+ALCANCE_LIVRES = 2 * RAIO_DETECCAO
+
+# Oito vizinhos de uma célula e o custo do passo, em células
+VIZINHOS = [(dy, dx, math.hypot(dy, dx)) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+
+
+class CampoDistancias:
+    """Distância, em metros, de cada célula de uma janela do túnel até uma vítima.
+
+    As células de partida são as livres a até ALCANCE_VISITA da vítima. A distância se
+    propaga pelos oito vizinhos e contorna as células bloqueadas; o resultado é o mesmo de um
+    Dijkstra, mas cada onda de relaxação atualiza a janela inteira de uma vez com NumPy.
+    """
+
+    def __init__(self, vitima, bloqueadas, coluna_inicial, resolucao):
+        self.vitima = vitima
+        self.coluna_inicial = coluna_inicial
+        self.resolucao = resolucao
+        self.linhas, self.colunas = bloqueadas.shape
+        self.coluna_final = coluna_inicial + self.colunas
+
+        ys = (np.arange(self.linhas) + 0.5) * resolucao
+        xs = (np.arange(coluna_inicial, self.coluna_final) + 0.5) * resolucao
+        fontes = np.hypot(xs[None, :] - vitima.x, ys[:, None] - vitima.y) <= ALCANCE_VISITA
+        fontes &= ~bloqueadas
+
+        # Uma borda de infinitos evita tratar os limites da janela à parte
+        distancias = np.full((self.linhas + 2, self.colunas + 2), np.inf)
+        interior = distancias[1:-1, 1:-1]
+        interior[fontes] = 0.0
+        nova = interior.copy()
+        self.ondas = 0
+        while True:
+            for dy, dx, custo in VIZINHOS:
+                vizinho = distancias[1 + dy:self.linhas + 1 + dy, 1 + dx:self.colunas + 1 + dx]
+                np.minimum(nova, vizinho + custo, out=nova)
+            nova[bloqueadas] = np.inf
+            self.ondas += 1
+            if np.array_equal(nova, interior):
+                break
+            interior[...] = nova
+        # Listas Python: o caminho é extraído célula a célula
+        self._distancias = distancias.tolist()
+
+    def contem(self, x):
+        return self.coluna_inicial <= int(x / self.resolucao) < self.coluna_final
+
+    def distancia(self, x, y):
+        """Comprimento do caminho de (x, y) até a vítima (infinito se inalcançável)."""
+        linha, coluna = self._celula(x, y)
+        if linha is None:
+            return math.inf
+        d = self._distancias[linha][coluna]
+        if d == math.inf:
+            # O robô pode estar numa célula bloqueada; parte da melhor vizinha
+            d = min(self._distancias[linha + dy][coluna + dx] + custo for dy, dx, custo in VIZINHOS)
+        return d * self.resolucao
+
+    def _celula(self, x, y):
+        """Índices de (x, y) na matriz com borda, ou (None, None) fora da janela."""
+        coluna = int(x / self.resolucao) - self.coluna_inicial
+        linha = min(max(int(y / self.resolucao), 0), self.linhas - 1)
+        if not 0 <= coluna < self.colunas:
+            return None, None
+        return linha + 1, coluna + 1
+
+    def caminho(self, x, y):
+        """Centros das células de (x, y) até a vítima, descendo pelo campo; None se inalcançável."""
+        linha, coluna = self._celula(x, y)
+        if linha is None:
+            return None
+        distancias = self._distancias
+        atual = distancias[linha][coluna]
+        pontos = []
+        while atual > 0:
+            melhor, proxima = atual, None
+            for dy, dx, _ in VIZINHOS:
+                d = distancias[linha + dy][coluna + dx]
+                if d < melhor:
+                    melhor, proxima = d, (linha + dy, coluna + dx)
+            if proxima is None:
+                return None if atual == math.inf else pontos
+            linha, coluna = proxima
+            atual = melhor
+            pontos.append(((self.coluna_inicial + coluna - 0.5) * self.resolucao,
+                           (linha - 0.5) * self.resolucao))
+        return pontos
+
+
+class NavegadorTunel:
+    """Leva cada robô até as vítimas detectadas, desviando das outras vítimas no caminho.
+
+    Sem o navegador, o robô só avança ao longo do eixo central do túnel, e uma vítima conta
+    como alcançada pela distância em x. Com ele, cada vítima detectada que ainda precisa de
+    foto ou kit vira um alvo do robô que a detectou. O robô vai até o alvo mais próximo pelo
+    caminho, e depois volta ao eixo central em linha reta. Fotos e kits passam a exigir a
+    distância real até a vítima. Um alvo que o seu robô não consegue alcançar não é
+    abandonado: ele fica livre, e qualquer robô que passe a até ALCANCE_LIVRES dele o assume.
+
+    O túnel é uma grade de RESOLUCAO_NAVEGACAO metros, e as vítimas detectadas bloqueiam as
+    suas células. Cada alvo tem um CampoDistancias numa janela do túnel que vai dele até o
+    robô, calculado uma vez e reaproveitado a cada replanejamento enquanto o robô estiver
+    dentro da janela. Uma detecção nova só descarta os campos cuja janela contém a vítima
+    nova. Assim, o custo de replanejar não depende do comprimento do túnel nem do número de
+    vítimas.
+    """
+
+    def __init__(self, resolucao=RESOLUCAO_NAVEGACAO):
+        self.resolucao = resolucao
+        self.linhas = max(1, math.ceil(LARGURA_TUNEL / resolucao))
+        self.bloqueadas = np.zeros((self.linhas, 0), dtype=bool)
+        self._campos = {}  # vítima -> CampoDistancias
+        self._robos = []
+        self._alvos = []
+        self._livres = []  # alvos sem dono
+        self._recusados = []  # por robô, alvos livres que ele já não conseguiu alcançar
+        self._caminhos = []
+        self.campos_calculados = 0
+        self.campos_reaproveitados = 0
+        self.campos_descartados = 0
+        self.visitas = 0
+        self.desvio_lateral = 0.0  # metros percorridos fora do eixo x
+
+    def preparar(self, robos, cenario):
+        """Associa o navegador à frota; chamado por CentralDeControle.definir_frota."""
+        self._robos = list(robos)
+        self._alvos = [[] for _ in self._robos]
+        self._livres = []
+        self._recusados = [set() for _ in self._robos]
+        self._caminhos = [None for _ in self._robos]
+        colunas = max(1, math.ceil(cenario.comprimento / self.resolucao))
+        self.bloqueadas = np.zeros((self.linhas, colunas), dtype=bool)
+        self._campos = {}
+
+    # --- MAPA ---
+    def _bloquear(self, vitima):
+        """Marca as células da vítima como bloqueadas e descarta os campos que as incluem;
+        retorna os alvos desses campos."""
+        res = self.resolucao
+        c0 = max(int((vitima.x - RAIO_OBSTACULO) / res), 0)
+        c1 = min(int((vitima.x + RAIO_OBSTACULO) / res) + 1, self.bloqueadas.shape[1])
+        l0 = max(int((vitima.y - RAIO_OBSTACULO) / res), 0)
+        l1 = min(int((vitima.y + RAIO_OBSTACULO) / res) + 1, self.linhas)
+        if c0 >= c1 or l0 >= l1:
+            return []
+        ys = (np.arange(l0, l1) + 0.5) * res
+        xs = (np.arange(c0, c1) + 0.5) * res
+        self.bloqueadas[l0:l1, c0:c1] |= np.hypot(xs[None, :] - vitima.x, ys[:, None] - vitima.y) <= RAIO_OBSTACULO
+        descartados = [alvo for alvo, campo in self._campos.items()
+                       if c0 < campo.coluna_final and c1 > campo.coluna_inicial]
+        for alvo in descartados:
+            del self._campos[alvo]
+        self.campos_descartados += len(descartados)
+        return descartados
+
+    def campo(self, vitima, x):
+        """Campo de distâncias até `vitima` numa janela que contém a posição `x` do robô."""
+        campo = self._campos.get(vitima)
+        if campo is not None and campo.contem(x):
+            self.campos_reaproveitados += 1
+            return campo
+        res = self.resolucao
+        c0 = max(int((min(vitima.x, x) - MARGEM_JANELA) / res), 0)
+        c1 = min(int((max(vitima.x, x) + MARGEM_JANELA) / res) + 1, self.bloqueadas.shape[1])
+        campo = self._campos[vitima] = CampoDistancias(vitima, self.bloqueadas[:, c0:c1], c0, res)
+        self.campos_calculados += 1
+        return campo
+
+    # --- ALVOS ---
+    def registrar(self, robo, vitima):
+        """Chamado quando `robo` detecta `vitima`."""
+        descartados = self._bloquear(vitima)
+        self._alvos[robo.indice].append(vitima)
+        # Só refaz o caminho dos robôs cujo campo a vítima nova pode ter alterado
+        for i, plano in enumerate(self._caminhos):
+            if plano is not None and plano[0] in descartados:
+                self._caminhos[i] = None
+
+    @staticmethod
+    def _precisa_visita(robo, vitima):
+        return not vitima.foto_tirada or (vitima.necessita_kit() and robo.kits_primeiros_socorros > 0)
+
+    def _livres_ao_alcance(self, robo):
+        x, y = robo.posicao_atual, robo.pos_y
+        recusados = self._recusados[robo.indice]
+        return [v for v in self._livres if v not in recusados and self._precisa_visita(robo, v)
+                and math.hypot(v.x - x, v.y - y) <= ALCANCE_LIVRES]
+
+    def _planejar(self, robo):
+        """Escolhe o alvo mais próximo pelo caminho e retorna o caminho até ele.
+
+        Os candidatos (os alvos do robô e os livres ao seu alcance) são visitados em ordem de
+        distância em linha reta, que nunca é maior que a do caminho; a busca para quando
+        nenhum candidato restante pode ser mais próximo, então em geral só o campo do alvo
+        escolhido é calculado.
+        """
+        i = robo.indice
+        x, y = robo.posicao_atual, robo.pos_y
+        self._livres = [v for v in self._livres if not v.foto_tirada or v.necessita_kit()]
+        while True:
+            alvos = self._alvos[i] = [v for v in self._alvos[i] if self._precisa_visita(robo, v)]
+            candidatos = sorted((math.hypot(v.x - x, v.y - y), n, v)
+                                for n, v in enumerate(alvos + self._livres_ao_alcance(robo)))
+            melhor = None
+            for reta, _, vitima in candidatos:
+                if melhor is not None and reta >= melhor[0]:
+                    break
+                campo = self.campo(vitima, x)
+                distancia = campo.distancia(x, y)
+                if melhor is None or distancia < melhor[0]:
+                    melhor = (distancia, campo)
+            if melhor is None:
+                return None
+            distancia, campo = melhor
+            vitima = campo.vitima
+            caminho = campo.caminho(x, y) if distancia < math.inf else None
+            if vitima in self._livres:
+                if caminho is None:
+                    self._recusados[i].add(vitima)
+                    continue
+                # O robô assume o alvo livre
+                self._livres.remove(vitima)
+                alvos.append(vitima)
+            if caminho is not None:
+                return [vitima, caminho, 0]
+            # Inalcançável daqui (cercado por outras vítimas): o alvo fica livre para outro robô
+            alvos.remove(vitima)
+            self._livres.append(vitima)
+            self._recusados[i].add(vitima)
+
+    def _deslocar(self, robo, x, y):
+        dx, dy = x - robo.posicao_atual, y - robo.pos_y
+        robo.deslocar(dx, dy)
+        self.desvio_lateral += abs(dy)
+
+    def mover(self, robo, distancia):
+        """Avança `robo` por `distancia` metros: rumo ao alvo, ou ao longo do túnel."""
+        i = robo.indice
+        plano = self._caminhos[i]
+        if plano is None and (self._alvos[i] or self._livres):
+            plano = self._caminhos[i] = self._planejar(robo)
+        if plano is None:
+            # Sem alvo: segue o túnel e volta ao eixo central aos poucos
+            volta = LARGURA_TUNEL / 2 - robo.pos_y
+            lateral = max(-0.5 * distancia, min(0.5 * distancia, volta))
+            self._deslocar(robo, robo.posicao_atual + math.sqrt(distancia ** 2 - lateral ** 2),
+                           robo.pos_y + lateral)
+            return
+
+        vitima, caminho, proximo = plano
+        restante = distancia
+        while proximo < len(caminho) and restante > 0:
+            x, y = caminho[proximo]
+            trecho = math.hypot(x - robo.posicao_atual, y - robo.pos_y)
+            if trecho > restante:
+                fracao = restante / trecho
+                x = robo.posicao_atual + (x - robo.posicao_atual) * fracao
+                y = robo.pos_y + (y - robo.pos_y) * fracao
+                trecho = restante
+            else:
+                proximo += 1
+            self._deslocar(robo, x, y)
+            restante -= trecho
+        plano[2] = proximo
+        if proximo >= len(caminho):
+            # Chegou: a foto e o kit são feitos na verificação deste mesmo tick
+            self.visitas += 1
+            self._alvos[i].remove(vitima)
+            self._campos.pop(vitima, None)
+            self._caminhos[i] = None
+
+    def recuo(self, robo):
+        """Menor x a que `robo` ainda pode voltar: o seu alvo mais atrasado, ou a sua posição."""
+        return min([robo.posicao_atual] + [v.x for v in self._alvos[robo.indice]])
+
+    def distancia(self, robo, vitima):
+        return math.hypot(vitima.x - robo.posicao_atual, vitima.y - robo.pos_y)
+
+    def resumo(self):
+        return {
+            'vitimas_visitadas': self.visitas,
+            'desvio_lateral_m': round(self.desvio_lateral, 1),
+            'campos_calculados': self.campos_calculados,
+            'campos_reaproveitados': self.campos_reaproveitados,
+            'campos_descartados': self.campos_descartados,
+        }
+
+    def descricao(self):
+        return (f"{self.visitas} vítima(s) visitada(s), {self.desvio_lateral:.1f} m de desvio lateral; "
+                f"campos de distância: {self.campos_calculados} calculado(s), "
+                f"{self.campos_reaproveitados} reaproveitado(s), {self.campos_descartados} descartado(s)")
@@ -0,0 +1,101 @@
+import tkinter as tk
+from collections import deque
+import datetime
+import os
+
+TIPOS_LOG = ("INFO", "ALERTA", "SUCESSO", "PERIGO")
+CORES_TIPO_LOG = {"INFO": "#FFFFFF", "ALERTA": "#FF9800", "SUCESSO": "#4CAF50", "PERIGO": "#F44336"}
+
+
+class RegistroLogArquivo:
+    """Mantém o log completo da missão em disco. As linhas chegam em lotes (uma escrita por
+    quadro da interface), então o custo por mensagem é só o de montar a string."""
+
+    def __init__(self, caminho):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        self.caminho = caminho
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+
+    def escrever(self, linhas):
+        if linhas:
+            self._arquivo.write("\n".join(linhas) + "\n")
+            self._arquivo.flush()
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+def caminho_log_missao(diretorio):
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    return os.path.join(diretorio, "logs", f"missao_{timestamp}.log")
+
+
+class PainelLog:
+    """Exibe um log num widget de texto com memória limitada.
+
+    As linhas ficam num buffer circular de `capacidade` entradas; o widget nunca mostra mais
+    do que isso, e as linhas mais antigas são removidas. Novas linhas são acumuladas e
+    inseridas de uma só vez por descarregar(), chamado uma vez por quadro. O filtro por tipo
+    (INFO/ALERTA/SUCESSO/PERIGO) só afeta a exibição: o buffer e o arquivo guardam tudo.
+    """
+
+    def __init__(self, widget, nome, capacidade=500, registro_arquivo=None):
+        self.widget = widget
+        self.nome = nome
+        self.capacidade = capacidade
+        self.registro_arquivo = registro_arquivo
+        self._linhas = deque(maxlen=capacidade)
+        self._pendentes = deque(maxlen=capacidade)
+        self._para_arquivo = []
+        self._linhas_exibidas = 0
+        self.filtro = set(TIPOS_LOG)
+
+        for tipo, cor in CORES_TIPO_LOG.items():
+            self.widget.tag_configure(tipo, foreground=cor)
+        self.widget.config(state=tk.DISABLED)
+
+    def anexar(self, tipo, linha):
+        entrada = (tipo, linha)
+        self._linhas.append(entrada)
+        self._para_arquivo.append(f"{self.nome} {tipo:<7} {linha}")
+        if tipo in self.filtro:
+            self._pendentes.append(entrada)
+
+    def descarregar(self):
+        """Insere no widget, numa única operação, as linhas acumuladas desde a última chamada."""
+        if self.registro_arquivo is not None and self._para_arquivo:
+            self.registro_arquivo.escrever(self._para_arquivo)
+        self._para_arquivo = []
+
+        if not self._pendentes:
+            return
+        pendentes, self._pendentes = self._pendentes, deque(maxlen=self.capacidade)
+
+        self.widget.config(state=tk.NORMAL)
+        self._inserir(pendentes)
+        excesso = self._linhas_exibidas - self.capacidade
+        if excesso > 0:
+            self.widget.delete("1.0", f"{excesso + 1}.0")
+            self._linhas_exibidas -= excesso
+        self.widget.config(state=tk.DISABLED)
+        self.widget.see(tk.END)
+
+    def definir_filtro(self, tipos):
+        """Exibe apenas os tipos informados, reconstruindo o widget a partir do buffer."""
+        self.filtro = set(tipos)
+        self._pendentes.clear()
+        self.widget.config(state=tk.NORMAL)
+        self.widget.delete("1.0", tk.END)
+        self._linhas_exibidas = 0
+        self._inserir([e for e in self._linhas if e[0] in self.filtro])
+        self.widget.config(state=tk.DISABLED)
+        self.widget.see(tk.END)
+
+    def _inserir(self, entradas):
+        if not entradas:
+            return
+        argumentos = []
+        for tipo, linha in entradas:
+            argumentos.extend((linha + "\n", tipo))
+        self.widget.insert(tk.END, *argumentos)
+        self._linhas_exibidas += len(entradas)
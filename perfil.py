@@ -0,0 +1,175 @@
+import math
+import time
+from array import array
+
+FASES = ("movimento", "sensores", "deteccao", "pacote", "despacho")
+
+
+def formatar_duracao(segundos):
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.1f} µs"
+    if segundos < 1:
+        return f"{segundos * 1e3:.2f} ms"
+    return f"{segundos:.2f} s"
+
+
+class HistogramaTempos:
+    """Histograma de durações com baldes fixos em escala logarítmica.
+
+    Registrar uma duração é O(1) e a memória não cresce com o número de amostras. Os
+    percentis são aproximados pelo limite superior do balde (erro de ~12% com 20 baldes por
+    década), o que basta para ver onde o tempo de um tick é gasto.
+    """
+
+    def __init__(self, minimo=1e-7, maximo=10.0, baldes_por_decada=20):
+        self.minimo = minimo
+        self.baldes_por_decada = baldes_por_decada
+        self._log_minimo = math.log10(minimo)
+        self._n_baldes = math.ceil(math.log10(maximo / minimo) * baldes_por_decada) + 1
+        # Balde 0: abaixo do mínimo; último balde: acima do máximo
+        self.contagens = array('Q', bytes(8 * (self._n_baldes + 1)))
+        self.total = 0
+        self.soma = 0.0
+        self.maior = 0.0
+
+    def registrar(self, duracao):
+        if duracao <= self.minimo:
+            i = 0
+        else:
+            i = min(int((math.log10(duracao) - self._log_minimo) * self.baldes_por_decada) + 1, self._n_baldes)
+        self.contagens[i] += 1
+        self.total += 1
+        self.soma += duracao
+        if duracao > self.maior:
+            self.maior = duracao
+
+    def _limite_superior(self, i):
+        return self.minimo * 10 ** (i / self.baldes_por_decada)
+
+    def percentil(self, p):
+        """Duração abaixo da qual estão `p`% das amostras (0 se não houver amostras)."""
+        if not self.total:
+            return 0.0
+        alvo = p / 100 * self.total
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(self._limite_superior(i), self.maior)
+        return self.maior
+
+    @property
+    def media(self):
+        return self.soma / self.total if self.total else 0.0
+
+    def limpar(self):
+        for i in range(len(self.contagens)):
+            self.contagens[i] = 0
+        self.total = 0
+        self.soma = 0.0
+        self.maior = 0.0
+
+
+class PerfilTick:
+    """Tempo gasto em cada fase do tick da missão (ver MotorSimulacao.passo).
+
+    Guarda um histograma por fase, um para a duração total do tick e um para o jitter, a
+    variação entre o período de um tick (início a início) e o do tick anterior. É escrito
+    só pela thread da missão; a interface apenas lê os histogramas, e uma leitura no meio
+    de um registro no máximo mistura amostras de dois ticks vizinhos. Com `ativo` falso a
+    medição fica pausada, mas o que já foi medido continua disponível.
+    """
+
+    def __init__(self):
+        self.ativo = True
+        self.fases = {fase: HistogramaTempos() for fase in FASES}
+        self.tick = HistogramaTempos()
+        self.jitter = HistogramaTempos()
+        self._inicio_anterior = None
+        self._periodo_anterior = None
+
+    def pausar(self):
+        self.ativo = False
+        # O intervalo em que a medição ficou pausada não conta como jitter
+        self._inicio_anterior = None
+        self._periodo_anterior = None
+
+    def retomar(self):
+        self.ativo = True
+
+    def registrar_tick(self, inicio, fim, duracoes):
+        """Registra um tick que foi de `inicio` a `fim` (perf_counter); `duracoes` traz o
+        tempo gasto em cada fase, na ordem de FASES."""
+        for histograma, duracao in zip(self.fases.values(), duracoes):
+            histograma.registrar(duracao)
+        self.tick.registrar(fim - inicio)
+
+        if self._inicio_anterior is not None:
+            periodo = inicio - self._inicio_anterior
+            if self._periodo_anterior is not None:
+                self.jitter.registrar(abs(periodo - self._periodo_anterior))
+            self._periodo_anterior = periodo
+        self._inicio_anterior = inicio
+
+    def _histogramas(self):
+        return [*self.fases.items(), ("tick", self.tick), ("jitter", self.jitter)]
+
+    def resumo(self):
+        """Percentis (em segundos) de cada fase, do tick inteiro e do jitter."""
+        return {
+            nome: {
+                'amostras': h.total,
+                'media': h.media,
+                'p50': h.percentil(50),
+                'p95': h.percentil(95),
+                'p99': h.percentil(99),
+                'maximo': h.maior,
+            }
+            for nome, h in self._histogramas()
+        }
+
+    def linhas_tabela(self):
+        linhas = [f"{'Fase':<10} {'p50':>10} {'p95':>10} {'p99':>10} {'máximo':>10}"]
+        for nome, h in self._histogramas():
+            valores = (h.percentil(50), h.percentil(95), h.percentil(99), h.maior)
+            linhas.append(f"{nome:<10} " + " ".join(f"{formatar_duracao(v):>10}" for v in valores))
+        return linhas
+
+    def limpar(self):
+        for _, h in self._histogramas():
+            h.limpar()
+        self._inicio_anterior = None
+        self._periodo_anterior = None
+
+
+class CronometroInicializacao:
+    """Marcos da inicialização da interface, contados a partir de `inicio` (perf_counter).
+
+    Cada marco registra o instante em que uma etapa terminou; etapas que rodam em paralelo
+    (como as importações em segundo plano) entram com a sua própria duração em `medir`.
+    """
+
+    def __init__(self, inicio=None):
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.marcos = []
+        self.paralelas = []
+
+    def marcar(self, etapa):
+        self.marcos.append((etapa, time.perf_counter()))
+
+    def medir(self, etapa, duracao):
+        self.paralelas.append((etapa, duracao))
+
+    def total(self):
+        return self.marcos[-1][1] - self.inicio if self.marcos else 0.0
+
+    def linhas_tabela(self):
+        linhas = [f"{'Etapa':<28} {'duração':>10} {'acumulado':>10}"]
+        anterior = self.inicio
+        for etapa, instante in self.marcos:
+            linhas.append(f"{etapa:<28} {formatar_duracao(instante - anterior):>10} "
+                          f"{formatar_duracao(instante - self.inicio):>10}")
+            anterior = instante
+        for etapa, duracao in self.paralelas:
+            linhas.append(f"{etapa:<28} {formatar_duracao(duracao):>10} {'(paralelo)':>10}")
+        return linhas
@@ -0,0 +1,146 @@
+import csv
+import datetime
+import json
+import os
+
+ORDEM_PRIORIDADE = {"Crítico": 0, "Grave": 1, "Moderado": 2, "Leve": 3}
+CAMPOS_CSV = ("id", "x", "y", "gravidade", "estado", "registro_de_campo", "kit_aplicado")
+
+
+def agrupar_por_prioridade(vitimas):
+    """Ordena as vítimas por prioridade em tempo linear (um balde por gravidade).
+
+    Dentro de cada gravidade a ordem original é mantida, como em um sorted() estável.
+    """
+    baldes = [[] for _ in range(len(ORDEM_PRIORIDADE) + 1)]
+    for vitima in vitimas:
+        baldes[ORDEM_PRIORIDADE.get(vitima.gravidade, len(ORDEM_PRIORIDADE))].append(vitima)
+    for balde in baldes:
+        yield from balde
+
+
+class EscritorRelatorio:
+    """Escreve o relatório final da missão diretamente em arquivos abertos.
+
+    Numa única passada pelas vítimas detectadas gera, conforme os destinos informados, o
+    texto legível (TXT), uma linha por vítima (CSV) e um documento estruturado (JSON). Nada
+    é acumulado em memória além dos baldes de prioridade.
+    """
+
+    def __init__(self, central):
+        self.central = central
+
+    def resumo(self):
+        central = self.central
+        return {
+            'emitido_em': datetime.datetime.now(),
+            'status': "Concluída" if central.tunel_concluido() else "Interrompida",
+            'robos': len(central.robos),
+            'distancia': central.distancia_percorrida(),
+            'bateria': central.bateria_media(),
+            'kits_utilizados': central.kits_utilizados(),
+            'kits_necessarios': central.cenario.total_kits_necessarios(),
+            'vitimas_detectadas': len(central.vitimas_detectadas),
+        }
+
+    def _perfil(self):
+        perfil = self.central.perfil
+        return perfil if perfil is not None and perfil.tick.total else None
+
+    def escrever(self, txt=None, csv_arquivo=None, json_arquivo=None):
+        resumo = self.resumo()
+        perfil = self._perfil()
+        escritor_csv = None
+
+        if txt is not None:
+            self._cabecalho_txt(txt, resumo)
+        if csv_arquivo is not None:
+            escritor_csv = csv.writer(csv_arquivo)
+            escritor_csv.writerow(CAMPOS_CSV)
+        if json_arquivo is not None:
+            cabecalho = dict(resumo, emitido_em=resumo['emitido_em'].isoformat())
+            if perfil is not None:
+                cabecalho['desempenho'] = perfil.resumo()
+            if self.central.agendador is not None:
+                cabecalho['ritmo'] = self.central.agendador.resumo()
+            if self.central.triagem is not None:
+                cabecalho['triagem'] = self.central.triagem.resumo()
+            if self.central.navegacao is not None:
+                cabecalho['navegacao'] = self.central.navegacao.resumo()
+            # Abre o objeto e a lista de vítimas; cada vítima é serializada à medida que passa
+            json_arquivo.write(json.dumps(cabecalho, ensure_ascii=False)[:-1] + ', "vitimas": [')
+            codificar_json = json.JSONEncoder(ensure_ascii=False).encode
+
+        primeira = True
+        for vitima in agrupar_por_prioridade(self.central.vitimas_detectadas):
+            # Cada atributo é lido uma vez e reaproveitado pelos três formatos
+            vid, x, y = vitima.id, vitima.x, vitima.y
+            gravidade, estado = vitima.gravidade, vitima.estado
+            foto, kit = vitima.foto_tirada, vitima.kit_aplicado
+            if txt is not None:
+                txt.write(
+                    f"\n  - Vítima ID: {vid}\n"
+                    f"    Coordenadas (X, Y): ({x}m, {y}m)\n"
+                    f"    Gravidade: {gravidade}\n"
+                    f"    Registro de Campo: {'Sim' if foto else 'Não'}\n"
+                    f"    Kit de Socorro Aplicado: {'Sim' if kit else 'Não'}\n"
+                )
+            if escritor_csv is not None:
+                escritor_csv.writerow((vid, x, y, gravidade, estado, int(foto), int(kit)))
+            if json_arquivo is not None:
+                registro = {"id": vid, "x": x, "y": y, "gravidade": gravidade, "estado": estado,
+                            "registro_de_campo": foto, "kit_aplicado": kit}
+                json_arquivo.write(("" if primeira else ", ") + codificar_json(registro))
+            primeira = False
+
+        if txt is not None and primeira:
+            txt.write("Nenhuma vítima foi detectada durante a missão.\n")
+        if txt is not None and self.central.triagem is not None:
+            txt.write(f"\n--- TRIAGEM DE KITS ---\n{self.central.triagem.descricao()}\n")
+        if txt is not None and self.central.navegacao is not None:
+            txt.write(f"\n--- NAVEGAÇÃO ---\n{self.central.navegacao.descricao()}\n")
+        if txt is not None and self.central.agendador is not None:
+            txt.write(f"\n--- RITMO DA MISSÃO ---\n{self.central.agendador.descricao()}\n")
+        if txt is not None and perfil is not None:
+            self._desempenho_txt(txt, perfil)
+        if json_arquivo is not None:
+            json_arquivo.write("]}\n")
+
+    def _cabecalho_txt(self, txt, resumo):
+        # Com um único robô o texto é o mesmo de antes da frota
+        frota = f"Robôs na Frota: {resumo['robos']}\n" if resumo['robos'] > 1 else ""
+        txt.write(
+            "--- RELATÓRIO FINAL DA MISSÃO ---\n\n"
+            f"Data e Hora de Emissão: {resumo['emitido_em'].strftime('%d/%m/%Y %H:%M:%S')}\n"
+            f"Status da Missão: {resumo['status']}\n\n"
+            "--- Resumo da Operação ---\n"
+            f"{frota}"
+            f"Distância Total Percorrida: {resumo['distancia']:.1f}m\n"
+            f"Nível Final da Bateria: {resumo['bateria']:.1f}%\n"
+            f"Kits de Socorro Utilizados pelo Robô: {resumo['kits_utilizados']}\n"
+            f"Total de Kits Necessários na Missão: {resumo['kits_necessarios']}\n\n"
+            f"--- VÍTIMAS DETECTADAS ({resumo['vitimas_detectadas']}) - ORDENADAS POR PRIORIDADE ---\n"
+        )
+
+    def _desempenho_txt(self, txt, perfil):
+        txt.write(f"\n--- DESEMPENHO POR TICK ({perfil.tick.total} ticks) ---\n")
+        txt.write("\n".join(perfil.linhas_tabela()) + "\n")
+
+
+def salvar_relatorios(central, diretorio, formatos=("txt", "csv", "json")):
+    """Grava o relatório nos formatos pedidos, com nome relatorio_missao_<data-hora>.<formato>.
+
+    Retorna a lista de caminhos gerados.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    caminhos = {fmt: os.path.join(diretorio, f"relatorio_missao_{timestamp}.{fmt}") for fmt in formatos}
+    arquivos = {}
+    try:
+        for fmt, caminho in caminhos.items():
+            arquivos[fmt] = open(caminho, "w", encoding="utf-8", newline="" if fmt == "csv" else None)
+        EscritorRelatorio(central).escrever(arquivos.get("txt"), arquivos.get("csv"), arquivos.get("json"))
+    finally:
+        for arquivo in arquivos.values():
+            arquivo.close()
+    return list(caminhos.values())
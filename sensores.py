@@ -0,0 +1,138 @@
+import random
+from collections import OrderedDict
+
+# Faixas das leituras, as mesmas do modelo aleatório original
+TEMP_MINIMA, TEMP_MAXIMA = 24.0, 28.0
+GAS_MAXIMO = 0.5
+RISCO_MINIMO, RISCO_MAXIMO = 1, 3
+
+
+class ModeloSensoresAleatorio:
+    """Modelo original: leituras independentes a cada tick, do gerador global `random`."""
+
+    # A leitura não depende da posição do robô: o AgendadorMissao pode lê-la no seu próprio ritmo
+    leitura_no_tick = False
+
+    def ler(self, robo):
+        robo.temperatura = 25 + random.uniform(-1, 3)
+        return {
+            'temp': round(robo.temperatura, 1),
+            'risco_estrutural': random.randint(1, 3),
+            'gas': round(random.uniform(0, 0.5), 2)
+        }
+
+
+class CampoSensores:
+    """Campos de temperatura, gás e risco estrutural ao longo do túnel, gerados a partir de
+    uma semente.
+
+    Cada campo é uma soma de senoides com comprimentos de onda entre `correlacao` e
+    10 * `correlacao` metros e fases sorteadas pela semente, então pontos próximos do
+    túnel têm leituras parecidas. A temperatura também recebe um ruído de medição pequeno
+    por amostra. Os campos são calculados com NumPy em blocos de `comprimento_bloco`
+    metros, amostrados a cada `resolucao` metros, e guardados num LRU de `blocos_em_memoria`
+    blocos. A leitura de um tick é só uma interpolação linear entre duas amostras do bloco.
+    A mesma semente gera sempre o mesmo túnel, e portanto a mesma telemetria, também em
+    tempo real: a leitura é feita dentro do tick, na posição do tick (`leitura_no_tick`).
+    """
+
+    leitura_no_tick = True
+
+    def __init__(self, semente=0, correlacao=10.0, resolucao=1.0, comprimento_bloco=200.0,
+                 blocos_em_memoria=8, ruido_temp=0.1):
+        import numpy as np
+
+        self.semente = semente
+        self.resolucao = resolucao
+        self.comprimento_bloco = comprimento_bloco
+        self.blocos_em_memoria = blocos_em_memoria
+        self.ruido_temp = ruido_temp
+        self._amostras_bloco = int(round(comprimento_bloco / resolucao))
+        self._blocos = OrderedDict()
+        self._ultimo = (None, None)  # último bloco consultado: o caso comum a cada tick
+        self.blocos_gerados = 0
+
+        # Seis senoides por campo (temp, gás, risco), sorteadas uma única vez. As três somas
+        # saem de um único produto: seno de (n x 18) fases vezes amplitudes (18 x 3)
+        rng = np.random.default_rng([semente, 0])
+        n = 6
+        comprimentos = correlacao * 10 ** rng.uniform(0, 1, (3, n))
+        amplitudes = rng.uniform(0.5, 1.0, (3, n)) * comprimentos / comprimentos.max(axis=1, keepdims=True)
+        # Normaliza pelo desvio padrão de cada soma, para os campos cobrirem toda a faixa
+        amplitudes /= 2 * np.sqrt(np.sum(amplitudes ** 2, axis=1, keepdims=True) / 2)
+        self._frequencias = (2 * np.pi / comprimentos).ravel()
+        self._fases = rng.uniform(0, 2 * np.pi, 3 * n)
+        self._amplitudes = np.zeros((3 * n, 3))
+        for campo in range(3):
+            self._amplitudes[campo * n:(campo + 1) * n, campo] = amplitudes[campo]
+
+    def _campos(self, xs):
+        """Valores em [0, 1] dos três campos nas posições `xs`: matriz (len(xs) x 3)."""
+        import numpy as np
+
+        soma = np.sin(np.outer(xs, self._frequencias) + self._fases) @ self._amplitudes
+        return 0.5 + 0.5 * np.clip(soma, -1, 1)
+
+    def _gerar_bloco(self, k):
+        import numpy as np
+
+        # Uma amostra a mais no fim: a interpolação da última posição do bloco usa a seguinte
+        xs = k * self.comprimento_bloco + np.arange(self._amostras_bloco + 1) * self.resolucao
+        rng = np.random.default_rng([self.semente, 1, k])
+        campos = self._campos(xs)
+        temp = TEMP_MINIMA + (TEMP_MAXIMA - TEMP_MINIMA) * campos[:, 0]
+        temp = np.clip(temp + rng.normal(0, self.ruido_temp, xs.size), TEMP_MINIMA, TEMP_MAXIMA)
+        gas = GAS_MAXIMO * campos[:, 1]
+        risco = np.minimum(RISCO_MINIMO + (RISCO_MAXIMO - RISCO_MINIMO + 1) * campos[:, 2],
+                           RISCO_MAXIMO).astype(np.int64)
+        self.blocos_gerados += 1
+        # Listas Python: indexar uma lista é bem mais barato que indexar um array escalar
+        return temp.tolist(), gas.tolist(), risco.tolist()
+
+    def _bloco(self, k):
+        ultimo_k, bloco = self._ultimo
+        if k == ultimo_k:
+            return bloco
+        bloco = self._blocos.get(k)
+        if bloco is None:
+            bloco = self._blocos[k] = self._gerar_bloco(k)
+            if len(self._blocos) > self.blocos_em_memoria:
+                self._blocos.popitem(last=False)
+        else:
+            self._blocos.move_to_end(k)
+        self._ultimo = (k, bloco)
+        return bloco
+
+    def amostrar(self, x):
+        """(temperatura, gás, risco) na posição `x` do túnel."""
+        if x < 0.0:
+            x = 0.0
+        k = int(x // self.comprimento_bloco)
+        temp, gas, risco = self._bloco(k)
+        posicao = (x - k * self.comprimento_bloco) / self.resolucao
+        i = int(posicao)
+        if i >= self._amostras_bloco:
+            i = self._amostras_bloco - 1
+        frac = posicao - i
+        t0, g0 = temp[i], gas[i]
+        return (t0 + (temp[i + 1] - t0) * frac,
+                g0 + (gas[i + 1] - g0) * frac,
+                risco[i] if frac < 0.5 else risco[i + 1])
+
+    def ler(self, robo):
+        temp, gas, risco = self.amostrar(robo.posicao_atual)
+        robo.temperatura = temp
+        return {
+            'temp': round(temp, 1),
+            'risco_estrutural': risco,
+            'gas': round(gas, 2)
+        }
+
+
+def criar_modelo_sensores(nome, semente=None):
+    """Cria o modelo de sensores pelo nome usado na linha de comando (--sensores)."""
+    if nome == "aleatorio":
+        return ModeloSensoresAleatorio()
+    if nome == "campo":
+        return CampoSensores(semente if semente is not None else random.randrange(2**32))
+    raise ValueError(f"modelo de sensores desconhecido: {nome!r}")
@@ -0,0 +1,914 @@
+import datetime
+import threading
+import time
+import random
+import bisect
+import io
+import math
+import os
+from array import array
+from collections import OrderedDict
+
+from relatorio import EscritorRelatorio
+from sensores import ModeloSensoresAleatorio
+
+# --- CONFIGURAÇÕES DE IMAGENS ---
+# Isso garante que o script encontre a pasta 'imagens' que está no mesmo diretório que ele.
+DIRETORIO_DO_SCRIPT = os.path.dirname(os.path.abspath(__file__))
+PASTA_IMAGENS = os.path.join(DIRETORIO_DO_SCRIPT, "imagens")
+
+
+# Mapeamento dos arquivos
+MAP_CENARIOS = {
+    # Cenário Leve/Estável/Verde
+    'leve': 'verdeconscienteestavel.png',
+    'baixa': 'verdeconscienteestavel.png',
+    'consciente': 'verdeconscienteestavel.png',
+    'estável': 'verdeconscienteestavel.png',
+    'estavel': 'verdeconscienteestavel.png',
+
+    # Cenário Médio/Confuso/Vermelho
+    'moderado': 'vermelhoconfusoinstavel.png',
+    'média': 'vermelhoconfusoinstavel.png',
+    'media': 'vermelhoconfusoinstavel.png',
+    'instável': 'vermelhoconfusoinstavel.png',
+    'instavel': 'vermelhoconfusoinstavel.png',
+    'semi-consciente': 'vermelhoconfusoinstavel.png',
+    'semiconsciente': 'vermelhoconfusoinstavel.png',
+
+    # Cenário Grave/Crítico
+    'grave': 'graveinconscientecritico.png',
+    'crítico': 'graveinconscientecritico.png', # A chave pode ter acento
+    'critico': 'graveinconscientecritico.png',
+    'inconsciente': 'graveinconscientecritico.png',
+    
+    # Padrão
+    '_default_': 'vermelhoconfusoinstavel.png'
+}
+
+# --- VERIFICAÇÃO DA PASTA DE IMAGENS ---
+def verificar_pasta_imagens():
+    """Verifica se a pasta de imagens existe"""
+    if not os.path.exists(PASTA_IMAGENS):
+        print(f"❌ ERRO CRÍTICO: A pasta de imagens não foi encontrada no caminho:")
+        print(f"   '{os.path.abspath(PASTA_IMAGENS)}'")
+        return False
+    
+    print(f"✅ Pasta de imagens encontrada em: {os.path.abspath(PASTA_IMAGENS)}")
+    
+    arquivos_necessarios = set(MAP_CENARIOS.values())
+    arquivos_existentes = set(os.listdir(PASTA_IMAGENS))
+    
+    print("\n--- VERIFICAÇÃO DE ARQUIVOS ---")
+    print(f"Arquivos que o código ESPERA: {sorted(list(arquivos_necessarios))}")
+    print(f"Arquivos que o código ENCONTROU na pasta: {sorted(list(arquivos_existentes))}")
+    
+    arquivos_faltantes = arquivos_necessarios - arquivos_existentes
+    if arquivos_faltantes:
+        print(f"⚠️ Arquivos faltantes: {arquivos_faltantes}")
+        return False
+    
+    print("✅ Pasta de imagens verificada!")
+    print("---------------------------------\n")
+    return True
+
+# --- PARÂMETROS DA MISSÃO ---
+GRAVIDADES = ("Leve", "Moderado", "Grave", "Crítico")
+ESTADOS = ("Consciente", "Inconsciente", "Semi-consciente")
+RAIO_DETECCAO = 5   # metros
+RAIO_FOTO = 2
+RAIO_KIT = 1
+LARGURA_TUNEL = 10.0  # metros; o robô anda pelo eixo central
+
+# --- CACHE DE RETRATOS ---
+TAMANHO_RETRATO = 240  # lado do retrato em pixels (3 polegadas a 80 dpi)
+CAPACIDADE_CACHE_RETRATOS = 64
+CORES_GRAVIDADE = {"Leve": "#4CAF50", "Moderado": "#FF9800", "Grave": "#F44336", "Crítico": "#8B0000"}
+
+class CacheRetratos:
+    """Cache LRU dos retratos PNG das vítimas, compartilhado por todo o cenário.
+
+    Os retratos são indexados por (arquivo de imagem, cor da gravidade, tamanho), de modo que
+    vítimas no mesmo estado reaproveitam os mesmos bytes. As imagens de origem da pasta
+    'imagens' são decodificadas uma única vez e mantidas em memória.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_CACHE_RETRATOS):
+        self.capacidade = capacidade
+        self._retratos = OrderedDict()
+        self._imagens_fonte = {}
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, nome_arquivo, gravidade, tamanho=TAMANHO_RETRATO):
+        """Retorna os bytes PNG do retrato, renderizando-o apenas na primeira vez."""
+        cor = CORES_GRAVIDADE.get(gravidade, "white")
+        chave = (nome_arquivo, cor, tamanho)
+        with self._trava:
+            retrato = self._retratos.get(chave)
+            if retrato is not None:
+                self._retratos.move_to_end(chave)
+                self.acertos += 1
+                return retrato
+            self.falhas += 1
+
+        retrato = _renderizar_retrato(self._imagem_fonte(nome_arquivo), cor, gravidade, tamanho)
+
+        with self._trava:
+            self._retratos[chave] = retrato
+            self._retratos.move_to_end(chave)
+            while len(self._retratos) > self.capacidade:
+                self._retratos.popitem(last=False)
+        return retrato
+
+    def _imagem_fonte(self, nome_arquivo):
+        """Decodifica a imagem de origem uma única vez; None se ela não puder ser carregada."""
+        with self._trava:
+            if nome_arquivo in self._imagens_fonte:
+                return self._imagens_fonte[nome_arquivo]
+
+        img = None
+        caminho_imagem = os.path.join(PASTA_IMAGENS, nome_arquivo)
+        if os.path.exists(caminho_imagem):
+            try:
+                # Import tardio: a simulação headless não deve carregar o matplotlib
+                from matplotlib.image import imread
+                img = imread(caminho_imagem)
+            except Exception as e:
+                print(f"⚠️ Erro ao carregar a imagem '{caminho_imagem}': {e}")
+
+        with self._trava:
+            self._imagens_fonte[nome_arquivo] = img
+        return img
+
+    def limpar(self):
+        with self._trava:
+            self._retratos.clear()
+            self._imagens_fonte.clear()
+
+CACHE_RETRATOS = CacheRetratos()
+
+def _renderizar_retrato(img, cor, gravidade, tamanho):
+    """Gera o retrato da vítima, com a foto de arquivo dentro de um círculo colorido."""
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Circle
+
+    fig = Figure(figsize=(tamanho / 80, tamanho / 80), dpi=80, facecolor='#1e3a5f')
+    ax = fig.add_subplot(111)
+    ax.set_facecolor('#1e3a5f')
+
+    # Isso servirá como a borda colorida ao redor da imagem.
+    circle = Circle((0.5, 0.5), 0.4, color=cor, fill=False, linewidth=4)
+    ax.add_patch(circle)
+
+    if img is not None:
+        im = ax.imshow(img, extent=(0.1, 0.9, 0.1, 0.9))
+        clip_circle = Circle((0.5, 0.5), 0.4, transform=ax.transData)
+        im.set_clip_path(clip_circle)
+    else:
+        # Se não foi possível carregar a imagem, exibe o texto padrão
+        ax.text(0.5, 0.5, "VÍTIMA", ha='center', va='center', fontsize=14, color='white', weight='bold')
+        ax.text(0.5, 0.2, gravidade.upper(), ha='center', va='center', fontsize=10, color='white')
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', pad_inches=0.1, dpi=80)
+    buf.seek(0)
+    return buf.getvalue()
+
+# --- CLASSES PRINCIPAIS ---
+
+# Códigos compactos da vítima: gravidade, estado, flags e número de identificação dividem
+# um único inteiro (bits 0-1: gravidade, 2-3: estado, 4: foto, 5: kit, 6+: número).
+_CODIGO_GRAVIDADE = {g: i for i, g in enumerate(GRAVIDADES)}
+_CODIGO_ESTADO = {e: i for i, e in enumerate(ESTADOS)}
+_MASCARA_GRAVIDADE = 0b11
+_DESLOC_ESTADO = 2
+_BIT_FOTO = 1 << 4
+_BIT_KIT = 1 << 5
+_DESLOC_NUMERO = 6
+
+class Vitima:
+    # Sem __dict__ por instância: cenários com milhões de vítimas cabem em memória
+    __slots__ = ('x', 'y', '_codigo', 'detectada_em')
+
+    def __init__(self, x, y, gravidade=None, estado=None, numero=None):
+        self.x = x
+        self.y = y
+        if numero is None:
+            numero = random.randint(1000, 9999)
+        self._codigo = numero << _DESLOC_NUMERO
+        self.gravidade = gravidade or random.choice(GRAVIDADES)
+        self.estado = estado or random.choice(ESTADOS)
+        self.detectada_em = None
+
+    @property
+    def id(self):
+        return f"V{self._codigo >> _DESLOC_NUMERO}"
+
+    @property
+    def gravidade(self):
+        return GRAVIDADES[self._codigo & _MASCARA_GRAVIDADE]
+
+    @gravidade.setter
+    def gravidade(self, valor):
+        if valor not in _CODIGO_GRAVIDADE:
+            raise ValueError(f"gravidade desconhecida: {valor!r}")
+        self._codigo = (self._codigo & ~_MASCARA_GRAVIDADE) | _CODIGO_GRAVIDADE[valor]
+
+    @property
+    def estado(self):
+        return ESTADOS[(self._codigo >> _DESLOC_ESTADO) & 0b11]
+
+    @estado.setter
+    def estado(self, valor):
+        if valor not in _CODIGO_ESTADO:
+            raise ValueError(f"estado desconhecido: {valor!r}")
+        self._codigo = (self._codigo & ~(0b11 << _DESLOC_ESTADO)) | (_CODIGO_ESTADO[valor] << _DESLOC_ESTADO)
+
+    @property
+    def foto_tirada(self):
+        return bool(self._codigo & _BIT_FOTO)
+
+    @foto_tirada.setter
+    def foto_tirada(self, valor):
+        self._codigo = self._codigo | _BIT_FOTO if valor else self._codigo & ~_BIT_FOTO
+
+    @property
+    def kit_aplicado(self):
+        return bool(self._codigo & _BIT_KIT)
+
+    @kit_aplicado.setter
+    def kit_aplicado(self, valor):
+        self._codigo = self._codigo | _BIT_KIT if valor else self._codigo & ~_BIT_KIT
+
+    @property
+    def foto_data(self):
+        """Bytes PNG do retrato da vítima. A vítima não guarda a imagem: os bytes vêm do
+        cache compartilhado, renderizados só na primeira exibição."""
+        return self._gerar_imagem_vitima()
+
+    @property
+    def versao_retrato(self):
+        """Identifica a aparência atual do retrato; muda sempre que a gravidade muda."""
+        return self._codigo & _MASCARA_GRAVIDADE
+
+    def _get_nome_arquivo_imagem(self):
+        """Centraliza a lógica para encontrar o nome do arquivo de imagem com base no estado da vítima."""
+        nome_arquivo = MAP_CENARIOS.get('_default_')
+        chave_grav = self.gravidade.lower()
+        chave_est = self.estado.lower().replace('-', '').replace(' ', '')
+        if chave_grav in MAP_CENARIOS:
+            nome_arquivo = MAP_CENARIOS[chave_grav]
+        elif chave_est in MAP_CENARIOS:
+            nome_arquivo = MAP_CENARIOS[chave_est]
+        return nome_arquivo
+
+    def _gerar_imagem_vitima(self, tamanho=TAMANHO_RETRATO):
+        """Obtém o retrato da vítima no cache, renderizando-o caso ainda não exista."""
+        return CACHE_RETRATOS.obter(self._get_nome_arquivo_imagem(), self.gravidade, tamanho)
+
+    def detectar(self):
+        if not self.detectada_em:
+            self.detectada_em = datetime.datetime.now()
+            return True
+        return False
+
+    def tirar_foto(self):
+        if not self.foto_tirada:
+            self.foto_tirada = True
+            return True
+        return False
+
+    def aplicar_kit(self):
+        if not self.kit_aplicado:
+            melhorias = {"Crítico": "Grave", "Grave": "Moderado", "Moderado": "Leve", "Leve": "Leve"}
+            self.gravidade = melhorias.get(self.gravidade, self.gravidade)
+            self.kit_aplicado = True
+            return True
+        return False
+
+    def necessita_kit(self):
+        return self.gravidade in ["Crítico", "Grave", "Moderado"] and not self.kit_aplicado
+
+class Cenario:
+    def __init__(self, comprimento=200, objetos=None):
+        self.comprimento = comprimento
+        if objetos is None:
+            objetos = [
+                Vitima(x=30, y=5, gravidade="Leve", estado="Consciente"),
+                Vitima(x=80, y=3, gravidade="Moderado", estado="Semi-consciente"),
+                Vitima(x=120, y=7, gravidade="Grave", estado="Inconsciente"),
+                Vitima(x=180, y=4, gravidade="Crítico", estado="Inconsciente")
+            ]
+        self.objetos = list(objetos)
+        # Incrementada a cada mudança no conjunto de vítimas (usada pelo mapa da GUI)
+        self.versao = 0
+        self.reindexar()
+
+    @classmethod
+    def aleatorio(cls, semente, comprimento=200, densidade=2.0):
+        """Cria um cenário reprodutível com `densidade` vítimas a cada 100 m de túnel."""
+        rng = random.Random(semente)
+        objetos = []
+        for _ in range(int(comprimento * densidade / 100)):
+            objetos.append(Vitima(
+                x=round(rng.uniform(0, comprimento), 1),
+                y=round(rng.uniform(1, 9), 1),
+                gravidade=rng.choice(GRAVIDADES),
+                estado=rng.choice(ESTADOS),
+            ))
+        return cls(comprimento=comprimento, objetos=objetos)
+
+    def reindexar(self):
+        """Reconstrói o índice espacial (vítimas ordenadas pela coordenada x)."""
+        self._indice = sorted(self.objetos, key=lambda v: v.x)
+        self._indice_x = [v.x for v in self._indice]
+        self.versao += 1
+
+    def adicionar_vitima(self, vitima):
+        self.objetos.append(vitima)
+        pos = bisect.bisect_right(self._indice_x, vitima.x)
+        self._indice_x.insert(pos, vitima.x)
+        self._indice.insert(pos, vitima)
+        self.versao += 1
+
+    def vitimas_no_raio(self, x, raio):
+        """Retorna as vítimas com |vitima.x - x| < raio, em ordem crescente de x."""
+        # A janela do bisect é inclusiva; o filtro final usa a mesma conta da distância
+        inicio = bisect.bisect_left(self._indice_x, x - raio)
+        fim = bisect.bisect_right(self._indice_x, x + raio)
+        return [v for v in self._indice[inicio:fim] if abs(v.x - x) < raio]
+
+    def atualizar(self, trechos):
+        """Chamado a cada tick com o trecho que falta a cada robô ativo, como triplas
+        (início, posição, fim do segmento). O início é o ponto mais atrasado a que o robô
+        ainda pode voltar (com o navegador, a vítima-alvo mais atrasada). O cenário fixo não
+        muda."""
+        pass
+
+    def total_kits_necessarios(self):
+        return sum(1 for v in self.objetos if v.gravidade in ["Crítico", "Grave", "Moderado"])
+
+# Estados de um segmento de CenarioProcedural
+NOVO, VIVO, DESCARTADO = 0, 1, 2
+
+class CenarioProcedural(Cenario):
+    """Túnel gerado proceduralmente, em segmentos de comprimento fixo.
+
+    Cada robô tem uma janela viva, de RAIO_DETECCAO atrás dele até `segmentos_a_frente`
+    segmentos adiante: atualizar() gera os segmentos que entram numa janela e descarta os
+    que já não estão no trecho que falta a nenhum robô. Numa frota ficam em memória só as
+    janelas dos robôs (e os poucos segmentos gerados pela janela de um robô que o próximo
+    ainda vai percorrer), então o consumo de memória não depende do comprimento do túnel.
+    Um segmento descartado nunca é gerado de novo. Cada segmento usa um gerador próprio
+    derivado de (semente, índice do segmento), e a mesma semente sempre reproduz o mesmo
+    túnel, em qualquer ordem de geração.
+    """
+
+    def __init__(self, semente, comprimento=1000, densidade=2.0, mistura=None,
+                 comprimento_segmento=50, segmentos_a_frente=2):
+        self.semente = semente
+        self.densidade = densidade
+        # Pesos relativos de cada gravidade, na ordem de GRAVIDADES
+        self.mistura = list(mistura) if mistura is not None else [1] * len(GRAVIDADES)
+        self.comprimento_segmento = comprimento_segmento
+        self.segmentos_a_frente = segmentos_a_frente
+        self.segmentos_gerados = 0
+        self.vitimas_geradas = 0
+        self._vivos = {}  # índice do segmento -> as suas vítimas, em ordem de x
+        # Um byte por segmento do túnel: NOVO, VIVO ou DESCARTADO
+        self._estados = bytearray(max(1, math.ceil(comprimento / comprimento_segmento)))
+        self._kits_necessarios_descartados = 0
+        self._ultimas_faixas = None
+
+        esperadas = densidade * comprimento_segmento / 100
+        # Os números de identificação de cada segmento ficam numa faixa própria
+        self._faixa_numeros = int(esperadas) + 1
+
+        super().__init__(comprimento=comprimento, objetos=[])
+        self.atualizar([(0, 0, comprimento)])
+
+    def _gerar_segmento(self, k):
+        rng = random.Random(f"{self.semente}/{k}")
+        inicio = k * self.comprimento_segmento
+        fim = min(inicio + self.comprimento_segmento, self.comprimento)
+        esperadas = self.densidade * (fim - inicio) / 100
+        quantidade = int(esperadas) + (1 if rng.random() < esperadas - int(esperadas) else 0)
+
+        xs = sorted(round(rng.uniform(inicio, fim), 1) for _ in range(quantidade))
+        return [Vitima(x=x, y=round(rng.uniform(1, 9), 1),
+                       gravidade=rng.choices(GRAVIDADES, weights=self.mistura)[0],
+                       estado=rng.choice(ESTADOS),
+                       numero=1000 + k * self._faixa_numeros + j)
+                for j, x in enumerate(xs)]
+
+    def _segmentos_entre(self, inicio, fim):
+        """Índices dos segmentos com alguma parte em [inicio, fim)."""
+        n = self.comprimento_segmento
+        return range(max(0, math.ceil(inicio / n) - 1), min(math.ceil(fim / n), len(self._estados)))
+
+    def atualizar(self, trechos):
+        frente = self.segmentos_a_frente * self.comprimento_segmento
+        restantes, janelas = [], []
+        for inicio, posicao, fim in trechos:
+            fim = self.comprimento if fim is None else min(fim, self.comprimento)
+            restantes.append(self._segmentos_entre(inicio - RAIO_DETECCAO, fim + RAIO_DETECCAO))
+            janelas.append(self._segmentos_entre(posicao - RAIO_DETECCAO,
+                                                 min(posicao + frente, fim + RAIO_DETECCAO, self.comprimento)))
+        # As faixas de segmentos só mudam quando um robô cruza uma borda de segmento
+        chave = (restantes, janelas)
+        if chave == self._ultimas_faixas:
+            return
+        self._ultimas_faixas = chave
+
+        mudou = False
+        for janela in janelas:
+            for k in janela:
+                if self._estados[k] == NOVO:
+                    vitimas = self._vivos[k] = self._gerar_segmento(k)
+                    self._estados[k] = VIVO
+                    self.segmentos_gerados += 1
+                    self.vitimas_geradas += len(vitimas)
+                    mudou = True
+
+        # Descarta os segmentos fora do trecho que falta a todos os robôs
+        for k in [k for k in self._vivos if not any(k in r for r in restantes)]:
+            self._kits_necessarios_descartados += sum(
+                1 for v in self._vivos.pop(k) if v.gravidade in ["Crítico", "Grave", "Moderado"])
+            self._estados[k] = DESCARTADO
+            mudou = True
+
+        if mudou:
+            # Os segmentos cobrem faixas de x consecutivas, então concatená-los na ordem dos
+            # índices já mantém as vítimas ordenadas por x
+            self.objetos[:] = [v for k in sorted(self._vivos) for v in self._vivos[k]]
+            self._indice = list(self.objetos)
+            self._indice_x = [v.x for v in self._indice]
+            self.versao += 1
+
+    def total_kits_necessarios(self):
+        """Kits necessários em todo o túnel gerado até agora."""
+        return self._kits_necessarios_descartados + super().total_kits_necessarios()
+
+class RegistroFotos:
+    """Memória de fotos do robô, guardada em colunas tipadas (poucos bytes por foto).
+
+    Iterar ou indexar devolve dicionários no formato antigo de memoria_fotos
+    (vitima_id, posicao, timestamp, gravidade, estado).
+    """
+
+    def __init__(self):
+        self._numeros = array('q')
+        self._posicoes = array('d')
+        self._timestamps = array('d')
+        self._gravidades = array('B')
+        self._estados = array('B')
+
+    def registrar(self, vitima, posicao):
+        self._numeros.append(vitima._codigo >> _DESLOC_NUMERO)
+        self._posicoes.append(posicao)
+        self._timestamps.append(time.time())
+        self._gravidades.append(_CODIGO_GRAVIDADE[vitima.gravidade])
+        self._estados.append(_CODIGO_ESTADO[vitima.estado])
+
+    def __len__(self):
+        return len(self._numeros)
+
+    def __getitem__(self, i):
+        return {
+            'vitima_id': f"V{self._numeros[i]}",
+            'posicao': self._posicoes[i],
+            'timestamp': datetime.datetime.fromtimestamp(self._timestamps[i]),
+            'gravidade': GRAVIDADES[self._gravidades[i]],
+            'estado': ESTADOS[self._estados[i]],
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+def dividir_tunel(comprimento, n):
+    """Divide o túnel em `n` segmentos contíguos de mesmo comprimento: [(inicio, fim), ...]."""
+    passo = comprimento / n
+    return [(i * passo, comprimento if i == n - 1 else (i + 1) * passo) for i in range(n)]
+
+class Robo:
+    def __init__(self, central_controle=None, kits_primeiros_socorros=3, velocidade=2.0, nome="R1"):
+        self.central_controle = central_controle
+        self.nome = nome
+        # Posição na frota e trecho do túnel atribuído (ver CentralDeControle.definir_frota)
+        self.indice = 0
+        self.inicio_segmento = 0
+        self.fim_segmento = None
+        self.memoria_fotos = RegistroFotos()
+        self.kits_iniciais = kits_primeiros_socorros
+        self.kits_primeiros_socorros = kits_primeiros_socorros
+        self.posicao_atual = 0
+        self.pos_y = LARGURA_TUNEL / 2
+        self.bateria = 100.0
+        self.temperatura = 25.0
+        self.velocidade = velocidade
+        self.status = "Pronto"
+
+    def atribuir_segmento(self, inicio, fim):
+        self.inicio_segmento = inicio
+        self.fim_segmento = fim
+        self.posicao_atual = inicio
+
+    @property
+    def distancia_percorrida(self):
+        return self.posicao_atual - self.inicio_segmento
+
+    def mover(self, distancia):
+        self.posicao_atual += distancia
+        self.bateria = max(0, self.bateria - (distancia * 0.1))
+
+    def deslocar(self, dx, dy):
+        """Move o robô também na largura do túnel (ver navegacao.py); gasta bateria pela
+        distância real percorrida."""
+        self.posicao_atual += dx
+        self.pos_y += dy
+        self.bateria = max(0, self.bateria - (math.hypot(dx, dy) * 0.1))
+        
+    def tirar_foto(self, vitima):
+        if vitima.tirar_foto():
+            self.memoria_fotos.registrar(vitima, self.posicao_atual)
+            return True
+        return False
+
+    def aplicar_kit(self, vitima):
+        if self.kits_primeiros_socorros > 0 and vitima.aplicar_kit():
+            self.kits_primeiros_socorros -= 1
+            return True
+        return False
+
+class CentralDeControle:
+    """Coordena a missão de um ou mais robôs (frota) num mesmo túnel.
+
+    Cada robô percorre o seu segmento do túnel, mas todos compartilham um único registro
+    de vítimas detectadas, então cada vítima é detectada uma única vez. `robo` é o líder da
+    frota (o primeiro robô), exibido no painel de status e gravado na telemetria.
+    """
+
+    def __init__(self):
+        self.robo = None
+        self.robos = []
+        self.cenario = None
+        self.vitimas_detectadas = []
+        self._conjunto_detectadas = set()
+        self.gui = None
+        self.simulacao_ativa = False
+        self.vitima_selecionada = None
+        self.missao_concluida = False
+        # Opcional: GravadorTelemetria que recebe todos os pacotes da missão
+        self.gravador = None
+        # Opcional: HistoricoMissoes (SQLite) que guarda a missão junto com as anteriores
+        self.historico = None
+        # Opcional: PerfilTick que mede a duração de cada fase dos ticks
+        self.perfil = None
+        # AgendadorMissao da última missão em tempo real (ritmo e prazos perdidos)
+        self.agendador = None
+        # Opcional: PlanejadorTriagem que decide quais vítimas recebem os kits; sem ele,
+        # cada robô aplica os kits na ordem em que passa pelas vítimas
+        self.triagem = None
+        # Planejador de rotas até as vítimas (ver navegacao.py); sem ele o robô só avança em x
+        self.navegacao = None
+        # Modelo que fornece as leituras dos sensores (ver sensores.py)
+        self.sensores = ModeloSensoresAleatorio()
+
+    def selecionar_vitima(self, vitima):
+        self.vitima_selecionada = vitima
+        if self.gui:
+            self.gui.executar_na_interface(self.gui.mostrar_detalhes_vitima, vitima)
+
+    def selecionar_proxima_vitima(self):
+        """Seleciona a próxima vítima na lista de detectadas."""
+        if not self.vitimas_detectadas or len(self.vitimas_detectadas) < 2:
+            return
+
+        try:
+            idx_atual = self.vitimas_detectadas.index(self.vitima_selecionada)
+            proximo_idx = (idx_atual + 1) % len(self.vitimas_detectadas)
+        except (ValueError, AttributeError):
+            # Caso nenhuma esteja selecionada ou a selecionada não esteja na lista
+            proximo_idx = 0
+        
+        self.selecionar_vitima(self.vitimas_detectadas[proximo_idx])
+
+    def gerar_relatorio_final(self):
+        """Gera um relatório textual com o resumo da missão."""
+        if not self.missao_concluida:
+            return "A missão ainda não foi concluída."
+
+        relatorio = io.StringIO()
+        EscritorRelatorio(self).escrever(txt=relatorio)
+        return relatorio.getvalue()
+
+    def resumo_missao(self):
+        """Resultados numéricos da missão, no mesmo formato do SimuladorLote."""
+        return {
+            'posicao': max(r.posicao_atual for r in self.robos),
+            'bateria': self.bateria_media(),
+            'kits_restantes': self.kits_restantes(),
+            'kits_utilizados': self.kits_utilizados(),
+            'kits_necessarios': self.cenario.total_kits_necessarios(),
+            'vitimas_detectadas': len(self.vitimas_detectadas),
+            'fotos': self.total_fotos(),
+        }
+
+    # --- TOTAIS DA FROTA ---
+    def bateria_media(self):
+        return sum(r.bateria for r in self.robos) / len(self.robos)
+
+    def kits_restantes(self):
+        return sum(r.kits_primeiros_socorros for r in self.robos)
+
+    def kits_utilizados(self):
+        return sum(r.kits_iniciais - r.kits_primeiros_socorros for r in self.robos)
+
+    def total_fotos(self):
+        return sum(len(r.memoria_fotos) for r in self.robos)
+
+    def distancia_percorrida(self):
+        return sum(r.distancia_percorrida for r in self.robos)
+
+    def tunel_concluido(self):
+        return all(r.posicao_atual >= r.fim_segmento for r in self.robos)
+
+    def definir_frota(self, robos, cenario):
+        """Associa os robôs e o cenário à central, com um segmento do túnel para cada robô."""
+        self.robos = list(robos)
+        self.robo = self.robos[0]
+        self.cenario = cenario
+        for i, (robo, (inicio, fim)) in enumerate(zip(self.robos, dividir_tunel(cenario.comprimento, len(self.robos)))):
+            robo.indice = i
+            robo.atribuir_segmento(inicio, fim)
+        if self.triagem is not None:
+            self.triagem.preparar(self.robos, cenario)
+        if self.navegacao is not None:
+            self.navegacao.preparar(self.robos, cenario)
+
+    def iniciar_missao(self, robo, cenario, intervalo=0.5):
+        self.iniciar_frota([robo], cenario, intervalo)
+
+    def iniciar_frota(self, robos, cenario, intervalo=0.5):
+        """Inicia a missão em tempo real numa thread própria, que roda o laço asyncio do
+        AgendadorMissao (a thread principal fica livre para a interface)."""
+        print("🚀 INICIANDO MISSÃO...")
+        self.definir_frota(robos, cenario)
+        self.simulacao_ativa = True
+        if self.historico is not None:
+            self.historico.iniciar_missao(self)
+        
+        threading.Thread(target=self._executar_missao_completa, args=(intervalo,), daemon=True).start()
+
+    def executar_missao(self, robo, cenario, max_ticks=None, tempo_real=False, intervalo=0.5):
+        """Executa a missão de forma síncrona, sem interface, o mais rápido possível.
+
+        Retorna o MotorSimulacao usado, que informa o número de ticks executados.
+        """
+        return self.executar_frota([robo], cenario, max_ticks, tempo_real, intervalo)
+
+    def executar_frota(self, robos, cenario, max_ticks=None, tempo_real=False, intervalo=0.5):
+        """Como executar_missao(), com vários robôs avançados pelo mesmo motor."""
+        self.definir_frota(robos, cenario)
+        self.simulacao_ativa = True
+        if self.historico is not None:
+            self.historico.iniciar_missao(self)
+        motor = MotorSimulacao(self, intervalo=intervalo, tempo_real=tempo_real)
+        motor.executar(max_ticks)
+        return motor
+
+    def _executar_missao_completa(self, intervalo=0.5):
+        MotorSimulacao(self, intervalo=intervalo, tempo_real=True).executar()
+
+    def _finalizar_missao(self):
+        self.missao_concluida = True
+        if self.gravador:
+            self.gravador.fechar()
+        if self.historico is not None:
+            self.historico.finalizar_missao(self)
+        if self.gui:
+            status_final = "Concluída" if self.tunel_concluido() else "Interrompida"
+            if len(self.robos) == 1:
+                resumo = f"Posição final: {self.robo.posicao_atual:.1f}m"
+            else:
+                resumo = f"{len(self.robos)} robôs percorreram {self.distancia_percorrida():.1f}m"
+            self.gui.adicionar_mensagem_console("Missão", f"Missão {status_final}! {resumo}", "SUCESSO")
+            if self.agendador is not None:
+                tipo = "ALERTA" if self.agendador.prazos_perdidos else "INFO"
+                self.gui.adicionar_mensagem_console("Agendador", self.agendador.descricao(), tipo)
+            self.gui.executar_na_interface(self.gui.definir_status, f"Missão {status_final}")
+            self.gui.executar_na_interface(self.gui.habilitar_botao_relatorio)
+
+    def _verificar_deteccao_vitimas(self, robo=None, tempo=None):
+        """Processa todas as vítimas dentro do raio de detecção do robô (o líder, se omitido).
+
+        `tempo` é o tempo de missão do tick, registrado no histórico junto com as detecções
+        e as fotos.
+        """
+        if robo is None:
+            robo = self.robo
+        encontrou = False
+        for vitima in self.cenario.vitimas_no_raio(robo.posicao_atual, RAIO_DETECCAO):
+            if self.navegacao is None:
+                distancia = abs(vitima.x - robo.posicao_atual)
+            else:
+                distancia = self.navegacao.distancia(robo, vitima)
+            encontrou = True
+            
+            if vitima not in self._conjunto_detectadas:
+                if vitima.detectar():
+                    self.vitimas_detectadas.append(vitima)
+                    self._conjunto_detectadas.add(vitima)
+                    if self.triagem is not None:
+                        self.triagem.registrar(vitima)
+                    if self.navegacao is not None:
+                        self.navegacao.registrar(robo, vitima)
+                    if self.historico is not None:
+                        self.historico.registrar_deteccao(robo, vitima, tempo)
+                    
+                    if self.gui:
+                        self.gui.adicionar_mensagem_console("Detecção", f"Vítima {vitima.id} detectada!", "ALERTA")
+                        self.gui.adicionar_alerta("ALERTA", f"Vítima {vitima.id} - {vitima.gravidade}")
+            
+            if distancia < RAIO_FOTO and not vitima.foto_tirada:
+                if robo.tirar_foto(vitima):
+                    if self.historico is not None:
+                        self.historico.registrar_foto(robo, vitima, tempo)
+                    if self.gui:
+                        self.gui.adicionar_mensagem_console("Câmera", f"Foto da vítima {vitima.id}", "INFO")
+            
+            if distancia < RAIO_KIT and vitima.necessita_kit() and robo.kits_primeiros_socorros > 0:
+                if self.triagem is not None:
+                    aplicado = self.triagem.atender(robo, vitima)
+                else:
+                    aplicado = robo.aplicar_kit(vitima)
+                if aplicado and self.gui:
+                    self.gui.adicionar_mensagem_console("Socorro", f"Kit aplicado em {vitima.id}!", "SUCESSO")
+                    self.gui.adicionar_alerta("SUCESSO", f"Kit aplicado em {vitima.id}")
+            
+            if self.gui and not self.vitima_selecionada:
+                self.selecionar_vitima(vitima)
+        return encontrou
+
+    def _determinar_status(self, robo=None):
+        if robo is None:
+            robo = self.robo
+        if self.missao_concluida:
+            return "Missão Concluída"
+        elif robo.bateria < 10:
+            return "Bateria Crítica"
+        elif robo.bateria < 30:
+            return "Bateria Baixa"
+        elif len(self.vitimas_detectadas) > 0:
+            return "Resgatando Vítimas"
+        else:
+            return "Explorando"
+
+class MotorSimulacao:
+    """Núcleo da missão em passos discretos (ticks), independente da interface gráfica.
+
+    Cada chamada a passo() avança todos os robôs ativos da frota, lê os sensores, verifica
+    as vítimas e monta um pacote de telemetria por robô; uma única thread conduz a frota
+    inteira. Com tempo_real=False os ticks rodam o mais rápido possível; com
+    tempo_real=True um AgendadorMissao (asyncio) dispara um tick a cada `intervalo`
+    segundos, com prazos fixos, como na GUI.
+    Se central.perfil (um PerfilTick) estiver definido, a duração de cada fase é medida;
+    sem ele, o único custo extra é um teste por tick.
+    """
+
+    def __init__(self, central, intervalo=0.5, tempo_real=False):
+        self.central = central
+        self.intervalo = intervalo
+        self.tempo_real = tempo_real
+        self.ticks = 0
+        self.agendador = None
+        # Preenchidos pelo AgendadorMissao: última leitura de sensores de cada robô e destino
+        # dos pacotes (uma fila); sem agendador os sensores são lidos e os pacotes entregues
+        # dentro do próprio tick.
+        self.leituras_sensores = {}
+        self.saida = None
+
+    @staticmethod
+    def _robo_ativo(robo):
+        return robo.posicao_atual < robo.fim_segmento and robo.bateria > 5
+
+    def missao_ativa(self):
+        return self.central.simulacao_ativa and any(map(self._robo_ativo, self.central.robos))
+
+    def passo(self):
+        """Executa um tick da missão e retorna os pacotes de telemetria gerados (um por robô ativo)."""
+        perfil = self.central.perfil
+        if perfil is not None and perfil.ativo:
+            return self._passo_medido(perfil)
+
+        ativos = [r for r in self.central.robos if self._robo_ativo(r)]
+        self._mover(ativos)
+        self.ticks += 1
+        tempo = self.ticks * self.intervalo
+        pacotes = []
+        for robo in ativos:
+            sensores = self.leituras_sensores.get(robo.indice) or self._ler_sensores(robo)
+            self.central._verificar_deteccao_vitimas(robo, tempo)
+            pacote_dados = self._montar_pacote(robo, sensores)
+            self._despachar(robo, pacote_dados)
+            pacotes.append(pacote_dados)
+        return pacotes
+
+    def _passo_medido(self, perfil):
+        """Mesmo tick de passo(), registrando no PerfilTick a duração de cada fase (somada
+        entre os robôs da frota)."""
+        relogio = time.perf_counter
+        inicio = relogio()
+        ativos = [r for r in self.central.robos if self._robo_ativo(r)]
+        self._mover(ativos)
+        self.ticks += 1
+        tempo = self.ticks * self.intervalo
+        movimento = relogio() - inicio
+        sensores_t = deteccao_t = pacote_t = despacho_t = 0.0
+        pacotes = []
+        for robo in ativos:
+            t0 = relogio()
+            sensores = self.leituras_sensores.get(robo.indice) or self._ler_sensores(robo)
+            t1 = relogio()
+            self.central._verificar_deteccao_vitimas(robo, tempo)
+            t2 = relogio()
+            pacote_dados = self._montar_pacote(robo, sensores)
+            t3 = relogio()
+            self._despachar(robo, pacote_dados)
+            t4 = relogio()
+            sensores_t += t1 - t0
+            deteccao_t += t2 - t1
+            pacote_t += t3 - t2
+            despacho_t += t4 - t3
+            pacotes.append(pacote_dados)
+        perfil.registrar_tick(inicio, relogio(), (movimento, sensores_t, deteccao_t, pacote_t, despacho_t))
+        return pacotes
+
+    # --- FASES DO TICK ---
+    def _mover(self, ativos):
+        navegacao = self.central.navegacao
+        for robo in ativos:
+            if navegacao is None:
+                robo.mover(robo.velocidade)
+            else:
+                navegacao.mover(robo, robo.velocidade)
+        if ativos:
+            recuo = navegacao.recuo if navegacao is not None else (lambda robo: robo.posicao_atual)
+            self.central.cenario.atualizar([(recuo(robo), robo.posicao_atual, robo.fim_segmento)
+                                            for robo in ativos])
+
+    def _ler_sensores(self, robo):
+        return self.central.sensores.ler(robo)
+
+    def _montar_pacote(self, robo, sensores):
+        return {
+            'tempo': self.ticks * self.intervalo,
+            'robo': robo.indice,
+            'pos_x': robo.posicao_atual,
+            'pos_y': robo.pos_y,
+            'bateria': robo.bateria,
+            'status_robo': self.central._determinar_status(robo),
+            'sensores': sensores,
+        }
+
+    def _despachar(self, robo, pacote_dados):
+        if self.saida is not None:
+            self.saida(pacote_dados)
+        else:
+            self.despachar_pacote(pacote_dados)
+
+    def despachar_pacote(self, pacote_dados):
+        """Entrega o pacote ao gravador de telemetria e à interface."""
+        central = self.central
+        # O formato de telemetria guarda um único robô: o líder da frota
+        if central.gravador and pacote_dados['robo'] == central.robo.indice:
+            central.gravador.registrar(pacote_dados)
+        if central.historico is not None:
+            central.historico.registrar_pacote(pacote_dados)
+        if central.gui:
+            central.gui.atualizar_interface_simulacao(pacote_dados)
+
+    def executar(self, max_ticks=None):
+        """Roda ticks até o fim da missão (ou até max_ticks) e finaliza a missão."""
+        if self.central.gui:
+            self.central.gui.adicionar_mensagem_console("Missão", "Iniciando varredura do túnel...", "INFO")
+
+        if self.tempo_real:
+            # asyncio só é carregado por missões em tempo real (~40 ms a menos na inicialização)
+            import asyncio
+            from agendador import AgendadorMissao
+            self.agendador = self.central.agendador = AgendadorMissao(self)
+            asyncio.run(self.agendador.executar(max_ticks))
+        else:
+            while self.missao_ativa() and (max_ticks is None or self.ticks < max_ticks):
+                self.passo()
+
+        self.central._finalizar_missao()
+        return self.ticks
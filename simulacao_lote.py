@@ -0,0 +1,124 @@
+import numpy as np
+
+from simulacao import (
+    GRAVIDADES, RAIO_DETECCAO, RAIO_FOTO, RAIO_KIT, Cenario, CentralDeControle, Robo,
+)
+
+# Códigos inteiros das gravidades (índices em GRAVIDADES) e o efeito de um kit em cada uma,
+# equivalente ao dicionário de melhorias de Vitima.aplicar_kit.
+CODIGO_GRAVIDADE = {g: i for i, g in enumerate(GRAVIDADES)}
+MELHORIA_KIT = np.array([0, 0, 1, 2], dtype=np.int8)  # Leve->Leve, Moderado->Leve, Grave->Moderado, Crítico->Grave
+GRAVIDADE_MINIMA_KIT = CODIGO_GRAVIDADE["Moderado"]
+
+
+class SimuladorLote:
+    """Simula N missões independentes de uma só vez, com colunas NumPy (struct-of-arrays).
+
+    Cada missão tem um robô (posição, bateria, kits, velocidade) e um cenário, guardado em
+    matrizes N x M com x, y e gravidade das vítimas (M é o maior número de vítimas de um
+    cenário; as posições que sobram ficam marcadas como inválidas). Cada tick aplica a todas
+    as missões ativas as mesmas regras de Robo.mover, do raio de detecção e de aplicar_kit
+    usadas pela CentralDeControle, de modo que os resultados por missão são idênticos aos da
+    simulação escalar para os mesmos cenários.
+    """
+
+    def __init__(self, cenarios, kits_primeiros_socorros=3, velocidade=2.0):
+        n = len(cenarios)
+        m = max((len(c.objetos) for c in cenarios), default=0)
+
+        self.comprimento = np.array([c.comprimento for c in cenarios], dtype=np.float64)
+        self.posicao = np.zeros(n, dtype=np.float64)
+        self.bateria = np.full(n, 100.0, dtype=np.float64)
+        self.velocidade = np.broadcast_to(np.asarray(velocidade, dtype=np.float64), (n,)).copy()
+        self.kits_iniciais = np.broadcast_to(np.asarray(kits_primeiros_socorros, dtype=np.int64), (n,)).copy()
+        self.kits = self.kits_iniciais.copy()
+        self.ticks = np.zeros(n, dtype=np.int64)
+
+        self.vitima_x = np.full((n, m), np.inf, dtype=np.float64)
+        self.vitima_y = np.zeros((n, m), dtype=np.float64)
+        self.gravidade = np.zeros((n, m), dtype=np.int8)
+        self.valida = np.zeros((n, m), dtype=bool)
+        for i, cenario in enumerate(cenarios):
+            # Mesma ordem do índice espacial do Cenario: por x, estável em relação a objetos
+            vitimas = sorted(cenario.objetos, key=lambda v: v.x)
+            k = len(vitimas)
+            self.vitima_x[i, :k] = [v.x for v in vitimas]
+            self.vitima_y[i, :k] = [v.y for v in vitimas]
+            self.gravidade[i, :k] = [CODIGO_GRAVIDADE[v.gravidade] for v in vitimas]
+            self.valida[i, :k] = True
+
+        self.detectada = np.zeros((n, m), dtype=bool)
+        self.foto = np.zeros((n, m), dtype=bool)
+        self.kit_aplicado = np.zeros((n, m), dtype=bool)
+
+    @classmethod
+    def de_sementes(cls, sementes, comprimento=200, densidade=2.0, **kwargs):
+        """Monta o lote a partir dos cenários de Cenario.aleatorio para cada semente."""
+        cenarios = [Cenario.aleatorio(s, comprimento=comprimento, densidade=densidade) for s in sementes]
+        return cls(cenarios, **kwargs)
+
+    def __len__(self):
+        return len(self.posicao)
+
+    def ativas(self):
+        return (self.posicao < self.comprimento) & (self.bateria > 5)
+
+    def passo(self):
+        """Avança um tick em todas as missões ativas. Retorna quantas estavam ativas."""
+        ativa = self.ativas()
+        if not ativa.any():
+            return 0
+
+        # Robo.mover
+        desloc = np.where(ativa, self.velocidade, 0.0)
+        self.posicao = np.where(ativa, self.posicao + desloc, self.posicao)
+        self.bateria = np.where(ativa, np.maximum(0, self.bateria - desloc * 0.1), self.bateria)
+        self.ticks += ativa
+
+        # _verificar_deteccao_vitimas
+        distancia = np.abs(self.vitima_x - self.posicao[:, None])
+        no_raio = (distancia < RAIO_DETECCAO) & self.valida & ativa[:, None]
+        self.detectada |= no_raio
+        self.foto |= no_raio & (distancia < RAIO_FOTO)
+
+        candidatas = (no_raio & (distancia < RAIO_KIT) & ~self.kit_aplicado &
+                      (self.gravidade >= GRAVIDADE_MINIMA_KIT))
+        if candidatas.any():
+            # Os kits vão para as vítimas na ordem crescente de x, enquanto houver kits
+            aplicar = candidatas & (np.cumsum(candidatas, axis=1) <= self.kits[:, None])
+            self.gravidade = np.where(aplicar, MELHORIA_KIT[self.gravidade], self.gravidade)
+            self.kit_aplicado |= aplicar
+            self.kits -= aplicar.sum(axis=1)
+
+        return int(ativa.sum())
+
+    def executar(self, max_ticks=None):
+        """Roda todas as missões até o fim (ou até max_ticks) e retorna o número de passos."""
+        passos = 0
+        while (max_ticks is None or passos < max_ticks) and self.passo():
+            passos += 1
+        return passos
+
+    def resultados(self):
+        """Resultados por missão, no mesmo formato de CentralDeControle.resumo_missao."""
+        kits_necessarios = ((self.gravidade >= GRAVIDADE_MINIMA_KIT) & self.valida).sum(axis=1)
+        colunas = {
+            'posicao': self.posicao,
+            'bateria': self.bateria,
+            'kits_restantes': self.kits,
+            'kits_utilizados': self.kits_iniciais - self.kits,
+            'kits_necessarios': kits_necessarios,
+            'vitimas_detectadas': self.detectada.sum(axis=1),
+            'fotos': self.foto.sum(axis=1),
+        }
+        return [{chave: valores[i].item() for chave, valores in colunas.items()}
+                for i in range(len(self))]
+
+
+def simular_escalar(semente, comprimento=200, densidade=2.0, kits_primeiros_socorros=3, velocidade=2.0):
+    """Executa a mesma missão de SimuladorLote.de_sementes com a CentralDeControle."""
+    central = CentralDeControle()
+    robo = Robo(central_controle=central, kits_primeiros_socorros=kits_primeiros_socorros,
+                velocidade=velocidade)
+    central.executar_missao(robo, Cenario.aleatorio(semente, comprimento=comprimento, densidade=densidade))
+    return central.resumo_missao()
@@ -0,0 +1,329 @@
+import bisect
+import mmap
+import struct
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+# --- FORMATO DO ARQUIVO DE TELEMETRIA (.rstl) ---
+# Cabeçalho de 32 bytes seguido de blocos de tamanho fixo. Cada bloco guarda até
+# `capacidade_bloco` amostras em colunas contíguas (todos os timestamps, depois todos os
+# pos_x, e assim por diante), precedidas pelo número de amostras válidas no bloco.
+# Como blocos e colunas têm tamanho fixo, a posição de qualquer amostra no arquivo é
+# calculada diretamente a partir do seu índice.
+MAGICO = b"RSTL"
+VERSAO_FORMATO = 1
+CABECALHO = struct.Struct("<4sHHI20x")
+CABECALHO_BLOCO = struct.Struct("<I4x")
+CAPACIDADE_BLOCO_PADRAO = 4096  # múltiplo de 8, para manter as colunas alinhadas
+
+COLUNAS = (
+    ("timestamp", "d"),
+    ("pos_x", "f"),
+    ("pos_y", "f"),
+    ("bateria", "f"),
+    ("status", "B"),
+    ("temp", "f"),
+    ("risco_estrutural", "B"),
+    ("gas", "f"),
+)
+BYTES_POR_AMOSTRA = sum(array(tipo).itemsize for _, tipo in COLUNAS)
+
+CODIGOS_STATUS = ("Explorando", "Resgatando Vítimas", "Bateria Baixa", "Bateria Crítica", "Missão Concluída")
+STATUS_DESCONHECIDO = 255
+_CODIGO_POR_STATUS = {status: i for i, status in enumerate(CODIGOS_STATUS)}
+
+
+def codificar_status(status):
+    return _CODIGO_POR_STATUS.get(status, STATUS_DESCONHECIDO)
+
+
+def decodificar_status(codigo):
+    return CODIGOS_STATUS[codigo] if codigo < len(CODIGOS_STATUS) else "Desconhecido"
+
+
+def tamanho_bloco(capacidade_bloco):
+    return CABECALHO_BLOCO.size + capacidade_bloco * BYTES_POR_AMOSTRA
+
+
+class GravadorTelemetria:
+    """Grava os pacotes de telemetria da missão num arquivo binário colunar.
+
+    As amostras são acumuladas em arrays tipados (uma por coluna, poucos bytes por amostra)
+    e só vão para o disco quando um bloco inteiro fica pronto, ou em fechar().
+
+    A thread da missão grava e a da interface pode fechar o arquivo (ao fechar a janela),
+    então registrar() e fechar() são serializados por uma trava. Depois de fechar(),
+    registrar() não faz nada.
+    """
+
+    def __init__(self, caminho, capacidade_bloco=CAPACIDADE_BLOCO_PADRAO):
+        if capacidade_bloco % 8:
+            raise ValueError("capacidade_bloco deve ser múltiplo de 8")
+        self.caminho = caminho
+        self.capacidade_bloco = capacidade_bloco
+        self.total = 0
+        self._colunas = [array(tipo) for _, tipo in COLUNAS]
+        self._trava = threading.Lock()
+        self._arquivo = open(caminho, "wb")
+        self._arquivo.write(CABECALHO.pack(MAGICO, VERSAO_FORMATO, len(COLUNAS), capacidade_bloco))
+
+    def registrar(self, pacote, timestamp=None):
+        """Acrescenta um pacote no formato de pacote_dados de MotorSimulacao.passo()."""
+        sensores = pacote['sensores']
+        valores = (
+            pacote.get('tempo', 0.0) if timestamp is None else timestamp,
+            pacote['pos_x'],
+            pacote['pos_y'],
+            pacote['bateria'],
+            codificar_status(pacote['status_robo']),
+            sensores['temp'],
+            sensores['risco_estrutural'],
+            sensores['gas'],
+        )
+        with self._trava:
+            if self._arquivo.closed:
+                return
+            for coluna, valor in zip(self._colunas, valores):
+                coluna.append(valor)
+            self.total += 1
+            if len(self._colunas[0]) == self.capacidade_bloco:
+                self._gravar_bloco()
+
+    def _gravar_bloco(self):
+        quantidade = len(self._colunas[0])
+        self._arquivo.write(CABECALHO_BLOCO.pack(quantidade))
+        for coluna in self._colunas:
+            # O último bloco é completado com zeros para manter o tamanho fixo
+            if quantidade < self.capacidade_bloco:
+                coluna.extend([0] * (self.capacidade_bloco - quantidade))
+            coluna.tofile(self._arquivo)
+            del coluna[:]
+
+    def fechar(self):
+        with self._trava:
+            if self._arquivo.closed:
+                return
+            if self._colunas[0]:
+                self._gravar_bloco()
+            self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class LeitorTelemetria:
+    """Lê um arquivo .rstl mapeado em memória (mmap), sem carregá-lo inteiro.
+
+    Só as páginas das amostras efetivamente consultadas são lidas do disco, então mesmo
+    gravações de várias horas abrem instantaneamente. Um índice com o primeiro timestamp de
+    cada bloco permite buscar por tempo em O(log n). A posição não é monotônica (com
+    --navegacao o robô pode recuar até uma vítima), então a busca por posição usa o máximo
+    acumulado de pos_x ao fim de cada bloco, calculado na primeira busca.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        try:
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._arquivo.close()
+            raise ValueError(f"arquivo de telemetria vazio: {caminho}")
+
+        magico, versao, n_colunas, capacidade = CABECALHO.unpack_from(self._mapa, 0)
+        if magico != MAGICO or versao != VERSAO_FORMATO or n_colunas != len(COLUNAS):
+            self.fechar()
+            raise ValueError(f"arquivo de telemetria inválido: {caminho}")
+
+        self.capacidade_bloco = capacidade
+        self._tamanho_bloco = tamanho_bloco(capacidade)
+        self.n_blocos = (len(self._mapa) - CABECALHO.size) // self._tamanho_bloco
+
+        # Deslocamento de cada coluna dentro do bloco
+        self._colunas = {}
+        deslocamento = CABECALHO_BLOCO.size
+        for nome, tipo in COLUNAS:
+            item = array(tipo).itemsize
+            self._colunas[nome] = (deslocamento, tipo, item)
+            deslocamento += capacidade * item
+
+        # Todos os blocos estão cheios, exceto possivelmente o último
+        self._total = 0
+        if self.n_blocos:
+            ultimo, = CABECALHO_BLOCO.unpack_from(self._mapa, self._inicio_bloco(self.n_blocos - 1))
+            self._total = (self.n_blocos - 1) * capacidade + ultimo
+        self._indices = {}
+        self._maximos_posicao = None
+
+    def __len__(self):
+        return self._total
+
+    def _inicio_bloco(self, bloco):
+        return CABECALHO.size + bloco * self._tamanho_bloco
+
+    def valor(self, coluna, i):
+        if not 0 <= i < self._total:
+            raise IndexError(i)
+        bloco, j = divmod(i, self.capacidade_bloco)
+        deslocamento, tipo, item = self._colunas[coluna]
+        return struct.unpack_from("<" + tipo, self._mapa, self._inicio_bloco(bloco) + deslocamento + j * item)[0]
+
+    def amostra(self, i):
+        """Reconstrói o pacote (no formato de pacote_dados) da amostra i."""
+        v = {nome: self.valor(nome, i) for nome, _ in COLUNAS}
+        return {
+            'tempo': v['timestamp'],
+            'pos_x': v['pos_x'],
+            'pos_y': v['pos_y'],
+            'bateria': v['bateria'],
+            'status_robo': decodificar_status(v['status']),
+            'sensores': {
+                'temp': round(v['temp'], 1),
+                'risco_estrutural': v['risco_estrutural'],
+                'gas': round(v['gas'], 2),
+            },
+        }
+
+    def _indice_blocos(self, coluna):
+        # Primeiro valor de cada bloco: uma leitura por bloco, feita só na primeira busca
+        if coluna not in self._indices:
+            self._indices[coluna] = [self.valor(coluna, b * self.capacidade_bloco) for b in range(self.n_blocos)]
+        return self._indices[coluna]
+
+    @contextmanager
+    def _valores_bloco(self, coluna, bloco):
+        # Vista sem cópia da coluna no bloco, liberada na saída para que o mmap possa ser fechado
+        quantidade = min(self.capacidade_bloco, self._total - bloco * self.capacidade_bloco)
+        deslocamento, tipo, item = self._colunas[coluna]
+        inicio = self._inicio_bloco(bloco) + deslocamento
+        with memoryview(self._mapa)[inicio:inicio + quantidade * item] as bruto, bruto.cast(tipo) as valores:
+            yield valores
+
+    def _indice_maximos_posicao(self):
+        # Máximo acumulado de pos_x ao fim de cada bloco (não decrescente, permite bisect)
+        if self._maximos_posicao is None:
+            maximos, acumulado = [], float("-inf")
+            for b in range(self.n_blocos):
+                with self._valores_bloco("pos_x", b) as valores:
+                    acumulado = max(acumulado, max(valores))
+                maximos.append(acumulado)
+            self._maximos_posicao = maximos
+        return self._maximos_posicao
+
+    def _buscar(self, coluna, alvo):
+        """Índice da última amostra com coluna <= alvo (a coluna deve ser não decrescente)."""
+        if not self._total:
+            return -1
+        bloco = bisect.bisect_right(self._indice_blocos(coluna), alvo) - 1
+        if bloco < 0:
+            return -1
+        with self._valores_bloco(coluna, bloco) as valores:
+            j = bisect.bisect_right(valores, alvo) - 1
+        return bloco * self.capacidade_bloco + j
+
+    def buscar_tempo(self, tempo):
+        """Índice da amostra vigente no instante `tempo` (0 se for antes do início)."""
+        return max(0, self._buscar("timestamp", tempo))
+
+    def buscar_posicao(self, pos_x):
+        """Índice da primeira amostra em que o robô já havia alcançado `pos_x`.
+
+        "Alcançado" vale pelo máximo de pos_x até a amostra, então recuos posteriores não
+        contam. Se a posição nunca foi alcançada, retorna a última amostra; numa gravação
+        vazia, retorna -1.
+        """
+        if not self._total:
+            return -1
+        bloco = bisect.bisect_left(self._indice_maximos_posicao(), pos_x)
+        if bloco == self.n_blocos:
+            return self._total - 1
+        with self._valores_bloco("pos_x", bloco) as valores:
+            j = next(j for j, valor in enumerate(valores) if valor >= pos_x)
+        return bloco * self.capacidade_bloco + j
+
+    @property
+    def duracao(self):
+        return self.valor("timestamp", self._total - 1) if self._total else 0.0
+
+    def fechar(self):
+        self._mapa.close()
+        self._arquivo.close()
+
+
+class FonteReplay:
+    """Reproduz uma gravação entregando os pacotes a `destino` (por exemplo,
+    CentralControleGUI.atualizar_interface_simulacao) no ritmo da missão original,
+    multiplicado por `velocidade` (1x a 100x). Permite pausar e saltar para qualquer
+    instante ou posição."""
+
+    VELOCIDADE_MINIMA = 1.0
+    VELOCIDADE_MAXIMA = 100.0
+
+    def __init__(self, leitor, destino, velocidade=1.0, intervalo=1 / 60):
+        self.leitor = leitor
+        self.destino = destino
+        self.intervalo = intervalo
+        self.velocidade = self._limitar(velocidade)
+        self.pausado = False
+        self.tempo_atual = leitor.valor("timestamp", 0) if len(leitor) else 0.0
+        self._indice_enviado = -1
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _limitar(self, velocidade):
+        return min(self.VELOCIDADE_MAXIMA, max(self.VELOCIDADE_MINIMA, float(velocidade)))
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def alternar_pausa(self):
+        with self._trava:
+            self.pausado = not self.pausado
+
+    def definir_velocidade(self, velocidade):
+        with self._trava:
+            self.velocidade = self._limitar(velocidade)
+
+    def buscar_tempo(self, tempo):
+        with self._trava:
+            self.tempo_atual = tempo
+            self._indice_enviado = -1
+
+    def buscar_posicao(self, pos_x):
+        i = self.leitor.buscar_posicao(pos_x)
+        if i < 0:
+            # Gravação vazia (missão fechada antes do primeiro tick): não há para onde ir
+            return
+        self.buscar_tempo(self.leitor.valor("timestamp", i))
+
+    @property
+    def terminado(self):
+        return self.tempo_atual >= self.leitor.duracao
+
+    def _executar(self):
+        anterior = time.perf_counter()
+        while not self._parar.wait(self.intervalo):
+            agora = time.perf_counter()
+            with self._trava:
+                if not self.pausado and not self.terminado:
+                    self.tempo_atual = min(self.leitor.duracao,
+                                           self.tempo_atual + (agora - anterior) * self.velocidade)
+                i = self.leitor.buscar_tempo(self.tempo_atual) if len(self.leitor) else -1
+                enviar = i != self._indice_enviado
+                self._indice_enviado = i
+            anterior = agora
+            # Só a amostra vigente é entregue; a interface já descarta quadros intermediários
+            if enviar and i >= 0:
+                self.destino(self.leitor.amostra(i))
@@ -0,0 +1,55 @@
+import random
+
+from simulacao import Cenario, CenarioProcedural, CentralDeControle, Robo, Vitima
+
+
+def _cenario(*xs):
+    return Cenario(comprimento=200, objetos=[Vitima(x=x, y=5.0, gravidade="Leve") for x in xs])
+
+
+def test_vitimas_no_raio_usa_a_mesma_conta_da_distancia():
+    # 64.1 - 59.1 == 4.999999999999993 em ponto flutuante: a vítima está dentro do raio,
+    # embora 59.1 + 5 == 64.1. O índice não pode excluí-la pela borda do bisect.
+    cenario = _cenario(64.1)
+    assert [v.x for v in cenario.vitimas_no_raio(59.1, 5)] == [64.1]
+
+
+def test_vitimas_no_raio_exclui_a_borda_exata():
+    cenario = _cenario(10.0, 15.0, 20.0)
+    assert [v.x for v in cenario.vitimas_no_raio(15.0, 5)] == [15.0]
+
+
+def test_vitimas_no_raio_em_ordem_de_x():
+    cenario = _cenario(30.0, 12.0, 18.0, 14.0)
+    assert [v.x for v in cenario.vitimas_no_raio(15.0, 5)] == [12.0, 14.0, 18.0]
+
+
+def _missao_procedural(robos, comprimento=4000):
+    random.seed(1)
+    central = CentralDeControle()
+    frota = [Robo(central_controle=central, nome=f"R{i + 1}") for i in range(robos)]
+    for robo in frota:
+        robo.bateria = 1e9  # percorre o túnel inteiro
+    cenario = CenarioProcedural(1, comprimento, densidade=30)
+    atualizar, pico = cenario.atualizar, [0]
+
+    def medir(trechos):
+        atualizar(trechos)
+        pico[0] = max(pico[0], len(cenario.objetos))
+    cenario.atualizar = medir
+    central.executar_frota(frota, cenario)
+    return central, cenario, pico[0]
+
+
+def test_procedural_frota_guarda_so_as_janelas_dos_robos():
+    _, cenario, pico = _missao_procedural(robos=8)
+    # Cada robô mantém poucos segmentos em volta de si, nunca o trecho entre o primeiro e o último
+    por_robo = (cenario.segmentos_a_frente + 4) * cenario.comprimento_segmento * cenario.densidade / 100
+    assert cenario.vitimas_geradas == 4000 * 30 // 100
+    assert pico <= 8 * por_robo
+
+
+def test_procedural_frota_detecta_cada_vitima_uma_vez():
+    central, cenario, _ = _missao_procedural(robos=8)
+    ids = [v.id for v in central.vitimas_detectadas]
+    assert len(ids) == len(set(ids)) == cenario.vitimas_geradas
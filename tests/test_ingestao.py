@@ -0,0 +1,117 @@
+import math
+import struct
+import time
+
+import pytest
+
+from ingestao import (MAGICO, REGISTRO, ClienteTelemetria, ErroQuadro, ServidorTelemetria, codificar_quadro,
+                      decodificar_quadros)
+
+
+def _pacote(i, robo=0, temp=25.3):
+    return {
+        'tempo': i * 0.5,
+        'robo': robo,
+        'pos_x': i * 2.0,
+        'pos_y': 5.0,
+        'bateria': 100.0 - i * 0.01,
+        'status_robo': "Explorando",
+        'sensores': {'temp': temp, 'risco_estrutural': 1 + i % 3, 'gas': 0.12},
+    }
+
+
+def _float32(valor):
+    return struct.unpack("<f", struct.pack("<f", valor))[0]
+
+
+def _esperar(condicao, limite=10.0):
+    fim = time.monotonic() + limite
+    while not condicao():
+        if time.monotonic() > fim:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_quadro_ida_e_volta():
+    originais = [_pacote(i, robo=i % 3) for i in range(10)]
+    pacotes, consumidos, rejeitados = decodificar_quadros(codificar_quadro(originais))
+    assert consumidos == 4 + 10 * REGISTRO.size and rejeitados == 0
+    for original, lido in zip(originais, pacotes, strict=True):
+        assert lido['robo'] == original['robo']
+        assert lido['tempo'] == original['tempo']
+        assert lido['pos_x'] == _float32(original['pos_x'])
+        assert lido['bateria'] == _float32(original['bateria'])
+        assert lido['status_robo'] == original['status_robo']
+        assert lido['sensores'] == original['sensores']
+
+
+@pytest.mark.parametrize("corte", [1, 3, 4, 5, REGISTRO.size])
+def test_quadro_incompleto_fica_para_a_proxima_leitura(corte):
+    primeiro = codificar_quadro([_pacote(0), _pacote(1)])
+    segundo = codificar_quadro([_pacote(2), _pacote(3)])
+    buffer = primeiro + segundo[:-corte]
+    pacotes, consumidos, _ = decodificar_quadros(buffer)
+    assert [p['tempo'] for p in pacotes] == [0.0, 0.5]
+    assert consumidos == len(primeiro)
+
+    pacotes, consumidos, _ = decodificar_quadros(buffer[consumidos:] + segundo[-corte:])
+    assert [p['tempo'] for p in pacotes] == [1.0, 1.5]
+    assert consumidos == len(segundo)
+
+
+def test_quadro_com_magico_errado():
+    quadro = codificar_quadro([_pacote(0)])
+    assert quadro.startswith(MAGICO)
+    with pytest.raises(ErroQuadro):
+        decodificar_quadros(b"XX" + quadro[2:])
+
+
+@pytest.mark.parametrize("valor", [math.nan, math.inf, -math.inf])
+def test_registro_nao_finito_e_rejeitado(valor):
+    pacotes, _, rejeitados = decodificar_quadros(codificar_quadro([_pacote(0), _pacote(1, temp=valor), _pacote(2)]))
+    assert [p['tempo'] for p in pacotes] == [0.0, 1.0]
+    assert rejeitados == 1
+
+
+def test_tcp_com_destino_lento_nao_perde_pacotes():
+    # Fila pequena e destino lento: a leitura é pausada e o cliente espera, sem descartes
+    recebidos = []
+
+    def destino(pacote):
+        time.sleep(0.0005)
+        recebidos.append(pacote['tempo'])
+
+    servidor = ServidorTelemetria(destino, porta=0, capacidade=16, so_recentes=False)
+    servidor.iniciar()
+    try:
+        with ClienteTelemetria(porta=servidor.porta, tamanho_lote=8) as cliente:
+            for i in range(2000):
+                cliente.enviar(_pacote(i))
+        assert _esperar(lambda: servidor.estatisticas()['entregues'] == 2000)
+    finally:
+        servidor.parar()
+    assert recebidos == [i * 0.5 for i in range(2000)]
+    estatisticas = servidor.estatisticas()
+    assert estatisticas['descartados'] == 0 and estatisticas['erros'] == 0
+
+
+def test_erro_no_destino_nao_derruba_a_entrega():
+    recebidos = []
+
+    def destino(pacote):
+        if pacote['tempo'] == 0.5:
+            raise ValueError("pacote recusado")
+        recebidos.append(pacote['tempo'])
+
+    servidor = ServidorTelemetria(destino, porta=0, so_recentes=False)
+    servidor.iniciar()
+    try:
+        with ClienteTelemetria(porta=servidor.porta, tamanho_lote=1) as cliente:
+            for i in range(3):
+                cliente.enviar(_pacote(i))
+        assert _esperar(lambda: servidor.estatisticas()['entregues'] == 2)
+    finally:
+        servidor.parar()
+    assert recebidos == [0.0, 1.0]
+    assert servidor.estatisticas()['erros'] == 1
@@ -0,0 +1,99 @@
+import heapq
+import math
+import random
+
+import numpy as np
+import pytest
+
+from navegacao import ALCANCE_VISITA, VIZINHOS, CampoDistancias, NavegadorTunel
+from simulacao import RAIO_DETECCAO, Cenario, CenarioProcedural, CentralDeControle, Robo, Vitima
+
+
+def _dijkstra(vitima, bloqueadas, coluna_inicial, resolucao):
+    linhas, colunas = bloqueadas.shape
+    distancias = np.full((linhas, colunas), math.inf)
+    fila = []
+    for linha in range(linhas):
+        for coluna in range(colunas):
+            x = (coluna_inicial + coluna + 0.5) * resolucao
+            y = (linha + 0.5) * resolucao
+            if not bloqueadas[linha, coluna] and math.hypot(x - vitima.x, y - vitima.y) <= ALCANCE_VISITA:
+                distancias[linha, coluna] = 0.0
+                fila.append((0.0, linha, coluna))
+    heapq.heapify(fila)
+    while fila:
+        d, linha, coluna = heapq.heappop(fila)
+        if d > distancias[linha, coluna]:
+            continue
+        for dy, dx, custo in VIZINHOS:
+            l, c = linha + dy, coluna + dx
+            if 0 <= l < linhas and 0 <= c < colunas and not bloqueadas[l, c] and d + custo < distancias[l, c]:
+                distancias[l, c] = d + custo
+                heapq.heappush(fila, (d + custo, l, c))
+    return distancias
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_campo_distancias_igual_a_dijkstra(semente):
+    rng = np.random.default_rng(semente)
+    resolucao, coluna_inicial = 0.25, 40
+    bloqueadas = rng.random((40, 60)) < 0.3
+    vitima = Vitima(x=(coluna_inicial + 30) * resolucao, y=5.0, gravidade="Grave")
+
+    campo = CampoDistancias(vitima, bloqueadas, coluna_inicial, resolucao)
+    obtido = np.array(campo._distancias)[1:-1, 1:-1]
+    esperado = _dijkstra(vitima, bloqueadas, coluna_inicial, resolucao)
+
+    assert np.array_equal(np.isinf(obtido), np.isinf(esperado))
+    finitas = np.isfinite(esperado)
+    assert finitas.sum() > 100
+    np.testing.assert_allclose(obtido[finitas], esperado[finitas], rtol=1e-12)
+
+
+def test_campo_contem_robo_atras_da_vitima():
+    # O robô começa no início do seu segmento e detecta uma vítima logo atrás dele
+    robo = Robo()
+    vitima = Vitima(x=96.0, y=9.0, gravidade="Crítico")
+    navegador = NavegadorTunel()
+    navegador.preparar([robo], Cenario(comprimento=200, objetos=[vitima]))
+    robo.posicao_atual, robo.pos_y = 96.0 + RAIO_DETECCAO - 0.5, 5.0
+
+    navegador.registrar(robo, vitima)
+    plano = navegador._planejar(robo)
+
+    assert plano is not None and plano[0] is vitima
+    assert navegador.campo(vitima, robo.posicao_atual).contem(robo.posicao_atual)
+
+
+def test_alvo_inalcancavel_fica_livre_para_outro_robo():
+    robos = [Robo(), Robo()]
+    for i, robo in enumerate(robos):
+        robo.indice = i
+    vitima = Vitima(x=50.0, y=5.0, gravidade="Grave")
+    navegador = NavegadorTunel()
+    navegador.preparar(robos, Cenario(comprimento=100, objetos=[vitima]))
+    navegador.registrar(robos[0], vitima)
+    # Para o primeiro robô, o campo não tem saída: todas as células em volta estão bloqueadas
+    robos[0].posicao_atual, robos[0].pos_y = 40.0, 5.0
+    navegador.bloqueadas[:, int(45 / navegador.resolucao)] = True
+
+    assert navegador._planejar(robos[0]) is None
+    assert navegador._livres == [vitima]
+
+    robos[1].posicao_atual, robos[1].pos_y = 53.0, 5.0
+    plano = navegador._planejar(robos[1])
+    assert plano is not None and plano[0] is vitima
+    assert navegador._livres == []
+
+
+@pytest.mark.parametrize("semente", [23, 24, 25, 26])
+def test_frota_fotografa_todas_as_vitimas_detectadas(semente):
+    random.seed(semente)
+    central = CentralDeControle()
+    robos = [Robo(central_controle=central, nome=f"R{i + 1}") for i in range(8)]
+    central.navegacao = NavegadorTunel()
+    central.executar_frota(robos, CenarioProcedural(semente, 800, densidade=20))
+
+    sem_foto = [v.x for v in central.vitimas_detectadas if not v.foto_tirada]
+    assert central.vitimas_detectadas
+    assert sem_foto == []
@@ -0,0 +1,29 @@
+import pytest
+
+from simulacao_lote import SimuladorLote, simular_escalar
+
+CONFIGURACOES = [
+    # comprimento, densidade, velocidade, kits
+    (200, 2, 2.0, 3),
+    (500, 20, 1.5, 5),
+    (1000, 50, 3.0, 2),
+    (300, 100, 0.7, 10),
+]
+
+
+@pytest.mark.parametrize("comprimento, densidade, velocidade, kits", CONFIGURACOES)
+def test_lote_igual_ao_motor_escalar(comprimento, densidade, velocidade, kits):
+    sementes = list(range(20))
+    lote = SimuladorLote.de_sementes(sementes, comprimento=comprimento, densidade=densidade,
+                                     velocidade=velocidade, kits_primeiros_socorros=kits)
+    lote.executar()
+    esperados = [simular_escalar(s, comprimento=comprimento, densidade=densidade, velocidade=velocidade,
+                                 kits_primeiros_socorros=kits) for s in sementes]
+    # Mesmos números, bit a bit: o lote aplica as mesmas regras na mesma ordem
+    assert lote.resultados() == esperados
+
+
+def test_lote_com_max_ticks_para_todas_as_missoes():
+    lote = SimuladorLote.de_sementes(range(5), comprimento=1000)
+    lote.executar(max_ticks=10)
+    assert all(r['posicao'] == pytest.approx(20.0) for r in lote.resultados())
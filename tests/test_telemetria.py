@@ -0,0 +1,117 @@
+import random
+import struct
+
+import pytest
+
+from telemetria import FonteReplay, GravadorTelemetria, LeitorTelemetria
+
+
+def _pacote(i, pos_x, status="Explorando"):
+    return {
+        'tempo': i * 0.5,
+        'robo': 0,
+        'pos_x': pos_x,
+        'pos_y': 5.0 + (i % 3),
+        'bateria': 100.0 - i * 0.01,
+        'status_robo': status,
+        'sensores': {'temp': 25.3, 'risco_estrutural': 1 + i % 3, 'gas': 0.12},
+    }
+
+
+@pytest.fixture
+def abrir():
+    leitores = []
+
+    def _abrir(caminho):
+        leitores.append(LeitorTelemetria(str(caminho)))
+        return leitores[-1]
+
+    yield _abrir
+    for leitor in leitores:
+        leitor.fechar()
+
+
+def _float32(valor):
+    return struct.unpack("<f", struct.pack("<f", valor))[0]
+
+
+def _gravar(caminho, posicoes, capacidade_bloco=8):
+    pacotes = [_pacote(i, x) for i, x in enumerate(posicoes)]
+    with GravadorTelemetria(str(caminho), capacidade_bloco=capacidade_bloco) as gravador:
+        for pacote in pacotes:
+            gravador.registrar(pacote)
+    return pacotes
+
+
+@pytest.mark.parametrize("quantidade", [1, 7, 8, 9, 30])
+def test_ida_e_volta(tmp_path, abrir, quantidade):
+    caminho = tmp_path / "missao.rstl"
+    pacotes = _gravar(caminho, [i * 2.0 for i in range(quantidade)])
+    leitor = abrir(caminho)
+    assert len(leitor) == quantidade
+    for i, original in enumerate(pacotes):
+        lido = leitor.amostra(i)
+        assert lido['tempo'] == original['tempo']
+        assert lido['pos_x'] == _float32(original['pos_x'])
+        assert lido['pos_y'] == _float32(original['pos_y'])
+        assert lido['status_robo'] == original['status_robo']
+        assert lido['sensores'] == original['sensores']
+    assert leitor.duracao == pacotes[-1]['tempo']
+
+
+def test_buscar_tempo(tmp_path, abrir):
+    caminho = tmp_path / "missao.rstl"
+    _gravar(caminho, [i * 2.0 for i in range(30)])
+    leitor = abrir(caminho)
+    assert leitor.buscar_tempo(-1.0) == 0
+    assert leitor.buscar_tempo(0.0) == 0
+    assert leitor.buscar_tempo(4.2) == 8
+    assert leitor.buscar_tempo(4.5) == 9
+    assert leitor.buscar_tempo(1e9) == 29
+
+
+def test_buscar_posicao_com_recuos(tmp_path, abrir):
+    # Com --navegacao o robô pode recuar: a busca vale pelo máximo acumulado de pos_x
+    rng = random.Random(3)
+    posicoes, x = [], 0.0
+    for _ in range(500):
+        x += rng.uniform(-1.0, 2.0)
+        posicoes.append(x)
+    caminho = tmp_path / "missao.rstl"
+    _gravar(caminho, posicoes)
+    gravadas = [_float32(x) for x in posicoes]
+
+    def referencia(alvo):
+        maximo = float("-inf")
+        for i, valor in enumerate(gravadas):
+            maximo = max(maximo, valor)
+            if maximo >= alvo:
+                return i
+        return len(gravadas) - 1
+
+    leitor = abrir(caminho)
+    alvos = [rng.uniform(-5, max(gravadas) + 5) for _ in range(300)] + gravadas[:50]
+    assert [leitor.buscar_posicao(a) for a in alvos] == [referencia(a) for a in alvos]
+
+
+def test_gravacao_vazia(tmp_path, abrir):
+    caminho = tmp_path / "vazia.rstl"
+    GravadorTelemetria(str(caminho)).fechar()
+    leitor = abrir(caminho)
+    assert len(leitor) == 0
+    assert leitor.buscar_posicao(10.0) == -1
+    fonte = FonteReplay(leitor, lambda pacote: None)
+    fonte.buscar_posicao(10.0)  # não levanta IndexError
+    assert fonte.terminado
+
+
+def test_registrar_depois_de_fechar_nao_faz_nada(tmp_path, abrir):
+    caminho = tmp_path / "missao.rstl"
+    gravador = GravadorTelemetria(str(caminho), capacidade_bloco=8)
+    gravador.registrar(_pacote(0, 1.0))
+    gravador.fechar()
+    for i in range(20):
+        gravador.registrar(_pacote(i, 1.0))
+    gravador.fechar()
+    leitor = abrir(caminho)
+    assert len(leitor) == 1
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from simulacao import Cenario, CentralDeControle, Robo, Vitima
+from triagem import PlanejadorTriagem
+
+
+def _missao(vitimas, triagem, robos=1, kits=1, comprimento=200):
+    random.seed(0)
+    central = CentralDeControle()
+    if triagem:
+        central.triagem = PlanejadorTriagem()
+    frota = [Robo(central_controle=central, kits_primeiros_socorros=kits, nome=f"R{i + 1}")
+             for i in range(robos)]
+    central.executar_frota(frota, Cenario(comprimento=comprimento, objetos=vitimas))
+    return central
+
+
+def _vitima(x, gravidade):
+    return Vitima(x=x, y=5.0, gravidade=gravidade, estado="Inconsciente")
+
+
+@pytest.mark.parametrize("triagem, recebe", [(False, 20.0), (True, 22.0)])
+def test_kit_guardado_para_a_vitima_critica_adiante(triagem, recebe):
+    moderada, critica = _vitima(20.0, "Moderado"), _vitima(22.0, "Crítico")
+    _missao([moderada, critica], triagem)
+    assert [v.x for v in (moderada, critica) if v.kit_aplicado] == [recebe]
+
+
+def test_vitima_logo_apos_o_inicio_do_segmento_recebe_kit():
+    # Com 2 robôs em 200 m, o segundo segmento começa em 100: o dono da vítima sai do
+    # início já avançando, então quem a atende é o robô do segmento anterior.
+    vitima = _vitima(100.5, "Crítico")
+    _missao([vitima], triagem=True, robos=2)
+    assert vitima.kit_aplicado
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_kits_nunca_excedem_os_disponiveis(semente):
+    random.seed(semente)
+    cenario = Cenario.aleatorio(semente, comprimento=600, densidade=8)
+    central = CentralDeControle()
+    central.triagem = PlanejadorTriagem()
+    frota = [Robo(central_controle=central, kits_primeiros_socorros=2, nome=f"R{i + 1}") for i in range(3)]
+    central.executar_frota(frota, cenario)
+    aplicados = sum(1 for v in cenario.objetos if v.kit_aplicado)
+    assert all(robo.kits_primeiros_socorros >= 0 for robo in frota)
+    assert aplicados == central.kits_utilizados() == sum(central.triagem.atendidas.values())
+    assert aplicados <= 3 * 2
+
+
+def test_triagem_atende_mais_vitimas_criticas_que_a_ordem_de_chegada():
+    criticas = {}
+    for triagem in (False, True):
+        total = 0
+        for semente in range(60):
+            random.seed(semente)
+            cenario = Cenario.aleatorio(semente, comprimento=300, densidade=5)
+            originais = {id(v): v.gravidade for v in cenario.objetos}
+            central = CentralDeControle()
+            if triagem:
+                central.triagem = PlanejadorTriagem()
+            central.executar_frota([Robo(central_controle=central)], cenario)
+            total += sum(1 for v in cenario.objetos if v.kit_aplicado and originais[id(v)] == "Crítico")
+        criticas[triagem] = total
+    assert criticas[True] > criticas[False]
@@ -0,0 +1,136 @@
+import bisect
+import heapq
+import itertools
+
+from simulacao import GRAVIDADES, RAIO_DETECCAO, RAIO_KIT
+
+# Só estas gravidades recebem kit; quanto maior o valor, maior a prioridade
+PRIORIDADE_KIT = {"Moderado": 1, "Grave": 2, "Crítico": 3}
+
+
+class PlanejadorTriagem:
+    """Decide quais vítimas recebem os kits limitados de cada robô.
+
+    Sem o planejador, o robô aplica um kit em toda vítima que precisa dele, na ordem em que
+    passa por elas, e pode esgotar os kits em vítimas moderadas antes de chegar às críticas
+    mais adiante. Com ele, o robô só aplica um kit se houver kits para a vítima e para
+    todas as de gravidade maior que ainda pode alcançar: as já detectadas no seu segmento
+    e as previstas no trecho que os sensores ainda não viram. A previsão vem da densidade
+    e da mistura de gravidades do cenário.
+
+    As vítimas detectadas ficam num heap por (robô, gravidade), ordenado pela posição. As
+    que o robô já deixou para trás saem pelo topo, e as atendidas são descontadas por um
+    contador até chegarem ao topo. Registrar uma vítima e decidir um kit custam O(log n).
+    """
+
+    def __init__(self, densidade=None, mistura=None):
+        self.densidade = densidade
+        self.mistura = mistura
+        self.atendidas = dict.fromkeys(PRIORIDADE_KIT, 0)  # kits aplicados, pela gravidade original
+        self._recusadas = set()  # vítimas cujo kit foi guardado para uma mais grave
+        self._robos = []
+        self._inicios = []
+        self._pendentes = []
+        self._descontadas = []
+        self._contadas = set()  # atendidas que entraram em _descontadas
+        self._ordem = itertools.count()
+
+    def preparar(self, robos, cenario):
+        """Associa o planejador à frota; chamado por CentralDeControle.definir_frota."""
+        self._robos = list(robos)
+        self._inicios = [robo.inicio_segmento for robo in self._robos]
+        self._pendentes = [{g: [] for g in PRIORIDADE_KIT} for _ in self._robos]
+        self._descontadas = [dict.fromkeys(PRIORIDADE_KIT, 0) for _ in self._robos]
+        self._contadas = set()
+
+        densidade = self.densidade
+        if densidade is None:
+            densidade = getattr(cenario, 'densidade', None)
+        if densidade is None:
+            densidade = 100 * len(cenario.objetos) / cenario.comprimento if cenario.comprimento else 0.0
+        mistura = self.mistura or getattr(cenario, 'mistura', None) or [1] * len(GRAVIDADES)
+        total = sum(mistura)
+        # Vítimas esperadas por metro, para cada gravidade que recebe kit
+        self._taxas = {g: densidade / 100 * mistura[GRAVIDADES.index(g)] / total for g in PRIORIDADE_KIT}
+
+    def _dono(self, vitima):
+        # Cada vítima é atendida pelo robô cujo segmento a contém
+        return max(0, bisect.bisect_right(self._inicios, vitima.x) - 1)
+
+    def registrar(self, vitima):
+        """Chamado quando uma vítima é detectada."""
+        if not vitima.necessita_kit():
+            return
+        heapq.heappush(self._pendentes[self._dono(vitima)][vitima.gravidade],
+                       (vitima.x, next(self._ordem), vitima))
+
+    def _conhecidas(self, i, gravidade, posicao):
+        """Vítimas detectadas dessa gravidade que o robô i ainda pode atender."""
+        heap = self._pendentes[i][gravidade]
+        descontadas = self._descontadas[i]
+        while heap and (heap[0][0] <= posicao - RAIO_KIT or heap[0][2].kit_aplicado):
+            _, _, vitima = heapq.heappop(heap)
+            if vitima in self._contadas:
+                self._contadas.discard(vitima)
+                descontadas[gravidade] -= 1
+        return len(heap) - descontadas[gravidade]
+
+    def _previstas(self, robo, gravidade):
+        """Vítimas dessa gravidade esperadas no trecho do segmento além dos sensores.
+
+        É um valor esperado, e portanto fracionário: com 1 kit e 0,4 vítima crítica prevista,
+        o kit ainda vai para uma vítima grave; com 1,0 prevista, fica guardado.
+        """
+        trecho = robo.fim_segmento - (robo.posicao_atual + RAIO_DETECCAO)
+        return max(0.0, trecho) * self._taxas[gravidade]
+
+    @staticmethod
+    def _ainda_alcanca(robo, vitima):
+        """Se `robo` ainda pode chegar a RAIO_KIT da vítima (o robô só avança em x)."""
+        # Mesmo critério de robô ativo do MotorSimulacao
+        ativo = robo.bateria > 5 and robo.posicao_atual < robo.fim_segmento
+        return ativo and robo.posicao_atual < vitima.x + RAIO_KIT
+
+    def atender(self, robo, vitima):
+        """Aplica um kit em `vitima` se o plano reservar um para ela; retorna True se aplicou.
+
+        Cada vítima é do robô cujo segmento a contém. Uma vítima logo depois do início de um
+        segmento pode ficar fora do alcance do seu dono, que sai do início já avançando, e ao
+        alcance do robô do segmento anterior. Por isso, o robô que chega à vítima a atende
+        quando o dono já não pode alcançá-la.
+        """
+        i = self._dono(vitima)
+        dono = self._robos[i] is robo
+        if not dono:
+            if self._ainda_alcanca(self._robos[i], vitima):
+                return False
+            i = robo.indice
+        gravidade = vitima.gravidade
+        prioridade = PRIORIDADE_KIT[gravidade]
+        # Conhecidas mais previstas: o valor esperado de vítimas mais graves ainda pela frente
+        mais_graves = sum(self._conhecidas(i, g, robo.posicao_atual) + self._previstas(robo, g)
+                          for g, p in PRIORIDADE_KIT.items() if p > prioridade)
+        if mais_graves >= robo.kits_primeiros_socorros:
+            self._recusadas.add(vitima)
+            return False
+        if not robo.aplicar_kit(vitima):
+            return False
+        self.atendidas[gravidade] += 1
+        if dono:
+            # A vítima continua no heap da sua gravidade (a de antes do kit) até chegar ao topo
+            self._descontadas[i][gravidade] += 1
+            self._contadas.add(vitima)
+        return True
+
+    @property
+    def adiadas(self):
+        """Vítimas que ficaram sem kit porque ele foi guardado para uma mais grave."""
+        return sum(1 for vitima in self._recusadas if not vitima.kit_aplicado)
+
+    def resumo(self):
+        return {'kits_por_gravidade': dict(self.atendidas), 'adiadas': self.adiadas}
+
+    def descricao(self):
+        ordem = sorted(PRIORIDADE_KIT, key=PRIORIDADE_KIT.get, reverse=True)
+        kits = ", ".join(f"{g} {self.atendidas[g]}" for g in ordem)
+        return f"Kits por gravidade: {kits}; {self.adiadas} kit(s) guardado(s) para vítimas mais graves"
@@ -0,0 +1,114 @@
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import time
+
+from simulacao import Cenario, CentralDeControle, Robo
+
+PARAMETROS = ('velocidade', 'kits', 'comprimento', 'densidade')
+COLUNAS_RESULTADO = ('posicao', 'bateria', 'kits_restantes', 'kits_utilizados',
+                     'kits_necessarios', 'vitimas_detectadas', 'fotos', 'ticks')
+
+
+def expandir_grade(grade, repeticoes=1, semente_base=0):
+    """Gera as tarefas (indice, parametros, repeticao, semente) do produto cartesiano da grade.
+
+    A semente depende só da repetição, então todas as configurações de uma mesma repetição
+    exploram o mesmo cenário (números aleatórios comuns), o que reduz a variância ao
+    comparar configurações entre si.
+    """
+    valores = [grade[nome] for nome in PARAMETROS]
+    indice = 0
+    for combinacao in itertools.product(*valores):
+        parametros = dict(zip(PARAMETROS, combinacao))
+        for repeticao in range(repeticoes):
+            yield indice, parametros, repeticao, semente_base + repeticao
+            indice += 1
+
+
+def executar_tarefa(tarefa):
+    """Executa uma missão headless; roda nos processos do pool."""
+    indice, parametros, repeticao, semente = tarefa
+    central = CentralDeControle()
+    robo = Robo(central_controle=central, kits_primeiros_socorros=parametros['kits'],
+                velocidade=parametros['velocidade'])
+    cenario = Cenario.aleatorio(semente, comprimento=parametros['comprimento'],
+                                densidade=parametros['densidade'])
+    motor = central.executar_missao(robo, cenario)
+
+    linha = {'indice': indice, **parametros, 'repeticao': repeticao, 'semente': semente}
+    linha.update(central.resumo_missao())
+    linha['ticks'] = motor.ticks
+    return linha
+
+
+def executar_varredura(grade, caminho_csv, repeticoes=1, semente_base=0, processos=None, tamanho_lote=None):
+    """Distribui as missões da grade num pool de processos e grava cada resultado no CSV
+    assim que ele fica pronto. Retorna as médias por configuração."""
+    tarefas = list(expandir_grade(grade, repeticoes, semente_base))
+    processos = processos or os.cpu_count() or 1
+    if tamanho_lote is None:
+        # Lotes grandes o bastante para amortizar a comunicação entre processos, mas com
+        # vários lotes por processo para equilibrar a carga.
+        tamanho_lote = max(1, len(tarefas) // (processos * 8))
+
+    campos = ['indice', *PARAMETROS, 'repeticao', 'semente', *COLUNAS_RESULTADO]
+    agregados = {}
+    with open(caminho_csv, 'w', newline='', encoding='utf-8') as arquivo, \
+            multiprocessing.Pool(processos) as pool:
+        escritor = csv.DictWriter(arquivo, fieldnames=campos)
+        escritor.writeheader()
+        for n, linha in enumerate(pool.imap_unordered(executar_tarefa, tarefas, chunksize=tamanho_lote), 1):
+            escritor.writerow(linha)
+            if n % tamanho_lote == 0:
+                arquivo.flush()
+
+            chave = tuple(linha[p] for p in PARAMETROS)
+            soma = agregados.setdefault(chave, dict.fromkeys(COLUNAS_RESULTADO, 0))
+            for coluna in COLUNAS_RESULTADO:
+                soma[coluna] += linha[coluna]
+
+    return {chave: {coluna: total / repeticoes for coluna, total in soma.items()}
+            for chave, soma in agregados.items()}
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros de missão do RoboSoco 5001")
+    parser.add_argument('--velocidade', type=float, nargs='+', default=[2.0])
+    parser.add_argument('--kits', type=int, nargs='+', default=[3])
+    parser.add_argument('--comprimento', type=float, nargs='+', default=[200])
+    parser.add_argument('--densidade', type=float, nargs='+', default=[2.0],
+                        help="vítimas a cada 100 m de túnel")
+    parser.add_argument('--repeticoes', type=int, default=10, help="missões por configuração")
+    parser.add_argument('--semente', type=int, default=0, help="semente base das repetições")
+    parser.add_argument('--processos', type=int, default=None, help="padrão: número de núcleos")
+    parser.add_argument('--tamanho-lote', type=int, default=None, help="tarefas por lote enviado a cada processo")
+    parser.add_argument('--saida', default='varredura.csv', help="arquivo CSV de resultados")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    grade = {'velocidade': args.velocidade, 'kits': args.kits,
+             'comprimento': args.comprimento, 'densidade': args.densidade}
+
+    inicio = time.perf_counter()
+    medias = executar_varredura(grade, args.saida, args.repeticoes, args.semente,
+                                args.processos, args.tamanho_lote)
+    duracao = time.perf_counter() - inicio
+
+    print(f"{'velocidade':>10} {'kits':>5} {'comprimento':>11} {'densidade':>9} "
+          f"{'bateria':>8} {'detectadas':>10} {'kits usados':>11} {'necessários':>11}")
+    for chave in sorted(medias):
+        m = medias[chave]
+        print(f"{chave[0]:>10} {chave[1]:>5} {chave[2]:>11} {chave[3]:>9} "
+              f"{m['bateria']:>8.1f} {m['vitimas_detectadas']:>10.1f} "
+              f"{m['kits_utilizados']:>11.1f} {m['kits_necessarios']:>11.1f}")
+    total = len(medias) * args.repeticoes
+    print(f"\n✅ {total} missões em {duracao:.2f}s — resultados em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()